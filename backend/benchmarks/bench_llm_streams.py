@@ -0,0 +1,204 @@
+"""
+Concurrency check for LLMService streaming against a stand-in Ollama.
+
+Starts a local server that speaks Ollama's streaming /api/chat protocol
+(one JSON object per line, a fixed delay per token), runs several
+streams at once through LLMService and reports:
+
+- wall time versus the time the streams would take back to back
+- how often consecutive tokens came from different streams
+- the worst event loop stall seen while streaming
+- whether closing a stream early disconnected it from the server
+
+    python -m benchmarks.bench_llm_streams
+    python -m benchmarks.bench_llm_streams --streams 16 --tokens 50 --delay 0.01
+
+Run from backend/. Exits non-zero if the streams did not overlap.
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from services.llm_scheduler import LLMScheduler
+from services.llm_service import LLMService
+
+
+class StandInOllama:
+    """Minimal HTTP/1.1 server streaming fake /api/chat responses."""
+
+    def __init__(self, tokens: int, delay: float):
+        self.tokens = tokens
+        self.delay = delay
+        self.disconnects = 0
+        self._server = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode().partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+            if b'/api/tags' in request_line:
+                payload = b'{"models": []}'
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    b'Content-Length: ' + str(len(payload)).encode() + b'\r\n\r\n' + payload
+                )
+                await writer.drain()
+                return
+
+            request = json.loads(body or b'{}')
+            model = request.get('model', 'stand-in')
+
+            if not request.get('stream', True):
+                await asyncio.sleep(self.delay * self.tokens)
+                payload = json.dumps({
+                    'model': model,
+                    'message': {'role': 'assistant', 'content': ''.join(f'{i} ' for i in range(self.tokens))},
+                    'done': True
+                }).encode()
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    b'Content-Length: ' + str(len(payload)).encode() + b'\r\n\r\n' + payload
+                )
+                await writer.drain()
+                return
+
+            writer.write(
+                b'HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n'
+                b'Transfer-Encoding: chunked\r\n\r\n'
+            )
+            started = time.perf_counter()
+            for i in range(self.tokens):
+                await asyncio.sleep(self.delay)
+                self._write_chunk(writer, {
+                    'model': model, 'message': {'role': 'assistant', 'content': f'{i} '}, 'done': False
+                })
+                await writer.drain()
+            self._write_chunk(writer, {
+                'model': model, 'message': {'content': ''}, 'done': True,
+                'prompt_eval_count': len(request.get('messages', [])),
+                'eval_count': self.tokens,
+                'eval_duration': int((time.perf_counter() - started) * 1e9)
+            })
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.disconnects += 1
+        except asyncio.CancelledError:
+            pass  # Server shutting down
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, obj: Dict):
+        data = json.dumps(obj).encode() + b'\n'
+        writer.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+
+
+async def _loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Worst delay of a periodic timer, i.e. the longest event loop stall."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run(streams: int, tokens: int, delay: float) -> Dict:
+    server = StandInOllama(tokens, delay)
+    host = await server.start()
+    llm = LLMService(model='stand-in', host=host, scheduler=LLMScheduler(max_concurrency=streams))
+
+    arrivals: List[Tuple[float, int]] = []
+
+    async def consume(stream_id: int):
+        async for chunk in llm.generate_response([{'role': 'user', 'content': 'hi'}]):
+            if chunk.startswith('Error'):
+                raise RuntimeError(chunk)
+            arrivals.append((time.perf_counter(), stream_id))
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_loop_lag(stop))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(consume(i) for i in range(streams)))
+    wall = time.perf_counter() - started
+
+    stop.set()
+    worst_lag = await lag_task
+
+    # Close one stream after a few tokens; the server should see it drop
+    disconnects_before = server.disconnects
+    stream = llm.generate_response([{'role': 'user', 'content': 'hi'}])
+    for _ in range(3):
+        await stream.__anext__()
+    await stream.aclose()
+    for _ in range(100):
+        if server.disconnects > disconnects_before:
+            break
+        await asyncio.sleep(delay)
+
+    healthy = await llm.check_health()
+    await llm.close()
+    await server.stop()
+
+    order = [stream_id for _, stream_id in sorted(arrivals)]
+    switches = sum(1 for a, b in zip(order, order[1:]) if a != b)
+
+    return {
+        'streams': streams,
+        'tokens_per_stream': tokens,
+        'tokens_received': len(arrivals),
+        'wall_s': round(wall, 3),
+        'sequential_s': round(streams * tokens * delay, 3),
+        'stream_switches': switches,
+        'max_loop_stall_ms': round(worst_lag * 1000, 2),
+        'early_close_disconnected': server.disconnects > disconnects_before,
+        'health_check': healthy
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--streams', type=int, default=8, help='Concurrent streams (default: 8)')
+    parser.add_argument('--tokens', type=int, default=40, help='Tokens per stream (default: 40)')
+    parser.add_argument('--delay', type=float, default=0.02, help='Seconds per token (default: 0.02)')
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.streams, args.tokens, args.delay))
+    for key, value in result.items():
+        print(f"  {key:26} {value}")
+
+    overlapped = result['wall_s'] < result['sequential_s'] / 2 and result['stream_switches'] > args.streams
+    if not overlapped or result['tokens_received'] != args.streams * args.tokens:
+        print("FAIL: streams did not run concurrently")
+        sys.exit(1)
+    print("OK: streams interleaved")
+
+
+if __name__ == '__main__':
+    main()
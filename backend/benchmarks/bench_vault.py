@@ -0,0 +1,162 @@
+"""
+Benchmarks for the ObsidianService vault operations.
+
+Generates synthetic vaults (see synthetic_vault.py) and reports latency
+percentiles, throughput and peak Python memory for each operation:
+
+    python -m benchmarks.bench_vault                      # 1k and 10k notes
+    python -m benchmarks.bench_vault --sizes 1000 10000 100000
+    python -m benchmarks.bench_vault --json results.json
+
+Run from backend/. Latency is measured without tracing; peak memory comes
+from a separate tracemalloc pass so tracing overhead does not skew timings.
+Memory used inside scanner worker processes is not included.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic_vault import generate_vault
+
+DEFAULT_SIZES = [1000, 10000]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def measure(
+    operation: Callable[[], Awaitable[Any]],
+    iterations: int,
+    warmup: int = 1
+) -> Dict[str, float]:
+    """
+    Time an async operation and measure its peak memory.
+
+    Returns:
+        {'p50_ms', 'p95_ms', 'p99_ms', 'ops_per_sec', 'peak_mb'}
+    """
+    for _ in range(warmup):
+        await operation()
+
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await operation()
+        samples.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    await operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'p50_ms': round(percentile(samples, 50), 2),
+        'p95_ms': round(percentile(samples, 95), 2),
+        'p99_ms': round(percentile(samples, 99), 2),
+        'ops_per_sec': round(iterations / elapsed, 1) if elapsed else 0.0,
+        'peak_mb': round(peak / 1e6, 2)
+    }
+
+
+async def bench_size(notes: int, iterations: int, seed: int, work_dir: str) -> Dict[str, Any]:
+    """Generate a vault of the given size and benchmark every operation on it."""
+    vault_path = os.path.join(work_dir, f"vault-{notes}")
+    os.environ['OBSIDIAN_INDEX_DIR'] = os.path.join(work_dir, f"index-{notes}")
+
+    t0 = time.perf_counter()
+    stats = generate_vault(vault_path, notes=notes, seed=seed)
+    print(f"\n{notes} notes: generated {stats['bytes'] / 1e6:.1f} MB in "
+          f"{time.perf_counter() - t0:.1f}s")
+
+    # Imported late so OBSIDIAN_INDEX_DIR above is honoured
+    from services.obsidian import ObsidianService
+
+    service = ObsidianService(vault_path=vault_path)
+    results: Dict[str, Any] = {'notes': stats['notes'], 'bytes': stats['bytes'], 'operations': {}}
+
+    try:
+        # First search builds the index from scratch
+        t0 = time.perf_counter()
+        await service.search_vault("meditation", limit=1)
+        results['index_build_s'] = round(time.perf_counter() - t0, 2)
+        print(f"  index build: {results['index_build_s']}s")
+
+        operations = {
+            'search_keyword': lambda: service.search_vault("japanese grammar", limit=20, count_total=True),
+            'search_fuzzy': lambda: service.search_vault("meditaton", limit=20, mode='fuzzy'),
+            'search_query': lambda: service.search_vault(
+                'tag:japanese AND (kanji OR hiragana) NOT "the a"', limit=20, count_total=True
+            ),
+            'search_scan': lambda: service.file_tools.search_in_files(
+                directory=service.vault_path, query="deadlift", limit=20
+            ),
+            'list_all_notes': service.list_all_notes,
+            'list_recent_notes': lambda: service.list_recent_notes(limit=10),
+            'get_active_projects': service.get_active_projects,
+        }
+
+        for name, operation in operations.items():
+            metrics = await measure(operation, iterations)
+            results['operations'][name] = metrics
+            print(f"  {name:<20} p50 {metrics['p50_ms']:>9.2f}ms  p95 {metrics['p95_ms']:>9.2f}ms  "
+                  f"p99 {metrics['p99_ms']:>9.2f}ms  {metrics['ops_per_sec']:>8.1f} ops/s  "
+                  f"peak {metrics['peak_mb']:>7.2f} MB")
+    finally:
+        service.close()
+
+    return results
+
+
+async def run(sizes: List[int], iterations: int, seed: int, work_dir: str) -> Dict[str, Any]:
+    return {
+        str(notes): await bench_size(notes, iterations, seed, work_dir)
+        for notes in sizes
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vault operations on synthetic vaults")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Vault sizes in notes (default: 1000 10000)")
+    parser.add_argument('--iterations', type=int, default=20,
+                        help="Timed runs per operation")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--work-dir', help="Keep generated vaults and indexes here")
+    parser.add_argument('--json', help="Write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.work_dir:
+        os.makedirs(args.work_dir, exist_ok=True)
+        results = asyncio.run(run(args.sizes, args.iterations, args.seed, args.work_dir))
+    else:
+        with tempfile.TemporaryDirectory(prefix="vault-bench-") as work_dir:
+            results = asyncio.run(run(args.sizes, args.iterations, args.seed, work_dir))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
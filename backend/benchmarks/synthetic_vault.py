@@ -0,0 +1,209 @@
+"""
+Reproducible synthetic Obsidian vault generator.
+
+Builds a vault with a configurable number of notes, a long-tailed size
+distribution, nested folders, frontmatter, tags, headings and wikilinks,
+plus Projects/ and Daily-Notes/ folders shaped like the ones the app
+writes. The same seed always produces the same vault, mtimes included.
+
+Usage (from backend/):
+    python -m benchmarks.synthetic_vault /tmp/vault --notes 10000
+"""
+
+import os
+import math
+import random
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List
+
+VOCABULARY = """
+    japanese kanji hiragana grammar vocabulary practice study lesson review
+    meditation breathing mindfulness focus calm journal reflection gratitude
+    gym workout running squat deadlift protein sleep recovery schedule
+    project milestone deadline meeting client roadmap planning retrospective
+    xrpl ledger wallet transaction validator consensus token payment
+    budget savings invest expense income travel trip itinerary flight hotel
+    book reading notes summary idea insight habit streak goal progress
+    morning evening weekly monthly quarterly decision tradeoff experiment
+    the a and of to in is for on with that this it as at by from be are
+""".split()
+
+FOLDERS = [
+    'Areas', 'Resources', 'Archive', 'Journal', 'Learning', 'Health',
+    'Finance', 'Travel', 'Work', 'Ideas', 'Reading', 'Japanese'
+]
+
+TAGS = [
+    'learning', 'japanese', 'fitness', 'health', 'work', 'finance',
+    'idea', 'reading', 'travel', 'journal', 'xrpl', 'habit'
+]
+
+
+def _sentence(rng: random.Random, links: List[str]) -> str:
+    """A sentence of vocabulary words with an occasional wikilink or tag."""
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(6, 18))]
+    if links and rng.random() < 0.15:
+        words.insert(rng.randrange(len(words)), f"[[{rng.choice(links)}]]")
+    if rng.random() < 0.05:
+        words.append(f"#{rng.choice(TAGS)}")
+    return " ".join(words).capitalize() + "."
+
+
+def _note_body(rng: random.Random, target_bytes: int, links: List[str]) -> str:
+    """Headed sections of paragraphs until the note reaches its target size."""
+    parts = []
+    size = 0
+    while size < target_bytes:
+        heading = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 4))).title()
+        paragraph = " ".join(_sentence(rng, links) for _ in range(rng.randint(2, 6)))
+        section = f"## {heading}\n\n{paragraph}\n"
+        parts.append(section)
+        size += len(section)
+    return "\n".join(parts)
+
+
+def _frontmatter(fields: Dict[str, Any]) -> str:
+    lines = ["---"]
+    for key, value in fields.items():
+        if isinstance(value, list):
+            value = "[" + ", ".join(str(v) for v in value) + "]"
+        lines.append(f"{key}: {value}")
+    lines.append("---\n")
+    return "\n".join(lines)
+
+
+def generate_vault(
+    path: str,
+    notes: int = 1000,
+    seed: int = 42,
+    median_bytes: int = 1500,
+    max_depth: int = 3,
+    frontmatter_ratio: float = 0.7,
+    links_per_note: int = 3,
+    project_ratio: float = 0.01,
+    daily_ratio: float = 0.2
+) -> Dict[str, int]:
+    """
+    Generate a synthetic vault.
+
+    Args:
+        path: Directory to create the vault in (created if missing)
+        notes: Total number of notes
+        seed: Random seed; the same seed gives the same vault
+        median_bytes: Median note size; sizes are log-normal, so a few
+            notes (journals) are much larger
+        max_depth: Maximum folder nesting for regular notes
+        frontmatter_ratio: Share of regular notes with frontmatter
+        links_per_note: Average number of [[wikilinks]] per note
+        project_ratio: Share of notes that are Projects/ files
+        daily_ratio: Share of notes that are Daily-Notes/ files
+
+    Returns:
+        {'notes': int, 'bytes': int, 'folders': int}
+    """
+    rng = random.Random(seed)
+    vault = Path(path)
+    vault.mkdir(parents=True, exist_ok=True)
+
+    project_count = max(1, int(notes * project_ratio))
+    daily_count = int(notes * daily_ratio)
+    regular_count = max(0, notes - project_count - daily_count)
+
+    # Folder tree for regular notes
+    folders = ['']
+    for _ in range(max(1, regular_count // 200)):
+        depth = rng.randint(1, max_depth)
+        folders.append("/".join(rng.choice(FOLDERS) for _ in range(depth)))
+    folders = sorted(set(folders))
+
+    titles = [f"Note {i:06d} {rng.choice(VOCABULARY).title()}" for i in range(regular_count)]
+    now = datetime(2025, 6, 1)
+    total_bytes = 0
+    written: List[Path] = []
+
+    def write(relative_path: str, content: str, mtime: datetime):
+        nonlocal total_bytes
+        file_path = vault / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        data = content.encode('utf-8')
+        file_path.write_bytes(data)
+        timestamp = mtime.timestamp()
+        os.utime(file_path, (timestamp, timestamp))
+        total_bytes += len(data)
+        written.append(file_path)
+
+    def target_size() -> int:
+        return max(80, int(rng.lognormvariate(math.log(median_bytes), 0.9)))
+
+    for title in titles:
+        folder = rng.choice(folders)
+        links = rng.sample(titles, min(len(titles), links_per_note * 3))
+        body = f"# {title}\n\n" + _note_body(rng, target_size(), links)
+        if rng.random() < frontmatter_ratio:
+            body = _frontmatter({
+                'title': title,
+                'type': rng.choice(['note', 'reference', 'idea']),
+                'tags': rng.sample(TAGS, rng.randint(1, 3)),
+            }) + body
+        relative = f"{folder}/{title}.md" if folder else f"{title}.md"
+        write(relative, body, now - timedelta(minutes=rng.randint(0, 525600)))
+
+    for i in range(project_count):
+        name = f"Project {i:04d} {rng.choice(VOCABULARY).title()}"
+        is_goal = rng.random() < 0.4
+        filename = ("Goal-" if is_goal else "") + name.replace(" ", "-") + ".md"
+        updated = now - timedelta(days=rng.randint(0, 60))
+        body = _frontmatter({
+            'title': name,
+            'type': 'goal' if is_goal else 'project',
+            'created': (updated - timedelta(days=30)).isoformat(),
+            'last_updated': updated.isoformat(),
+            'progress': rng.choice([0, 10, 25, 50, 75, 90, 100]),
+            'priority': rng.choice(['high', 'medium', 'low']),
+            'status': 'active',
+            'tags': ['goal' if is_goal else 'project'],
+        }) + f"# {name}\n\n" + _note_body(rng, target_size(), titles[:50])
+        write(f"Projects/{filename}", body, updated)
+
+    for i in range(daily_count):
+        day = now - timedelta(days=i)
+        date = day.strftime("%Y-%m-%d")
+        body = _frontmatter({'date': date, 'type': 'daily-note', 'tags': ['daily']})
+        body += f"# {date}\n\n" + _note_body(rng, target_size(), titles[:200])
+        write(f"Daily-Notes/{date}.md", body, day)
+
+    return {
+        'notes': len(written),
+        'bytes': total_bytes,
+        'folders': len({p.parent for p in written})
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Obsidian vault")
+    parser.add_argument('path', help="Directory to create the vault in")
+    parser.add_argument('--notes', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--median-bytes', type=int, default=1500)
+    parser.add_argument('--max-depth', type=int, default=3)
+    parser.add_argument('--frontmatter-ratio', type=float, default=0.7)
+    parser.add_argument('--links-per-note', type=int, default=3)
+    args = parser.parse_args()
+
+    stats = generate_vault(
+        args.path,
+        notes=args.notes,
+        seed=args.seed,
+        median_bytes=args.median_bytes,
+        max_depth=args.max_depth,
+        frontmatter_ratio=args.frontmatter_ratio,
+        links_per_note=args.links_per_note
+    )
+    print(f"Generated {stats['notes']} notes ({stats['bytes'] / 1e6:.1f} MB) "
+          f"in {stats['folders']} folders at {args.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,11 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from routers import chat, vault
+from services.llm_scheduler import get_default_scheduler
+from services.tools import get_default_io
 import uvicorn
 import logging
 
@@ -10,10 +13,24 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background services with the app"""
+    await chat.llm_service.start()
+    await vault.obsidian_service.start_watching()
+    yield
+    # Let in-flight generations finish before the connection pool closes
+    await chat.llm_service.close()
+    chat.session_store.close()
+    await vault.obsidian_service.stop_watching()
+    vault.obsidian_service.close()
+    get_default_io().shutdown()
+
 app = FastAPI(
     title="Personal AI Assistant",
     description="Self-hosted AI assistant with Claude Code feature parity",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend
@@ -57,6 +74,18 @@ async def health():
         "database": "connected"
     }
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for LLM generations, prompt budgets, background I/O and caches"""
+    return {
+        "llm": chat.llm_service.metrics(),
+        "llm_scheduler": get_default_scheduler().metrics(),
+        "chat_context": chat.context_window.metrics(),
+        "vault_io": get_default_io().metrics(),
+        "embedding_io": vault.obsidian_service.embed_io.metrics(),
+        "content_cache": vault.obsidian_service.content_cache.metrics()
+    }
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -1,24 +1,40 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from contextlib import aclosing
 import sys
+import json
+import asyncio
 import logging
 sys.path.append('..')
 from services.llm_service import LLMService
+from services.chat_sessions import ChatSession, ChatSessionStore
+from services.context_window import ContextWindow
+from services.llm_scheduler import SchedulerSaturated
 from services.commands import CommandParser
-from services.obsidian import ObsidianService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize services
+# Initialize services (vault service is shared with the vault router)
 import os
-obsidian_service = ObsidianService()
+from routers.vault import obsidian_service, SSE_HEARTBEAT_SECONDS
 commands_dir = os.path.join(os.path.dirname(__file__), '../../.ai/commands')
 command_parser = CommandParser(commands_dir=commands_dir, obsidian_service=obsidian_service)
 
+# One Ollama client for the whole app; its connection pool is opened and
+# drained by the lifespan in main.py
+llm_service = LLMService()
+
+# Conversation history for clients that send only their new message
+session_store = ChatSessionStore()
+
+# Keeps prompts within the token budget; older turns of a session are
+# folded into its summary by background generations
+context_window = ContextWindow(summarize=llm_service.complete)
+
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 class ChatMessage(BaseModel):
@@ -26,108 +42,403 @@ class ChatMessage(BaseModel):
     content: str
 
 class ChatRequest(BaseModel):
-    messages: List[ChatMessage]
+    # Either the new message, continuing session_id (a new session if omitted)...
+    session_id: Optional[str] = None
+    message: Optional[str] = Field(None, min_length=1)
+    # ...or the whole conversation, for clients that keep their own history
+    messages: Optional[List[ChatMessage]] = None
     stream: bool = False
 
+def _busy(e: SchedulerSaturated) -> HTTPException:
+    """429 telling the client when to retry"""
+    return HTTPException(
+        status_code=429,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+# Chunks buffered between the generation and a slow client
+STREAM_BUFFER_CHUNKS = 64
+
+_DONE = object()
+
+async def _wait_for_disconnect(http_request: Request):
+    """Return once the client has gone away"""
+    while (await http_request.receive())['type'] != 'http.disconnect':
+        pass
+
+async def _cancel_on_disconnect(http_request: Request, task: asyncio.Task):
+    """Cancel a generation as soon as its client disconnects"""
+    await _wait_for_disconnect(http_request)
+    if not task.done():
+        logger.info("Client disconnected, cancelling generation")
+        task.cancel()
+
+async def _stream_until_disconnect(
+    http_request: Request,
+    chunks: AsyncGenerator[Any, None],
+    heartbeat: Optional[float] = None
+) -> AsyncGenerator[Any, None]:
+    """
+    Relay generated chunks to the client
+
+    The generation runs in its own task, watched for client disconnects,
+    so closing the tab aborts it (and frees its scheduler slot) even while
+    the response is waiting on the model or blocked on a slow socket.
+    With a heartbeat, None is yielded whenever that many seconds pass
+    without a chunk. SchedulerSaturated from the generation is re-raised;
+    any other failure ends the stream with an 'error' event.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_BUFFER_CHUNKS)
+
+    async def pump():
+        cancelled = False
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except SchedulerSaturated as e:
+            await queue.put(e)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        except Exception as e:
+            logger.error(f"Generation failed: {e}")
+            await queue.put({'type': 'error', 'message': str(e)})
+        finally:
+            try:
+                await chunks.aclose()
+            except Exception as e:
+                logger.error(f"Error closing generation: {e}")
+            # Once cancelled nobody is reading, and a full queue would never drain
+            if not cancelled:
+                await queue.put(_DONE)
+
+    producer = asyncio.create_task(pump())
+    watcher = asyncio.create_task(_cancel_on_disconnect(http_request, producer))
+    getter = None
+    try:
+        while True:
+            # Keep one pending get across heartbeats so no chunk is dropped
+            if getter is None:
+                getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter}, timeout=heartbeat)
+            if not done:
+                yield None
+                continue
+
+            chunk = getter.result()
+            getter = None
+            if chunk is _DONE:
+                break
+            if isinstance(chunk, SchedulerSaturated):
+                raise chunk
+            yield chunk
+    finally:
+        if getter is not None:
+            getter.cancel()
+        watcher.cancel()
+        producer.cancel()
+
+async def _text_stream(http_request: Request, events: AsyncGenerator[Dict[str, Any], None]) -> AsyncGenerator[str, None]:
+    """Plain text response body for /chat/message with stream=true"""
+    try:
+        async for event in _stream_until_disconnect(http_request, events):
+            if event['type'] == 'token':
+                yield event['content']
+            elif event['type'] == 'error':
+                yield f"Error: {event['message']}"
+    except SchedulerSaturated as e:
+        yield f"Error: {e}"
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """One Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _start_turn(request: ChatRequest) -> Tuple[Optional[ChatSession], List[Dict[str, str]]]:
+    """
+    Resolve the conversation a request continues
+
+    A new session is not stored yet (its id is empty) so a rejected
+    request leaves nothing behind; _open_session stores it once the
+    turn is admitted.
+
+    Returns:
+        (session or None for full-history requests, messages ending
+        with the new one)
+    """
+    if (request.message is None) == (request.messages is None):
+        raise HTTPException(status_code=400, detail="Send either 'message' (with an optional session_id) or the full 'messages' history")
+    if request.messages is not None and request.session_id is not None:
+        raise HTTPException(status_code=400, detail="'session_id' goes with 'message', not 'messages'")
+
+    if request.messages is not None:
+        logger.info(f"Received chat request with {len(request.messages)} messages")
+        return None, [{"role": msg.role, "content": msg.content} for msg in request.messages]
+
+    if request.session_id:
+        session = await session_store.get(request.session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Unknown chat session")
+    else:
+        session = ChatSession(id='')
+
+    logger.info(f"Received chat message for session {session.id or '(new)'} ({len(session.messages)} earlier messages)")
+    return session, [*session.messages, {"role": "user", "content": request.message}]
+
+async def _open_session(session: Optional[ChatSession]) -> Optional[str]:
+    """Store a new session from _start_turn, returning the session id"""
+    if session is None:
+        return None
+    if not session.id:
+        session.id = await session_store.create()
+    return session.id
+
+def _prompt(session: Optional[ChatSession], messages: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], Optional[str]]:
+    """Messages to send and the summary of older turns, within the token budget"""
+    if session is None:
+        # Clients keeping their own history only get it trimmed
+        return context_window.prepare(messages, system_prompt=llm_service.system_prompt)
+
+    return context_window.prepare(
+        messages,
+        system_prompt=llm_service.system_prompt,
+        summary=session.summary,
+        start=session.start,
+        key=session.id,
+        on_summary=lambda summary: session_store.save_summary(session.id, summary)
+    )
+
+async def _save_turn(session_id: Optional[str], messages: List[Dict[str, str]], reply: str):
+    """Add the new message and its reply to the session"""
+    if session_id:
+        await session_store.append(session_id, [messages[-1], {"role": "assistant", "content": reply}])
+
+async def _recorded(
+    session_id: Optional[str],
+    messages: List[Dict[str, str]],
+    events: AsyncGenerator[Dict[str, Any], None]
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """Pass generation events through, saving the turn once the reply is complete"""
+    parts = []
+    async with aclosing(events):
+        async for event in events:
+            if event['type'] == 'token':
+                parts.append(event['content'])
+            elif event['type'] == 'done':
+                await _save_turn(session_id, messages, "".join(parts))
+            yield event
+
+async def _command_reply(messages: List[Dict[str, str]]) -> Optional[str]:
+    """Run the last message if it is a slash command, returning the reply text"""
+    if not messages:
+        return None
+    last_message = messages[-1]
+    if last_message['role'] != 'user':
+        return None
+    parsed_command = command_parser.parse(last_message['content'])
+    if not parsed_command:
+        return None
+
+    logger.info(f"Detected command: {parsed_command}")
+    result = await command_parser.execute(parsed_command)
+
+    if result['success']:
+        # Special handling for help command
+        if result['message'] == 'help_all':
+            commands = result['data']['commands']
+            response_text = "📚 Available Commands\n\n"
+            for cmd in sorted(commands, key=lambda x: x['name']):
+                response_text += f"/{cmd['name']}\n"
+                response_text += f"  {cmd['description']}\n"
+                response_text += f"  Usage: {cmd['syntax']}\n\n"
+            response_text += "Type /help <command> for more details"
+        elif result['message'] == 'help_specific':
+            cmd_def = result['data']['definition']
+            cmd_name = result['data']['command']
+            response_text = f"📖 Help: /{cmd_name}\n\n"
+            response_text += f"Description: {cmd_def.get('description', 'N/A')}\n"
+            response_text += f"Usage: {cmd_def.get('syntax', 'N/A')}\n\n"
+            if 'examples' in cmd_def and cmd_def['examples']:
+                response_text += "Examples:\n"
+                for example in cmd_def['examples']:
+                    response_text += f"  {example}\n"
+        elif result['message'] == 'search_results':
+            # Handle search results
+            search_data = result['data']
+            results = search_data['results']
+            count = search_data['count']
+            total = search_data.get('total') or count
+
+            response_text = f"🔍 Search Results: {total} matches found\n\n"
+
+            if count == 0:
+                response_text += "No results found for your query."
+            else:
+                shown = results[:10]  # Show max 10
+                for i, res in enumerate(shown, 1):
+                    response_text += f"{i}. {res['file']}\n"
+                    for excerpt in res.get('excerpts') or [res]:
+                        response_text += f"   Line {excerpt['line_number']}: {excerpt['excerpt']}\n"
+                    response_text += "\n"
+
+                if total > len(shown):
+                    response_text += f"... and {total - len(shown)} more results"
+        else:
+            # Regular command response
+            response_text = f"✓ Command recognized: /{parsed_command['command']}\n\n"
+            if parsed_command['definition']:
+                response_text += f"{parsed_command['definition'].get('description', '')}\n\n"
+            response_text += f"Arguments: {parsed_command['args'] or 'none'}\n\n"
+            response_text += "Note: Full command execution coming soon!"
+    else:
+        response_text = f"✗ {result['message']}"
+
+    return response_text
+
 @router.post("/message")
-async def chat_message(request: ChatRequest):
+async def chat_message(request: ChatRequest, http_request: Request):
     """Send message to LLM"""
+    session, messages = await _start_turn(request)
 
-    logger.info(f"Received chat request: {request.model_dump()}")
-
-    # Check if the last message is a slash command
-    if request.messages:
-        last_message = request.messages[-1]
-        if last_message.role == 'user':
-            parsed_command = command_parser.parse(last_message.content)
-
-            if parsed_command:
-                logger.info(f"Detected command: {parsed_command}")
-                result = await command_parser.execute(parsed_command)
-
-                if result['success']:
-                    # Special handling for help command
-                    if result['message'] == 'help_all':
-                        commands = result['data']['commands']
-                        response_text = "📚 Available Commands\n\n"
-                        for cmd in sorted(commands, key=lambda x: x['name']):
-                            response_text += f"/{cmd['name']}\n"
-                            response_text += f"  {cmd['description']}\n"
-                            response_text += f"  Usage: {cmd['syntax']}\n\n"
-                        response_text += "Type /help <command> for more details"
-                    elif result['message'] == 'help_specific':
-                        cmd_def = result['data']['definition']
-                        cmd_name = result['data']['command']
-                        response_text = f"📖 Help: /{cmd_name}\n\n"
-                        response_text += f"Description: {cmd_def.get('description', 'N/A')}\n"
-                        response_text += f"Usage: {cmd_def.get('syntax', 'N/A')}\n\n"
-                        if 'examples' in cmd_def and cmd_def['examples']:
-                            response_text += "Examples:\n"
-                            for example in cmd_def['examples']:
-                                response_text += f"  {example}\n"
-                    elif result['message'] == 'search_results':
-                        # Handle search results
-                        search_data = result['data']
-                        results = search_data['results']
-                        count = search_data['count']
-
-                        response_text = f"🔍 Search Results: {count} matches found\n\n"
-
-                        if count == 0:
-                            response_text += "No results found for your query."
-                        else:
-                            for i, res in enumerate(results[:10], 1):  # Show max 10
-                                response_text += f"{i}. {res['file']}\n"
-                                response_text += f"   Line {res['line_number']}: {res['excerpt']}\n\n"
-
-                            if count > 10:
-                                response_text += f"... and {count - 10} more results"
-                    else:
-                        # Regular command response
-                        response_text = f"✓ Command recognized: /{parsed_command['command']}\n\n"
-                        if parsed_command['definition']:
-                            response_text += f"{parsed_command['definition'].get('description', '')}\n\n"
-                        response_text += f"Arguments: {parsed_command['args'] or 'none'}\n\n"
-                        response_text += "Note: Full command execution coming soon!"
-                else:
-                    response_text = f"✗ {result['message']}"
-
-                return {"response": response_text}
+    # Slash commands are answered without the LLM
+    response_text = await _command_reply(messages)
+    if response_text is not None:
+        session_id = await _open_session(session)
+        await _save_turn(session_id, messages, response_text)
+        return {"response": response_text, "session_id": session_id}
 
-    llm = LLMService()
+    user = http_request.client.host if http_request.client else 'anonymous'
 
-    # Convert messages to dict format
-    messages_dict = [
-        {"role": msg.role, "content": msg.content}
-        for msg in request.messages
-    ]
+    # Reject before any response is sent if the queue is already full
+    try:
+        llm_service.scheduler.check('interactive', user)
+    except SchedulerSaturated as e:
+        raise _busy(e)
 
-    logger.info(f"Converted messages: {messages_dict}")
+    session_id = await _open_session(session)
+    prompt, summary = _prompt(session, messages)
 
     if request.stream:
-        async def generate():
-            async for chunk in llm.generate_response(messages_dict, stream=True):
-                yield chunk
-
         return StreamingResponse(
-            generate(),
-            media_type="text/plain"
+            _text_stream(
+                http_request,
+                _recorded(session_id, messages, llm_service.stream_events(prompt, stream=True, user=user, summary=summary))
+            ),
+            media_type="text/plain",
+            headers={"X-Session-Id": session_id} if session_id else None
         )
     else:
-        # Non-streaming response
-        response_parts = []
-        async for chunk in llm.generate_response(messages_dict, stream=False):
-            response_parts.append(chunk)
+        # Non-streaming response; still abandoned if the client goes away
+        async def collect() -> str:
+            response_parts = []
+            events = _recorded(session_id, messages, llm_service.stream_events(prompt, stream=False, user=user, summary=summary))
+            async for event in events:
+                if event['type'] == 'token':
+                    response_parts.append(event['content'])
+                elif event['type'] == 'error':
+                    response_parts.append(f"Error: {event['message']}")
+            return "".join(response_parts)
+
+        generation = asyncio.create_task(collect())
+        watcher = asyncio.create_task(_cancel_on_disconnect(http_request, generation))
+        try:
+            response_text = await generation
+        except SchedulerSaturated as e:
+            raise _busy(e)
+        except asyncio.CancelledError:
+            if not watcher.done():
+                raise
+            # Nobody is listening; 499 is the conventional "client closed request"
+            return Response(status_code=499)
+        finally:
+            watcher.cancel()
+
+        return {"response": response_text, "session_id": session_id}
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest, http_request: Request):
+    """
+    Stream a reply as Server-Sent Events
+
+    Events: 'start' ({model, session_id}), one 'token' per chunk
+    ({content}), then 'done' ({model, usage, timing}) or 'error'
+    ({message}). A comment line is sent while the model is quiet so
+    proxies keep the stream open.
+    """
+    session, messages = await _start_turn(request)
+    response_text = await _command_reply(messages)
+
+    user = http_request.client.host if http_request.client else 'anonymous'
+
+    if response_text is None:
+        try:
+            llm_service.scheduler.check('interactive', user)
+        except SchedulerSaturated as e:
+            raise _busy(e)
+
+    session_id = await _open_session(session)
+
+    async def event_stream():
+        if response_text is not None:
+            # Slash commands are answered without the LLM
+            await _save_turn(session_id, messages, response_text)
+            yield _sse('start', {'model': None, 'session_id': session_id})
+            yield _sse('token', {'content': response_text})
+            yield _sse('done', {'model': None, 'usage': None, 'timing': None})
+            return
+
+        yield _sse('start', {'model': llm_service.model, 'session_id': session_id})
+        prompt, summary = _prompt(session, messages)
+        events = _recorded(session_id, messages, llm_service.stream_events(prompt, stream=True, user=user, summary=summary))
+        try:
+            async for event in _stream_until_disconnect(http_request, events, heartbeat=SSE_HEARTBEAT_SECONDS):
+                if event is None:
+                    yield ": keep-alive\n\n"
+                elif event['type'] == 'token':
+                    yield _sse('token', {'content': event['content']})
+                elif event['type'] == 'done':
+                    timing = event['timing']
+                    logger.info(
+                        f"Generated {event['usage']['completion_tokens']} tokens with {event['model']}: "
+                        f"ttft {timing['ttft_ms']}ms, {timing['tokens_per_s']} tok/s, {timing['latency_ms']}ms total"
+                    )
+                    yield _sse('done', {k: v for k, v in event.items() if k != 'type'})
+                else:
+                    yield _sse('error', {'message': event['message']})
+        except SchedulerSaturated as e:
+            yield _sse('error', {'message': str(e), 'retry_after': e.retry_after})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@router.get("/sessions/{session_id}")
+async def get_session(session_id: str):
+    """Get the messages kept for a chat session"""
+    messages = await session_store.history(session_id)
+
+    if messages is None:
+        raise HTTPException(status_code=404, detail="Unknown chat session")
+
+    return {"session_id": session_id, "messages": messages}
+
+@router.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    """Forget a chat session"""
+    context_window.forget(session_id)
+    if not await session_store.delete(session_id):
+        raise HTTPException(status_code=404, detail="Unknown chat session")
 
-        return {"response": "".join(response_parts)}
+    return {"deleted": session_id}
 
 @router.get("/health")
 async def chat_health():
     """Check if LLM is accessible"""
-    llm = LLMService()
-    healthy = llm.check_health()
+    healthy = await llm_service.check_health()
 
     if not healthy:
         raise HTTPException(status_code=503, detail="LLM service unavailable")
 
-    return {"status": "healthy", "model": "qwen2.5-coder:7b"}
+    return {"status": "healthy", "model": llm_service.model}
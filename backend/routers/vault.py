@@ -1,9 +1,17 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 import sys
+import json
+import asyncio
+import base64
+import binascii
 import logging
 sys.path.append('..')
 from services.obsidian import ObsidianService
+from services.obsidian.content_cache import choose_encoding
+from email.utils import parsedate_to_datetime
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,32 +23,211 @@ obsidian_service = ObsidianService()
 
 router = APIRouter(prefix="/vault", tags=["vault"])
 
+def _encode_cursor(path: str) -> str:
+    """Opaque pagination cursor for the last path of a page"""
+    return base64.urlsafe_b64encode(path.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode('ascii'), altchars=b'-_', validate=True).decode('utf-8')
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match header, as RFC 9110 requires"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return etag in candidates
+
 @router.get("/files")
-async def list_files():
-    """Get list of all markdown files in the vault"""
-    result = await obsidian_service.list_all_notes()
+async def list_files(
+    request: Request,
+    response: Response,
+    folder: str = Query('', description="Only list files under this folder"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Page size (omit for all files)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields: path,name,folder,size,mtime")
+):
+    """Get list of markdown files in the vault, optionally paginated"""
+    field_list = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+    if field_list:
+        unknown = set(field_list) - set(obsidian_service.NOTE_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    after = _decode_cursor(cursor) if cursor else None
+
+    # The listing only changes with the manifest, so revalidate before doing any work
+    version = await obsidian_service.notes_version()
+    if version is None:
+        raise HTTPException(status_code=500, detail=f"Vault not found: {obsidian_service.vault_path}")
+
+    etag = f'"{version}"'
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if _etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+
+    result = await obsidian_service.list_all_notes(
+        folder=folder,
+        after=after,
+        limit=limit,
+        fields=field_list
+    )
 
     if not result['success']:
         raise HTTPException(status_code=500, detail=result['error'])
 
+    response.headers.update(headers)
+
+    next_after = result['next_after']
+
     return {
         "files": result['notes'],
-        "count": len(result['notes'])
+        "count": len(result['notes']),
+        "total": result['total'],
+        "next_cursor": _encode_cursor(next_after) if next_after else None
     }
 
+def _not_modified_since(if_modified_since: Optional[str], mtime: float) -> bool:
+    """Check an If-Modified-Since header (second resolution)"""
+    if not if_modified_since:
+        return False
+    try:
+        return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
 @router.get("/file")
-async def get_file(path: str = Query(..., description="Relative path to the file within the vault")):
+async def get_file(
+    request: Request,
+    path: str = Query(..., description="Relative path to the file within the vault")
+):
     """Get content of a specific markdown file"""
-    result = await obsidian_service.read_note(path)
+    result = await obsidian_service.get_note(path)
+
+    if not result['success']:
+        raise HTTPException(status_code=404, detail=result['error'])
+
+    note = result['note']
+    encoding = choose_encoding(request.headers.get('accept-encoding'), len(note.body))
+    headers = {
+        'ETag': note.etag_for(encoding),
+        'Last-Modified': note.last_modified,
+        'Cache-Control': 'no-cache',
+        'Vary': 'Accept-Encoding'
+    }
+
+    # If-None-Match takes precedence; any encoding of the same content matches
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, note.etag) or _etag_matches(if_none_match, headers['ETag'])
+    else:
+        not_modified = _not_modified_since(request.headers.get('if-modified-since'), note.mtime)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    if encoding in note.encoded or not encoding:
+        body = obsidian_service.content_cache.encoded_body(note, encoding)
+    else:
+        # First request in this encoding - compress off the event loop
+        body = await asyncio.to_thread(obsidian_service.content_cache.encoded_body, note, encoding)
+
+    if encoding:
+        headers['Content-Encoding'] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+class BatchFilesRequest(BaseModel):
+    paths: List[str] = Field(..., min_length=1, max_length=200)
+    mode: Literal['full', 'frontmatter', 'head'] = 'full'
+    max_bytes: int = Field(4096, ge=1, le=1_000_000)  # Only used by 'head' mode
+
+@router.post("/files/batch")
+async def get_files_batch(request: BatchFilesRequest):
+    """Get contents (or frontmatter, or the first bytes) of many files at once"""
+    result = await obsidian_service.read_notes(
+        request.paths,
+        mode=request.mode,
+        max_bytes=request.max_bytes
+    )
+
+    if not result['success']:
+        raise HTTPException(status_code=400, detail=result['error'])
+
+    return {
+        "files": result['notes'],
+        "count": len(result['notes']),
+        "errors": sum(1 for note in result['notes'] if note['error'])
+    }
+
+@router.get("/outline")
+async def get_outline(path: str = Query(..., description="Relative path to the file within the vault")):
+    """List a file's headings with the line and byte span of each section"""
+    result = await obsidian_service.get_outline(path)
 
     if not result['success']:
         raise HTTPException(status_code=404, detail=result['error'])
 
     return {
         "path": path,
+        "outline": result['outline']
+    }
+
+@router.get("/section")
+async def get_section(
+    path: str = Query(..., description="Relative path to the file within the vault"),
+    heading: str = Query(..., min_length=1, description="Heading title of the section")
+):
+    """Get one section of a file, up to the next heading of the same or higher level"""
+    result = await obsidian_service.read_section(path, heading)
+
+    if not result['success']:
+        raise HTTPException(status_code=404, detail=result['error'])
+
+    return {
+        "path": path,
+        "heading": result['heading'],
         "content": result['content']
     }
 
+@router.get("/range")
+async def get_range(
+    path: str = Query(..., description="Relative path to the file within the vault"),
+    start_byte: Optional[int] = Query(None, ge=0, description="First byte to return"),
+    end_byte: Optional[int] = Query(None, ge=0, description="Byte offset to stop at"),
+    start_line: Optional[int] = Query(None, ge=1, description="First line to return (1-based)"),
+    end_line: Optional[int] = Query(None, ge=1, description="Last line to return (inclusive)")
+):
+    """Get part of a file by byte range or line range"""
+    by_lines = start_line is not None or end_line is not None
+    if by_lines and (start_byte is not None or end_byte is not None):
+        raise HTTPException(status_code=400, detail="Use either a byte range or a line range, not both")
+    if start_byte is not None and end_byte is not None and end_byte < start_byte:
+        raise HTTPException(status_code=400, detail="end_byte must not be before start_byte")
+    if start_line is not None and end_line is not None and end_line < start_line:
+        raise HTTPException(status_code=400, detail="end_line must not be before start_line")
+
+    result = await obsidian_service.read_range(
+        path,
+        start_byte=start_byte,
+        end_byte=end_byte,
+        start_line=start_line,
+        end_line=end_line
+    )
+
+    if not result['success']:
+        raise HTTPException(status_code=404, detail=result['error'])
+
+    return {
+        "path": path,
+        "content": result['content'],
+        "truncated": result['truncated']
+    }
+
 @router.get("/recent")
 async def list_recent(limit: int = Query(10, description="Number of recent files to return")):
     """Get list of recently modified files"""
@@ -53,3 +240,64 @@ async def list_recent(limit: int = Query(10, description="Number of recent files
         "files": result['notes'],
         "count": len(result['notes'])
     }
+
+@router.get("/changes")
+async def list_changes(
+    since: Optional[int] = Query(None, description="Last sequence number already seen (omit to get the current one)"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum changes to return")
+):
+    """Get vault changes after a sequence number"""
+    change_log = obsidian_service.change_log
+
+    if since is None:
+        return {"changes": [], "latest_seq": change_log.latest_seq, "reset": False}
+
+    events, reset = change_log.since(since, limit)
+    return {
+        "changes": [event.to_dict() for event in events],
+        "latest_seq": events[-1].seq if events else change_log.latest_seq,
+        "reset": reset
+    }
+
+# Comment line sent when a change stream is idle, so proxies keep it open
+SSE_HEARTBEAT_SECONDS = 15
+
+@router.get("/changes/stream")
+async def stream_changes(
+    request: Request,
+    since: Optional[int] = Query(None, description="Last sequence number already seen (defaults to now)")
+):
+    """Stream vault changes as Server-Sent Events"""
+    change_log = obsidian_service.change_log
+
+    # Reconnecting EventSource clients resume from the last id they received
+    last_event_id = request.headers.get('last-event-id')
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    if since is None:
+        since = change_log.latest_seq
+
+    async def event_stream():
+        seq = since
+        while not await request.is_disconnected():
+            events, reset = await change_log.wait(seq, timeout=SSE_HEARTBEAT_SECONDS)
+
+            if reset:
+                # Client must re-list; continue from the current position
+                seq = change_log.latest_seq
+                yield f"id: {seq}\nevent: reset\ndata: {json.dumps({'latest_seq': seq})}\n\n"
+                continue
+
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+
+            for event in events:
+                seq = event.seq
+                yield f"id: {seq}\nevent: change\ndata: {json.dumps(event.to_dict())}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
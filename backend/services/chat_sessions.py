@@ -0,0 +1,307 @@
+"""
+Server-side history for web chat sessions.
+
+Clients send only their new message along with a session id, and the
+conversation is kept here. Each session holds a bounded number of recent
+messages. Sessions are persisted in SQLite so they survive restarts, and
+recently used ones stay in memory so a turn costs one write instead of
+re-reading the whole conversation. Each session also stores the rolling
+summary of turns that no longer fit the model's context window.
+"""
+
+import os
+import time
+import secrets
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .context_window import RollingSummary
+from .tools.async_io import AsyncFileIO, get_default_io
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChatSession:
+    """A session's kept messages and the summary of older turns."""
+    id: str
+    messages: List[Dict[str, str]] = field(default_factory=list)
+    start: int = 0  # Older messages dropped from storage
+    summary: RollingSummary = field(default_factory=RollingSummary)
+
+
+class ChatSessionStore:
+    """Bounded, persisted message history per chat session."""
+
+    # Bump when the table layout changes to force a rebuild
+    SCHEMA_VERSION = 2
+
+    # Sessions whose history is kept in memory
+    CACHE_SESSIONS = 64
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_messages: Optional[int] = None,
+        max_sessions: Optional[int] = None,
+        io: Optional[AsyncFileIO] = None
+    ):
+        """
+        Initialize chat session store.
+
+        Args:
+            db_path: SQLite file (defaults to CHAT_SESSIONS_DB, or
+                chat-sessions.db under OBSIDIAN_INDEX_DIR)
+            max_messages: Messages kept per session, oldest dropped first
+                (defaults to CHAT_SESSION_MAX_MESSAGES or 200)
+            max_sessions: Sessions kept, least recently used dropped first
+                (defaults to CHAT_SESSION_LIMIT or 100)
+            io: Thread pool for the blocking database calls (defaults to the shared pool)
+        """
+        index_dir = os.getenv('OBSIDIAN_INDEX_DIR', os.path.join(Path.home(), '.cache', 'personal-ai'))
+        self.db_path = Path(os.path.expanduser(
+            db_path or os.getenv('CHAT_SESSIONS_DB') or os.path.join(index_dir, 'chat-sessions.db')
+        ))
+        self.max_messages = max_messages or int(os.getenv('CHAT_SESSION_MAX_MESSAGES', 200))
+        self.max_sessions = max_sessions or int(os.getenv('CHAT_SESSION_LIMIT', 100))
+        self.io = io or get_default_io()
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # session id -> session, least recently used first; only touched
+        # on the event loop
+        self._cache: "OrderedDict[str, ChatSession]" = OrderedDict()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (call with the lock held)."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == 1:
+                # Version 2 added the rolling summary; keep existing sessions
+                conn.executescript("""
+                    ALTER TABLE sessions ADD COLUMN summary TEXT NOT NULL DEFAULT '';
+                    ALTER TABLE sessions ADD COLUMN summary_covered INTEGER NOT NULL DEFAULT 0;
+                """)
+            elif version != self.SCHEMA_VERSION:
+                if version:
+                    logger.info(f"Chat session schema {version} is outdated - dropping sessions")
+                conn.executescript("""
+                    DROP TABLE IF EXISTS messages;
+                    DROP TABLE IF EXISTS sessions;
+                """)
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id TEXT PRIMARY KEY,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    summary TEXT NOT NULL DEFAULT '',
+                    summary_covered INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated);
+                CREATE TABLE IF NOT EXISTS messages (
+                    session_id TEXT NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+                    seq INTEGER NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    PRIMARY KEY (session_id, seq)
+                );
+            """)
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, session: ChatSession):
+        self._cache[session.id] = session
+        self._cache.move_to_end(session.id)
+        while len(self._cache) > self.CACHE_SESSIONS:
+            self._cache.popitem(last=False)
+
+    async def create(self) -> str:
+        """
+        Start a new, empty session.
+
+        Returns:
+            The session id
+        """
+        session_id = secrets.token_urlsafe(16)
+
+        def insert() -> List[str]:
+            now = time.time()
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT INTO sessions (id, created, updated) VALUES (?, ?, ?)",
+                    (session_id, now, now)
+                )
+                expired = [row[0] for row in conn.execute(
+                    "SELECT id FROM sessions ORDER BY updated DESC LIMIT -1 OFFSET ?",
+                    (self.max_sessions,)
+                )]
+                conn.executemany("DELETE FROM sessions WHERE id = ?", [(sid,) for sid in expired])
+                conn.commit()
+            return expired
+
+        expired = await self.io.run(insert)
+        for sid in expired:
+            self._cache.pop(sid, None)
+        if expired:
+            logger.info(f"Dropped {len(expired)} least recently used chat sessions")
+
+        self._remember(ChatSession(id=session_id))
+        return session_id
+
+    async def get(self, session_id: str) -> Optional[ChatSession]:
+        """
+        Get a session's messages, oldest first, and its summary.
+
+        Returns:
+            A copy of the session, or None for an unknown session
+        """
+        session = self._cache.get(session_id)
+        if session is None:
+            def load() -> Optional[ChatSession]:
+                with self._lock:
+                    conn = self._connect()
+                    row = conn.execute(
+                        "SELECT summary, summary_covered FROM sessions WHERE id = ?",
+                        (session_id,)
+                    ).fetchone()
+                    if not row:
+                        return None
+                    rows = conn.execute(
+                        "SELECT seq, role, content FROM messages WHERE session_id = ? ORDER BY seq",
+                        (session_id,)
+                    ).fetchall()
+                return ChatSession(
+                    id=session_id,
+                    messages=[{'role': role, 'content': content} for _, role, content in rows],
+                    start=rows[0][0] - 1 if rows else 0,
+                    summary=RollingSummary(text=row[0], covered=row[1])
+                )
+
+            session = await self.io.run(load)
+            if session is None:
+                return None
+            self._remember(session)
+        else:
+            self._cache.move_to_end(session_id)
+
+        return ChatSession(
+            id=session.id,
+            messages=list(session.messages),
+            start=session.start,
+            summary=RollingSummary(session.summary.text, session.summary.covered)
+        )
+
+    async def history(self, session_id: str) -> Optional[List[Dict[str, str]]]:
+        """
+        Get a session's messages, oldest first.
+
+        Returns:
+            [{'role', 'content'}], or None for an unknown session
+        """
+        session = await self.get(session_id)
+        return session.messages if session else None
+
+    async def append(self, session_id: str, messages: List[Dict[str, str]]) -> bool:
+        """
+        Add messages to a session, dropping the oldest beyond max_messages.
+
+        Returns:
+            False if the session no longer exists
+        """
+        def insert() -> bool:
+            with self._lock:
+                conn = self._connect()
+                updated = conn.execute(
+                    "UPDATE sessions SET updated = ? WHERE id = ?",
+                    (time.time(), session_id)
+                ).rowcount
+                if not updated:
+                    return False
+
+                last = conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM messages WHERE session_id = ?",
+                    (session_id,)
+                ).fetchone()[0]
+                conn.executemany(
+                    "INSERT INTO messages (session_id, seq, role, content) VALUES (?, ?, ?, ?)",
+                    [
+                        (session_id, last + i, message['role'], message['content'])
+                        for i, message in enumerate(messages, 1)
+                    ]
+                )
+                conn.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND seq <= ?",
+                    (session_id, last + len(messages) - self.max_messages)
+                )
+                conn.commit()
+            return True
+
+        if not await self.io.run(insert):
+            self._cache.pop(session_id, None)
+            return False
+
+        cached = self._cache.get(session_id)
+        if cached is not None:
+            cached.messages.extend(messages)
+            dropped = len(cached.messages) - self.max_messages
+            if dropped > 0:
+                del cached.messages[:dropped]
+                cached.start += dropped
+            self._cache.move_to_end(session_id)
+        return True
+
+    async def save_summary(self, session_id: str, summary: RollingSummary):
+        """Store the rolling summary of a session's older turns."""
+        def update():
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "UPDATE sessions SET summary = ?, summary_covered = ? WHERE id = ?",
+                    (summary.text, summary.covered, session_id)
+                )
+                conn.commit()
+
+        await self.io.run(update)
+
+        cached = self._cache.get(session_id)
+        if cached is not None:
+            cached.summary = RollingSummary(summary.text, summary.covered)
+
+    async def delete(self, session_id: str) -> bool:
+        """
+        Forget a session and its messages.
+
+        Returns:
+            False if the session did not exist
+        """
+        def remove() -> bool:
+            with self._lock:
+                conn = self._connect()
+                deleted = conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount
+                conn.commit()
+            return bool(deleted)
+
+        self._cache.pop(session_id, None)
+        return await self.io.run(remove)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
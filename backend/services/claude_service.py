@@ -7,10 +7,14 @@ and conversation pattern analysis capabilities.
 
 import os
 import time
+import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from collections import deque
 
+from .llm_scheduler import LLMScheduler, SchedulerSaturated, get_default_scheduler
+from .context_window import with_summary
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +25,8 @@ class ClaudeService:
         self,
         api_key: str = None,
         model: str = "claude-3-haiku-20240307",
-        max_requests_per_minute: int = 50
+        max_requests_per_minute: int = 50,
+        scheduler: Optional[LLMScheduler] = None
     ):
         """
         Initialize Claude service.
@@ -30,11 +35,14 @@ class ClaudeService:
             api_key: Anthropic API key (defaults to env variable)
             model: Claude model to use
             max_requests_per_minute: Rate limit for API calls
+            scheduler: Admission control shared with other LLM backends
+                (defaults to the process-wide scheduler)
 
         Raises:
             ValueError: If API key not provided and not in environment
         """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
+        self.scheduler = scheduler or get_default_scheduler()
         if not self.api_key:
             logger.warning("No Anthropic API key provided - Claude service disabled")
             self.client = None
@@ -100,7 +108,10 @@ goals and self-improvement journey. Keep responses concise but helpful."""
         self,
         messages: List[Dict[str, str]],
         max_tokens: int = 1000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        priority: str = 'interactive',
+        user: str = 'anonymous',
+        summary: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Generate a response from Claude.
@@ -109,6 +120,9 @@ goals and self-improvement journey. Keep responses concise but helpful."""
             messages: List of message dicts with 'role' and 'content'
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature (0-1)
+            priority: Scheduler class ('interactive', 'telegram' or 'background')
+            user: Who the generation is for, so users take turns in the queue
+            summary: Rolling summary of earlier turns left out of messages
 
         Returns:
             {
@@ -138,13 +152,16 @@ goals and self-improvement journey. Keep responses concise but helpful."""
             # Convert messages to Claude format
             claude_messages = self._format_messages(messages)
 
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens,
-                system=self.system_prompt,
-                messages=claude_messages,
-                temperature=temperature
-            )
+            # The SDK client is synchronous; run it off the event loop
+            async with self.scheduler.submit(priority, user):
+                response = await asyncio.to_thread(
+                    self.client.messages.create,
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    system=with_summary(self.system_prompt, summary),
+                    messages=claude_messages,
+                    temperature=temperature
+                )
 
             content = response.content[0].text if response.content else ""
 
@@ -158,6 +175,13 @@ goals and self-improvement journey. Keep responses concise but helpful."""
                 'error': None
             }
 
+        except SchedulerSaturated as e:
+            return {
+                'success': False,
+                'content': '',
+                'usage': {},
+                'error': str(e)
+            }
         except Exception as e:
             error_msg = self._handle_error(e)
             logger.error(f"Claude API error: {error_msg}")
@@ -229,7 +253,9 @@ Respond in this exact JSON format:
                     'content': f"{analysis_prompt}\n\nConversation:\n{conversation_text}"
                 }],
                 max_tokens=500,
-                temperature=0.3  # Lower for consistency
+                temperature=0.3,  # Lower for consistency
+                priority='background',
+                user='analysis'
             )
 
             if not response['success']:
@@ -293,7 +319,9 @@ Conversation:
         response = await self.generate_response(
             messages=[{'role': 'user', 'content': prompt + conversation_text}],
             max_tokens=100,
-            temperature=0.5
+            temperature=0.5,
+            priority='background',
+            user='summary'
         )
 
         return response['content'][:150] if response['success'] else ""
@@ -324,7 +352,9 @@ Conversation:
         response = await self.generate_response(
             messages=[{'role': 'user', 'content': prompt + conversation_text}],
             max_tokens=300,
-            temperature=0.5
+            temperature=0.5,
+            priority='background',
+            user='insights'
         )
 
         if not response['success']:
@@ -118,8 +118,8 @@ class CommandParser:
                     }
                 }
 
-        # Handle /search command
-        if command_name == 'search' and self.obsidian_service:
+        # Handle /search (keywords) and /recall (meaning) commands
+        if command_name in ('search', 'recall') and self.obsidian_service:
             query = parsed_command['args']
             if not query:
                 return {
@@ -128,7 +128,11 @@ class CommandParser:
                     'data': None
                 }
 
-            search_result = await self.obsidian_service.search_vault(query)
+            search_result = await self.obsidian_service.search_vault(
+                query,
+                count_total=True,
+                mode='semantic' if command_name == 'recall' else 'keyword'
+            )
 
             if search_result['success']:
                 return {
@@ -0,0 +1,237 @@
+"""
+Token-budgeted prompts for long conversations.
+
+Conversations grow without bound, so the messages sent to the model are
+trimmed to a token budget. The system prompt and the most recent turns
+are always kept, and older turns are folded into a short rolling summary
+that travels with the system prompt. Summaries are written by the LLM in
+background tasks at 'background' priority, so a reply never waits for
+one. Until a fold finishes, the prompt carries as many of the recent,
+unsummarized turns as fit the budget; only turns a finished summary
+covers are left out for good.
+
+Folding overshoots the budget on purpose. It keeps only about half of the
+budget as raw turns, so several turns go by before the next fold and the
+prompt size follows a bounded sawtooth instead of growing with the chat.
+"""
+
+import os
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tokens per message for role markers and separators
+MESSAGE_OVERHEAD = 4
+
+# Share of the budget left for raw turns right after a fold
+FOLD_TARGET = 0.5
+
+# Longest summary asked of the model
+SUMMARY_WORDS = 150
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a user and their personal assistant.
+Keep the facts, decisions, goals, preferences and open questions the assistant will need later; drop small talk.
+Reply with the updated summary only, in at most {words} words.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}"""
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the tokens in a text
+
+    About four bytes of UTF-8 per token, which is close for English with
+    common BPE vocabularies and errs high for code and CJK. It does not
+    need a tokenizer and costs microseconds.
+    """
+    return (len(text.encode('utf-8')) + 3) // 4
+
+
+def message_tokens(message: Dict[str, str]) -> int:
+    """Estimated tokens of one chat message including its framing"""
+    return count_tokens(message.get('content', '')) + MESSAGE_OVERHEAD
+
+
+def with_summary(system_prompt: str, summary: Optional[str]) -> str:
+    """System prompt with the rolling summary of earlier turns appended"""
+    if not summary:
+        return system_prompt
+    return f"{system_prompt}\n\nSummary of the earlier conversation:\n{summary}"
+
+
+@dataclass
+class RollingSummary:
+    """Older turns of one conversation, folded into a few sentences."""
+    text: str = ''
+    covered: int = 0  # Messages folded in, counted from the start of the conversation
+
+
+# Takes the messages to send, returns {'success', 'content', 'error'}
+Summarizer = Callable[[List[Dict[str, str]]], Awaitable[Dict[str, Any]]]
+
+
+class ContextWindow:
+    """Fits conversations into a token budget, folding older turns into summaries."""
+
+    def __init__(self, summarize: Optional[Summarizer] = None, budget: Optional[int] = None):
+        """
+        Initialize context window
+
+        Args:
+            summarize: LLM call used to fold older turns into a summary
+                (without one, older turns are only dropped)
+            budget: Tokens of prompt per request, counting system prompt,
+                summary and messages (defaults to CONTEXT_TOKEN_BUDGET or 2048)
+        """
+        self.summarize = summarize
+        self.budget = budget or int(os.getenv('CONTEXT_TOKEN_BUDGET', 2048))
+
+        # Conversation key -> running fold, so each conversation folds one batch at a time
+        self._folding: Dict[str, asyncio.Task] = {}
+
+        self._trimmed = 0
+        self._folds = 0
+        self._fold_failures = 0
+
+    def metrics(self) -> Dict[str, int]:
+        """Budget, prompts that left turns out and background folds"""
+        return {
+            'budget': self.budget,
+            'trimmed': self._trimmed,
+            'folds': self._folds,
+            'fold_failures': self._fold_failures,
+            'folding': len(self._folding)
+        }
+
+    def _split(self, messages: List[Dict[str, str]], first: int, allowance: int) -> int:
+        """
+        Index of the oldest message to keep so messages[index:] fit the allowance
+
+        Never starts before first, always keeps the last message and starts
+        on a user turn, which some APIs (Claude) require.
+        """
+        used = 0
+        split = len(messages)
+        while split > first:
+            cost = message_tokens(messages[split - 1])
+            if used + cost > allowance and split < len(messages):
+                break
+            used += cost
+            split -= 1
+
+        while split < len(messages) - 1 and messages[split].get('role') != 'user':
+            split += 1
+        return split
+
+    def prepare(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: str = '',
+        summary: Optional[RollingSummary] = None,
+        start: int = 0,
+        key: Optional[str] = None,
+        on_summary: Optional[Callable[[RollingSummary], Awaitable[Any]]] = None
+    ) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """
+        Choose what to send for a conversation
+
+        Must be called from the event loop. When turns overflow the budget
+        and a summary and key are given, a background task folds them into
+        the summary, updating it in place and then awaiting on_summary
+        with it (e.g. to persist it).
+
+        Args:
+            messages: Conversation so far, ending with the new message
+            system_prompt: Prompt the backend will prepend, counted against the budget
+            summary: The conversation's rolling summary (None to only trim)
+            start: How many earlier messages of the conversation are no
+                longer in messages (e.g. dropped from storage)
+            key: Identifies the conversation, so only one fold runs for it
+            on_summary: Called after each fold with the updated summary
+
+        Returns:
+            (messages to send, summary text to add to the system prompt or None)
+        """
+        summary_text = summary.text if summary and summary.text else None
+
+        # Turns already folded into the summary are never sent again
+        first = max(0, summary.covered - start) if summary_text else 0
+        first = min(first, len(messages) - 1) if messages else 0
+
+        allowance = self.budget - count_tokens(with_summary(system_prompt, summary_text))
+        split = self._split(messages, first, allowance)
+        if split > 0:
+            self._trimmed += 1
+
+        folded_upto = summary.covered - start if summary else 0
+        if summary is not None and key and self.summarize and split > max(folded_upto, 0):
+            if key not in self._folding:
+                # Fold down to FOLD_TARGET of the allowance so the next folds are turns away
+                fold_to = max(split, self._split(messages, split, int(allowance * FOLD_TARGET)))
+                fold_to = min(fold_to, len(messages) - 1)
+                batch = messages[max(folded_upto, 0):fold_to]
+                if batch:
+                    task = asyncio.create_task(self._fold(summary, batch, start + fold_to, on_summary))
+                    self._folding[key] = task
+                    task.add_done_callback(lambda done: self._fold_done(key, done))
+
+        return messages[split:], summary_text
+
+    def _fold_done(self, key: str, task: asyncio.Task):
+        # A forgotten conversation may already have a newer fold under its key
+        if self._folding.get(key) is task:
+            del self._folding[key]
+
+    def forget(self, key: str):
+        """
+        Cancel a conversation's pending fold, e.g. when it is reset or deleted
+
+        Without this a reset conversation would wait for the old fold to
+        finish before folding again, and the old summary would still be saved.
+        """
+        task = self._folding.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    async def _fold(
+        self,
+        summary: RollingSummary,
+        batch: List[Dict[str, str]],
+        covered: int,
+        on_summary: Optional[Callable[[RollingSummary], Awaitable[Any]]]
+    ):
+        """Summarize a batch of older turns into the rolling summary"""
+        transcript = "\n".join(f"{m.get('role', 'user')}: {m.get('content', '')}" for m in batch)
+        prompt = SUMMARY_PROMPT.format(
+            words=SUMMARY_WORDS,
+            summary=summary.text or '(none yet)',
+            messages=transcript
+        )
+
+        try:
+            result = await self.summarize([{'role': 'user', 'content': prompt}])
+        except Exception as e:
+            result = {'success': False, 'content': '', 'error': str(e)}
+
+        if not result['success'] or not result['content'].strip():
+            self._fold_failures += 1
+            logger.warning(f"Could not summarize {len(batch)} older messages: {result['error'] or 'empty summary'}")
+            return
+
+        summary.text = result['content'].strip()
+        summary.covered = covered
+        self._folds += 1
+        logger.info(f"Folded {len(batch)} older messages into the conversation summary")
+
+        if on_summary:
+            try:
+                await on_summary(summary)
+            except Exception as e:
+                logger.error(f"Could not save conversation summary: {e}")
@@ -0,0 +1,239 @@
+"""
+Admission control and scheduling for LLM generations.
+
+Every generation, local (Ollama) or remote (Claude), takes a slot from one
+shared scheduler. When all slots are busy, requests wait in priority order
+(interactive chat, then Telegram replies, then background work such as
+summaries). Within a priority, users take turns so one chatty client cannot
+starve the rest. A full queue rejects new requests immediately with a
+Retry-After estimate instead of letting them pile up.
+"""
+
+import os
+import math
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first
+PRIORITIES = {
+    'interactive': 0,
+    'telegram': 1,
+    'background': 2
+}
+
+
+class SchedulerSaturated(Exception):
+    """Raised when a generation cannot even be queued."""
+
+    def __init__(self, priority: str, retry_after: int):
+        super().__init__(f"LLM is busy ({priority} queue full), retry in {retry_after}s")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class Admission:
+    """A queued or running generation's claim on a scheduler slot."""
+
+    def __init__(self, scheduler: 'LLMScheduler', priority: str, user: str):
+        self.scheduler = scheduler
+        self.priority = priority
+        self.user = user
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self._future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._done = False
+
+    @property
+    def granted(self) -> bool:
+        return self.started is not None
+
+    async def wait(self):
+        """Wait until this generation may run."""
+        if self.granted:
+            return
+        try:
+            await self._future
+        except asyncio.CancelledError:
+            self.release()
+            raise
+
+    def release(self):
+        """Give the slot back (or leave the queue). Safe to call twice."""
+        if not self._done:
+            self._done = True
+            self.scheduler._finish(self)
+
+    async def __aenter__(self) -> 'Admission':
+        await self.wait()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class LLMScheduler:
+    """Priority queue with per-user round robin in front of a fixed number of slots."""
+
+    # Recent waits kept for percentiles
+    SAMPLE_SIZE = 512
+
+    def __init__(self, max_concurrency: Optional[int] = None, max_queue: Optional[int] = None):
+        """
+        Initialize LLM scheduler.
+
+        Args:
+            max_concurrency: Generations run at once (defaults to LLM_MAX_CONCURRENCY or 4)
+            max_queue: Generations allowed to wait (defaults to LLM_MAX_QUEUE or 32);
+                background work may only fill half of it
+        """
+        self.max_concurrency = max_concurrency or int(os.getenv('LLM_MAX_CONCURRENCY', 4))
+        self.max_queue = max_queue or int(os.getenv('LLM_MAX_QUEUE', 32))
+
+        self._running = 0
+        self._queued = 0
+        # priority -> user -> waiting admissions, users in round-robin order
+        self._queues: Dict[str, "OrderedDict[str, Deque[Admission]]"] = {
+            priority: OrderedDict() for priority in PRIORITIES
+        }
+
+        # Average time a generation holds a slot, for Retry-After estimates
+        self._avg_hold = 10.0
+        self._stats: Dict[str, Dict[str, Any]] = {
+            priority: {'admitted': 0, 'rejected': 0, 'waits': deque(maxlen=self.SAMPLE_SIZE)}
+            for priority in PRIORITIES
+        }
+
+    def submit(self, priority: str = 'interactive', user: str = 'anonymous') -> Admission:
+        """
+        Claim a slot, or a place in the queue.
+
+        Must be called from the event loop. Await wait() on the result (or
+        use it as an async context manager) before generating, and release()
+        it when done.
+
+        Raises:
+            ValueError: Unknown priority
+            SchedulerSaturated: The queue is full for this priority
+        """
+        self.check(priority, user)
+        admission = Admission(self, priority, user)
+
+        if self._running < self.max_concurrency and not self._queued:
+            self._grant(admission)
+            return admission
+
+        self._queues[priority].setdefault(user, deque()).append(admission)
+        self._queued += 1
+        return admission
+
+    def check(self, priority: str = 'interactive', user: str = 'anonymous'):
+        """
+        Fail fast if a generation would be rejected right now.
+
+        Lets callers answer 429 before committing to a streamed response;
+        submit() performs the same check.
+
+        Raises:
+            ValueError: Unknown priority
+            SchedulerSaturated: The queue is full for this priority
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}', expected one of: {', '.join(PRIORITIES)}")
+
+        if self._running < self.max_concurrency and not self._queued:
+            return
+
+        limit = self.max_queue // 2 if priority == 'background' else self.max_queue
+        if self._queued >= limit:
+            self._stats[priority]['rejected'] += 1
+            retry_after = self.retry_after()
+            logger.warning(f"Rejected {priority} generation for {user}: queue full, retry in {retry_after}s")
+            raise SchedulerSaturated(priority, retry_after)
+
+    def retry_after(self) -> int:
+        """Seconds until a queued request would likely start."""
+        rounds = (self._queued + 1) / self.max_concurrency
+        return max(1, math.ceil(rounds * self._avg_hold))
+
+    def _grant(self, admission: Admission):
+        admission.started = time.monotonic()
+        self._running += 1
+        stats = self._stats[admission.priority]
+        stats['admitted'] += 1
+        stats['waits'].append(admission.started - admission.submitted)
+        if not admission._future.done():
+            admission._future.set_result(None)
+
+    def _finish(self, admission: Admission):
+        if admission.granted:
+            self._running -= 1
+            held = time.monotonic() - admission.started
+            self._avg_hold = 0.8 * self._avg_hold + 0.2 * held
+        else:
+            self._dequeue(admission)
+        self._dispatch()
+
+    def _dequeue(self, admission: Admission):
+        users = self._queues[admission.priority]
+        waiting = users.get(admission.user)
+        if waiting and admission in waiting:
+            waiting.remove(admission)
+            self._queued -= 1
+            if not waiting:
+                del users[admission.user]
+
+    def _dispatch(self):
+        """Start queued generations while slots are free."""
+        while self._running < self.max_concurrency and self._queued:
+            for priority in PRIORITIES:
+                users = self._queues[priority]
+                if users:
+                    break
+
+            # The user at the front goes next, then moves to the back
+            user, waiting = next(iter(users.items()))
+            admission = waiting.popleft()
+            self._queued -= 1
+            if waiting:
+                users.move_to_end(user)
+            else:
+                del users[user]
+
+            self._grant(admission)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Slots, queue depth and per-priority admissions, rejections and waits."""
+        priorities = {}
+        for priority, stats in self._stats.items():
+            waits = sorted(stats['waits'])
+            priorities[priority] = {
+                'queued': sum(len(w) for w in self._queues[priority].values()),
+                'admitted': stats['admitted'],
+                'rejected': stats['rejected'],
+                'wait_ms_p50': round(waits[len(waits) // 2] * 1000, 1) if waits else 0.0,
+                'wait_ms_p95': round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1) if waits else 0.0
+            }
+
+        return {
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'running': self._running,
+            'queued': self._queued,
+            'priorities': priorities
+        }
+
+
+_default_scheduler: Optional[LLMScheduler] = None
+
+
+def get_default_scheduler() -> LLMScheduler:
+    """Process-wide scheduler shared by every LLM backend."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = LLMScheduler()
+    return _default_scheduler
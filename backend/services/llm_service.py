@@ -1,15 +1,66 @@
-import ollama
-from typing import AsyncGenerator, List, Dict
-import logging
+import os
+import json
+import time
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import logging
+from collections import deque
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, List, Dict, Optional
+
+import httpx
+
+from .llm_scheduler import Admission, LLMScheduler, SchedulerSaturated, get_default_scheduler
+from .context_window import with_summary
 
 logger = logging.getLogger(__name__)
-executor = ThreadPoolExecutor(max_workers=4)
+
+# Seconds to wait for Ollama to accept a connection
+CONNECT_TIMEOUT = 5.0
+
+# Seconds idle keep-alive connections to Ollama are kept open
+KEEPALIVE_EXPIRY = 60.0
+
+# Recent generations per model kept for timing percentiles
+SAMPLE_SIZE = 512
+
 
 class LLMService:
-    def __init__(self, model: str = "qwen2.5-coder:7b"):
-        self.model = model
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        host: Optional[str] = None,
+        timeout: Optional[float] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        scheduler: Optional[LLMScheduler] = None
+    ):
+        """
+        Initialize the Ollama chat client
+
+        Args:
+            model: Model name (defaults to DEFAULT_MODEL or qwen2.5-coder:7b)
+            host: Ollama base URL (defaults to OLLAMA_HOST or http://localhost:11434)
+            timeout: Longest wait in seconds for the next piece of a response,
+                including the first token while a model loads (defaults to
+                OLLAMA_TIMEOUT or 300)
+            client: Shared HTTP client (a pooled one is created on first use if omitted)
+            scheduler: Admission control shared with other LLM backends
+                (defaults to the process-wide scheduler)
+        """
+        self.model = model or os.getenv('DEFAULT_MODEL', 'qwen2.5-coder:7b')
+        self.host = (host or os.getenv('OLLAMA_HOST', 'http://localhost:11434')).rstrip('/')
+        self.timeout = timeout or float(os.getenv('OLLAMA_TIMEOUT', 300))
+        self.scheduler = scheduler or get_default_scheduler()
+        self._client = client
+        self._owns_client = client is None
+
+        self._reset_counters()
+        self._closing = False
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0          # Stopped mid-generation (e.g. client disconnected)
+        self._cancelled_waiting = 0  # Given up while queued, before any inference
+        self._model_stats: Dict[str, Dict[str, Any]] = {}
+
         self.system_prompt = """You are a personal AI assistant focused on productivity, self-improvement, and knowledge management.
 
 You have access to the user's Obsidian vault with their personal notes, goals, habit tracking, and journal entries.
@@ -24,56 +75,380 @@ Key capabilities:
 
 Be supportive, encouraging, and help the user stay aligned with their personal goals and self-improvement journey."""
 
+    def _reset_counters(self):
+        self._waiting = 0
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def _timeout(self, timeout: Optional[float]) -> httpx.Timeout:
+        return httpx.Timeout(timeout or self.timeout, connect=CONNECT_TIMEOUT)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client for the Ollama API, keeping connections alive between requests"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.host,
+                timeout=self._timeout(None),
+                limits=httpx.Limits(
+                    # Room for health checks alongside a full set of generations
+                    max_connections=self.scheduler.max_concurrency + 2,
+                    max_keepalive_connections=self.scheduler.max_concurrency,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                )
+            )
+        return self._client
+
+    async def start(self):
+        """Open the connection pool (called from the app lifespan)"""
+        self._closing = False
+        if not self._in_flight and not self._waiting:
+            self._reset_counters()  # Bind the idle event to the running loop
+        self.client
+
+    async def close(self, drain_timeout: Optional[float] = None):
+        """
+        Stop taking new generations, let in-flight ones finish, then close
+        the HTTP client if this service created it
+
+        Args:
+            drain_timeout: Seconds to wait for in-flight generations
+                (defaults to OLLAMA_DRAIN_SECONDS or 30)
+        """
+        self._closing = True
+        if drain_timeout is None:
+            drain_timeout = float(os.getenv('OLLAMA_DRAIN_SECONDS', 30))
+
+        if self._in_flight or self._waiting:
+            logger.info(f"Waiting for {self._in_flight + self._waiting} LLM generations to finish")
+            try:
+                await asyncio.wait_for(self._idle.wait(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self._in_flight} LLM generations still running after {drain_timeout}s")
+
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Generations in progress, their outcomes and per-model timings"""
+        models = {}
+        for model, stats in self._model_stats.items():
+            models[model] = {
+                'generations': stats['generations'],
+                'ttft_ms_p50': _percentile(stats['ttft_ms'], 0.5),
+                'ttft_ms_p95': _percentile(stats['ttft_ms'], 0.95),
+                'tokens_per_s_p50': _percentile(stats['tokens_per_s'], 0.5),
+                'latency_ms_p50': _percentile(stats['latency_ms'], 0.5),
+                'latency_ms_p95': _percentile(stats['latency_ms'], 0.95)
+            }
+
+        return {
+            'in_flight': self._in_flight,
+            'waiting': self._waiting,
+            'completed': self._completed,
+            'failed': self._failed,
+            'cancelled': self._cancelled,
+            'cancelled_waiting': self._cancelled_waiting,
+            'models': models
+        }
+
     async def generate_response(
         self,
         messages: List[Dict[str, str]],
-        stream: bool = True
+        stream: bool = True,
+        timeout: Optional[float] = None,
+        priority: str = 'interactive',
+        user: str = 'anonymous',
+        summary: Optional[str] = None
     ) -> AsyncGenerator[str, None]:
-        """Generate LLM response with streaming"""
+        """
+        Generate LLM response with streaming
+
+        Tokens are read from Ollama's /api/chat as they arrive without
+        blocking the event loop. Closing the generator (or cancelling the
+        task consuming it) closes the connection, which stops generation
+        in Ollama.
+
+        Args:
+            messages: Conversation as [{'role', 'content'}]
+            stream: Yield tokens as they arrive (else one final chunk)
+            timeout: Per-request override of the read timeout in seconds
+            priority: Scheduler class ('interactive', 'telegram' or 'background')
+            user: Who the generation is for, so users take turns in the queue
+            summary: Rolling summary of earlier turns left out of messages
+
+        Yields:
+            Response text chunks ("Error: ..." if generation fails)
+
+        Raises:
+            SchedulerSaturated: Too many generations queued (on first iteration)
+        """
+        async with aclosing(self.stream_events(messages, stream, timeout, priority, user, summary)) as events:
+            async for event in events:
+                if event['type'] == 'token':
+                    yield event['content']
+                elif event['type'] == 'error':
+                    yield f"Error: {event['message']}"
+
+    async def stream_events(
+        self,
+        messages: List[Dict[str, str]],
+        stream: bool = True,
+        timeout: Optional[float] = None,
+        priority: str = 'interactive',
+        user: str = 'anonymous',
+        summary: Optional[str] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Generate LLM response as typed events
+
+        Same generation as generate_response, for callers that also want
+        usage and timing (e.g. the SSE chat endpoint).
+
+        Args:
+            messages: Conversation as [{'role', 'content'}]
+            stream: Yield tokens as they arrive (else one final token event)
+            timeout: Per-request override of the read timeout in seconds
+            priority: Scheduler class ('interactive', 'telegram' or 'background')
+            user: Who the generation is for, so users take turns in the queue
+            summary: Rolling summary of earlier turns left out of messages
+
+        Yields:
+            {'type': 'token', 'content'} for each chunk, then either
+            {'type': 'done', 'model', 'usage', 'timing'} or
+            {'type': 'error', 'message'}. Timings are in milliseconds:
+            queue_ms waiting for a slot, ttft_ms from getting the slot to
+            the first token and latency_ms from getting the slot to the end.
+
+        Raises:
+            SchedulerSaturated: Too many generations queued (on first iteration)
+        """
 
         # Prepare messages
         full_messages = [
-            {"role": "system", "content": self.system_prompt},
+            {"role": "system", "content": with_summary(self.system_prompt, summary)},
             *messages
         ]
+        payload = {"model": self.model, "messages": full_messages, "stream": stream}
+
+        if self._closing:
+            yield {'type': 'error', 'message': "LLM service is shutting down"}
+            return
+
+        admission = self.scheduler.submit(priority, user)
 
+        self._waiting += 1
+        self._idle.clear()
         try:
-            if stream:
-                # Stream response - run in thread pool since ollama is synchronous
-                def _stream():
-                    return ollama.chat(
-                        model=self.model,
-                        messages=full_messages,
-                        stream=True
-                    )
-
-                loop = asyncio.get_event_loop()
-                response_stream = await loop.run_in_executor(executor, _stream)
-
-                for chunk in response_stream:
-                    content = chunk['message']['content']
-                    if content:
-                        yield content
-            else:
-                # Non-streaming response - run in thread pool
-                def _generate():
-                    return ollama.chat(
-                        model=self.model,
-                        messages=full_messages
-                    )
+            await admission.wait()
+        except BaseException:
+            self._waiting -= 1
+            self._cancelled_waiting += 1
+            if not self._in_flight and not self._waiting:
+                self._idle.set()
+            raise
+        self._waiting -= 1
+        self._in_flight += 1
 
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(executor, _generate)
-                yield response['message']['content']
+        started = time.monotonic()
+        first_token = None
+        chunks = 0
+        stats: Dict[str, Any] = {}
+
+        outcome = None  # Stays None if the generation is cancelled or closed early
+        try:
+            async with aclosing(self._generate(payload, stream, timeout)) as events:
+                async for event in events:
+                    if event['type'] == 'token':
+                        if first_token is None:
+                            first_token = time.monotonic()
+                        chunks += 1
+                        yield event
+                    else:
+                        stats = event
+            outcome = 'completed'
 
+            finished = time.monotonic()
+            done = {
+                'type': 'done',
+                'model': stats.get('model') or self.model,
+                'usage': _usage(stats, chunks),
+                'timing': _timing(stats, chunks, admission, started, first_token, finished)
+            }
+            self._record(done)
+            yield done
+        except asyncio.CancelledError:
+            logger.info("LLM generation cancelled")
+            raise
+        except httpx.TimeoutException:
+            outcome = 'failed'
+            logger.error(f"LLM generation timed out ({self.model})")
+            yield {'type': 'error', 'message': "The model took too long to respond"}
         except Exception as e:
+            outcome = 'failed'
             logger.error(f"LLM generation error: {e}")
-            yield f"Error: {str(e)}"
+            yield {'type': 'error', 'message': str(e)}
+        finally:
+            admission.release()
+            self._in_flight -= 1
+            if outcome == 'completed':
+                self._completed += 1
+            elif outcome == 'failed':
+                self._failed += 1
+            else:
+                self._cancelled += 1
+            if not self._in_flight and not self._waiting:
+                self._idle.set()
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        priority: str = 'background',
+        user: str = 'background'
+    ) -> Dict[str, Any]:
+        """
+        Generate a whole response in one call, for background work such as summaries
+
+        Args:
+            messages: Conversation as [{'role', 'content'}]
+            priority: Scheduler class ('interactive', 'telegram' or 'background')
+            user: Who the generation is for, so users take turns in the queue
+
+        Returns:
+            {
+                'success': bool,
+                'content': str,
+                'error': str
+            }
+        """
+        parts = []
+        try:
+            async for event in self.stream_events(messages, stream=False, priority=priority, user=user):
+                if event['type'] == 'token':
+                    parts.append(event['content'])
+                elif event['type'] == 'error':
+                    return {'success': False, 'content': '', 'error': event['message']}
+        except SchedulerSaturated as e:
+            return {'success': False, 'content': '', 'error': str(e)}
+
+        return {'success': True, 'content': ''.join(parts), 'error': None}
 
-    def check_health(self) -> bool:
+    def _record(self, done: Dict[str, Any]):
+        """Keep a finished generation's timings for the per-model metrics"""
+        stats = self._model_stats.setdefault(done['model'], {
+            'generations': 0,
+            'ttft_ms': deque(maxlen=SAMPLE_SIZE),
+            'tokens_per_s': deque(maxlen=SAMPLE_SIZE),
+            'latency_ms': deque(maxlen=SAMPLE_SIZE)
+        })
+        timing = done['timing']
+        stats['generations'] += 1
+        for key in ('ttft_ms', 'tokens_per_s', 'latency_ms'):
+            if timing[key] is not None:
+                stats[key].append(timing[key])
+
+    async def _generate(
+        self,
+        payload: Dict,
+        stream: bool,
+        timeout: Optional[float]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Run one /api/chat request (the caller holds a scheduler slot and handles errors)
+
+        Yields token events, then Ollama's final object with its counters
+        """
+        if stream:
+            async with self.client.stream(
+                "POST", "/api/chat", json=payload, timeout=self._timeout(timeout)
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise RuntimeError(_error_detail(response))
+
+                # Ollama streams one JSON object per line
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get('error'):
+                        raise RuntimeError(chunk['error'])
+                    content = chunk.get('message', {}).get('content')
+                    if content:
+                        yield {'type': 'token', 'content': content}
+                    if chunk.get('done'):
+                        yield {'type': 'stats', **chunk}
+                        break
+        else:
+            response = await self.client.post(
+                "/api/chat", json=payload, timeout=self._timeout(timeout)
+            )
+            if response.status_code != 200:
+                raise RuntimeError(_error_detail(response))
+            result = response.json()
+            yield {'type': 'token', 'content': result['message']['content']}
+            yield {'type': 'stats', **result}
+
+    async def check_health(self) -> bool:
         """Check if Ollama is accessible"""
         try:
-            ollama.list()
-            return True
+            response = await self.client.get("/api/tags", timeout=self._timeout(CONNECT_TIMEOUT))
+            return response.status_code == 200
         except Exception:
             return False
+
+
+def _percentile(values, q: float) -> Optional[float]:
+    """Nearest-rank percentile of recent samples (None before the first)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 1)
+
+
+def _usage(stats: Dict[str, Any], chunks: int) -> Dict[str, Optional[int]]:
+    """Token counts from Ollama's final object (streamed chunks if it has none)"""
+    completion = stats.get('eval_count')
+    return {
+        'prompt_tokens': stats.get('prompt_eval_count'),
+        'completion_tokens': completion if completion is not None else chunks
+    }
+
+
+def _timing(
+    stats: Dict[str, Any],
+    chunks: int,
+    admission: Admission,
+    started: float,
+    first_token: Optional[float],
+    finished: float
+) -> Dict[str, Optional[float]]:
+    """Queue wait, time to first token, throughput and latency of a generation"""
+    # Ollama reports generation time in nanoseconds; otherwise time the stream
+    eval_count = stats.get('eval_count')
+    eval_duration = stats.get('eval_duration')
+    if eval_count and eval_duration:
+        tokens_per_s = eval_count / (eval_duration / 1e9)
+    elif first_token is not None and chunks > 1 and finished > first_token:
+        tokens_per_s = (chunks - 1) / (finished - first_token)
+    else:
+        tokens_per_s = None
+
+    load_duration = stats.get('load_duration')
+    return {
+        'queue_ms': round((admission.started - admission.submitted) * 1000, 1),
+        'ttft_ms': round((first_token - started) * 1000, 1) if first_token is not None else None,
+        'tokens_per_s': round(tokens_per_s, 1) if tokens_per_s is not None else None,
+        'latency_ms': round((finished - started) * 1000, 1),
+        'load_ms': round(load_duration / 1e6, 1) if load_duration else None
+    }
+
+
+def _error_detail(response: httpx.Response) -> str:
+    """Error message from a failed Ollama response"""
+    try:
+        return response.json().get('error') or f"Ollama returned HTTP {response.status_code}"
+    except ValueError:
+        return f"Ollama returned HTTP {response.status_code}"
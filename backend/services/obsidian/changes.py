@@ -0,0 +1,143 @@
+"""
+Sequenced change log for the vault.
+
+Records each batch from VaultWatcher as numbered create/modify/delete/
+rename events so clients can catch up with "what changed since N"
+instead of re-listing the vault. Only recent events are kept; a client
+that falls further behind (or whose sequence predates a restart) is
+told to reset and re-list.
+"""
+
+import time
+import asyncio
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class ChangeEvent:
+    """A numbered change to a note."""
+    seq: int
+    kind: str  # 'create', 'modify', 'delete', 'rename' or 'reset'
+    path: str  # Relative path within the vault ('' for reset)
+    old_path: Optional[str] = None  # Previous path for renames
+    timestamp: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class ChangeLog:
+    """Bounded, monotonically numbered log of vault changes."""
+
+    # Events retained for catch-up; older clients must reset
+    MAX_EVENTS = 10000
+
+    KINDS = {'created': 'create', 'modified': 'modify', 'deleted': 'delete'}
+
+    def __init__(self, max_events: int = None):
+        """
+        Initialize change log.
+
+        Args:
+            max_events: Events retained (defaults to MAX_EVENTS)
+        """
+        self._events: deque = deque(maxlen=max_events or self.MAX_EVENTS)
+
+        # Sequence numbers start from the wall clock (ms) so they keep
+        # increasing across restarts; a pre-restart sequence then falls
+        # below the log's floor and the client is told to reset.
+        self.latest_seq = int(time.time() * 1000)
+
+        self._new_events = asyncio.Event()
+
+    def record(self, changes) -> List[ChangeEvent]:
+        """
+        Append a batch of VaultChange records. Call from the event loop.
+
+        Moves arrive as a delete of the old path plus a create carrying
+        old_path; they are recorded as a single rename.
+
+        Returns:
+            The events that were appended
+        """
+        renamed_from = {
+            change.old_path for change in changes
+            if change.old_path and change.kind != 'deleted'
+        }
+
+        now = time.time()
+        events = []
+        for change in changes:
+            if change.kind == 'rescan':
+                kind = 'reset'
+            elif change.kind == 'deleted' and change.path in renamed_from:
+                continue
+            elif change.old_path and change.kind != 'deleted':
+                kind = 'rename'
+            else:
+                kind = self.KINDS.get(change.kind)
+                if kind is None:
+                    continue
+
+            self.latest_seq += 1
+            events.append(ChangeEvent(
+                seq=self.latest_seq,
+                kind=kind,
+                path=change.path,
+                old_path=change.old_path if kind == 'rename' else None,
+                timestamp=now
+            ))
+
+        if events:
+            self._events.extend(events)
+
+            # Wake every waiting stream, then arm a fresh event for the next batch
+            self._new_events.set()
+            self._new_events = asyncio.Event()
+
+        return events
+
+    def since(self, seq: int, limit: Optional[int] = None) -> Tuple[List[ChangeEvent], bool]:
+        """
+        Events after a sequence number.
+
+        Args:
+            seq: Last sequence number the client has seen
+            limit: Maximum events to return
+
+        Returns:
+            (events, reset) - reset is True when events after seq are no
+            longer retained (or seq is unknown) and the client must re-list
+        """
+        # Oldest sequence a client may hold and still catch up from
+        floor = self._events[0].seq - 1 if self._events else self.latest_seq
+        if seq < floor or seq > self.latest_seq:
+            return [], True
+
+        # Sequence numbers are contiguous, so the position is computable
+        start = seq - floor
+        end = len(self._events) if limit is None else min(len(self._events), start + limit)
+        return [self._events[i] for i in range(start, end)], False
+
+    async def wait(
+        self,
+        seq: int,
+        timeout: float,
+        limit: Optional[int] = None
+    ) -> Tuple[List[ChangeEvent], bool]:
+        """
+        Like since(), but waits up to timeout seconds for new events
+        when none are pending.
+        """
+        events, reset = self.since(seq, limit)
+        if events or reset:
+            return events, reset
+
+        waiter = self._new_events
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout)
+        except asyncio.TimeoutError:
+            return [], False
+        return self.since(seq, limit)
@@ -0,0 +1,199 @@
+"""
+Size-bounded LRU cache of note contents.
+
+Entries are validated against the note's (mtime, size), so a changed
+note is never served stale. Each entry keeps the note's serialized
+response body and, once requested, its gzip/brotli encodings, so a
+revisit costs neither a disk read nor re-encoding.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import importlib.util
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are sent uncompressed; the saving is not worth it
+MIN_COMPRESS_BYTES = 1024
+
+BROTLI_AVAILABLE = importlib.util.find_spec('brotli') is not None
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    """Encode a body as 'br' or 'gzip'."""
+    if encoding == 'br':
+        import brotli
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+def choose_encoding(accept_encoding: Optional[str], body_size: int) -> Optional[str]:
+    """
+    Pick a content encoding from an Accept-Encoding header.
+
+    Returns:
+        'br', 'gzip', or None for identity
+    """
+    if body_size < MIN_COMPRESS_BYTES or not accept_encoding:
+        return None
+
+    accepted = set()
+    for part in accept_encoding.split(','):
+        coding, _, params = part.partition(';')
+        params = params.strip().replace(' ', '')
+        try:
+            quality = float(params[2:]) if params.startswith('q=') else 1.0
+        except ValueError:
+            quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+
+    if BROTLI_AVAILABLE and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+@dataclass
+class CachedNote:
+    """A note's content and ready-to-send response bodies."""
+    path: str
+    mtime: float
+    size: int
+    content: str
+    body: bytes                 # JSON response body, uncompressed
+    etag: str                   # Strong validator for the uncompressed body
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def last_modified(self) -> str:
+        """mtime as an HTTP date."""
+        return formatdate(self.mtime, usegmt=True)
+
+    @property
+    def cost(self) -> int:
+        """Bytes this entry holds in the cache."""
+        return len(self.content) + len(self.body) + sum(len(b) for b in self.encoded.values())
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """ETag of the representation sent with an encoding (each differs)."""
+        return self.etag if not encoding else f'{self.etag[:-1]}-{encoding}"'
+
+
+class ContentCache:
+    """LRU cache of CachedNote entries bounded by total bytes."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Initialize content cache.
+
+        Args:
+            max_bytes: Cache budget (defaults to VAULT_CACHE_MB, 64 MB)
+        """
+        self.max_bytes = max_bytes or int(float(os.getenv('VAULT_CACHE_MB', 64)) * 1024 * 1024)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedNote]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0  # Counted as entries are (re)loaded via put()
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def get(self, path: str, mtime: float, size: int) -> Optional[CachedNote]:
+        """Return the cached note if it is still current for (mtime, size)."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or (entry.mtime, entry.size) != (mtime, size):
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry
+
+    @staticmethod
+    def make_entry(path: str, mtime: float, size: int, content: str) -> CachedNote:
+        """Build a note's response body and ETag."""
+        body = json.dumps(
+            {"path": path, "content": content},
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode('utf-8')
+        return CachedNote(
+            path=path,
+            mtime=mtime,
+            size=size,
+            content=content,
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        )
+
+    def put(self, entry: CachedNote) -> CachedNote:
+        """Cache an entry, evicting least recently used ones to stay in budget."""
+        path = entry.path
+        with self._lock:
+            self.misses += 1
+            self._remove(path)
+            if entry.cost <= self.max_bytes:
+                self._entries[path] = entry
+                self._bytes += entry.cost
+                self._evict()
+        return entry
+
+    def encoded_body(self, entry: CachedNote, encoding: Optional[str]) -> bytes:
+        """The entry's body in an encoding, compressed once and then reused."""
+        if not encoding:
+            return entry.body
+
+        encoded = entry.encoded.get(encoding)
+        if encoded is None:
+            encoded = _compress(entry.body, encoding)
+            with self._lock:
+                if encoding not in entry.encoded:
+                    entry.encoded[encoding] = encoded
+                    if self._entries.get(entry.path) is entry:
+                        self._bytes += len(encoded)
+                        self._evict()
+        return encoded
+
+    def invalidate(self, paths: Iterable[str]):
+        """Drop entries for changed or deleted notes."""
+        with self._lock:
+            for path in paths:
+                self._remove(path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, path: str):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= entry.cost
+
+    def _evict(self):
+        """Drop least recently used entries until within budget."""
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.cost
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -5,10 +5,11 @@ Conversation saving for Obsidian vault.
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 
 import frontmatter
 
+from ..tools.async_io import AsyncFileIO, get_default_io
 from .metadata import MetadataExtractor
 
 logger = logging.getLogger(__name__)
@@ -17,16 +18,26 @@ logger = logging.getLogger(__name__)
 class ConversationSaver:
     """Saves AI conversations to Obsidian vault."""
 
-    def __init__(self, vault_path: str, claude_service=None):
+    def __init__(
+        self,
+        vault_path: str,
+        claude_service=None,
+        on_write: Optional[Callable[[str], None]] = None,
+        io: Optional[AsyncFileIO] = None
+    ):
         """
         Initialize conversation saver.
 
         Args:
             vault_path: Path to Obsidian vault
             claude_service: Optional ClaudeService for AI summaries
+            on_write: Optional callback invoked with the path of every file written
+            io: Thread pool for blocking file I/O (defaults to the shared pool)
         """
         self.vault_path = Path(vault_path)
         self.claude_service = claude_service
+        self.on_write = on_write
+        self.io = io or get_default_io()
         self.metadata_extractor = MetadataExtractor()
 
         # Ensure folders exist
@@ -107,8 +118,8 @@ class ConversationSaver:
             post.metadata = fm_data
 
             # Save file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(frontmatter.dumps(post))
+            await self.io.write_text(file_path, frontmatter.dumps(post))
+            self._notify_write(file_path)
 
             # Link to daily note
             await self._link_to_daily_note(file_path.name, topic or topic_slug)
@@ -154,8 +165,8 @@ class ConversationSaver:
         link = f"- [[AI-Conversations/{conversation_file}|{topic}]]"
 
         try:
-            if daily_note_path.exists():
-                post = frontmatter.load(daily_note_path)
+            if await self.io.exists(daily_note_path):
+                post = await self.io.run(frontmatter.load, daily_note_path)
 
                 # Add to AI Conversations section
                 if '## AI Conversations' in post.content:
@@ -166,17 +177,22 @@ class ConversationSaver:
                 else:
                     post.content += f"\n\n## AI Conversations\n{link}\n"
 
-                with open(daily_note_path, 'w', encoding='utf-8') as f:
-                    f.write(frontmatter.dumps(post))
+                await self.io.write_text(daily_note_path, frontmatter.dumps(post))
+                self._notify_write(daily_note_path)
             else:
                 # Create daily note
                 content = self._get_daily_note_template(today, link)
-                with open(daily_note_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                await self.io.write_text(daily_note_path, content)
+                self._notify_write(daily_note_path)
 
         except Exception as e:
             logger.warning(f"Failed to link to daily note: {e}")
 
+    def _notify_write(self, file_path: Path):
+        """Report a written file to the on_write callback."""
+        if self.on_write:
+            self.on_write(str(file_path))
+
     def _format_conversation(self, messages: List[Dict[str, str]]) -> str:
         """Format messages as markdown conversation."""
         lines = ["## Conversation\n"]
@@ -0,0 +1,87 @@
+"""
+Typo-tolerant term matching for vault search.
+
+Keeps a trigram index over the search vocabulary (note words and
+filenames) so a misspelled query word like "meditaton" can be expanded
+to the indexed terms it most resembles.
+"""
+
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def fold_term(term: str) -> str:
+    """Lowercase and strip diacritics, matching the index tokenizer."""
+    decomposed = unicodedata.normalize('NFKD', term.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def trigrams(term: str) -> Set[str]:
+    """Padded character trigrams; padding makes word starts count more."""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """In-memory trigram -> term postings over the search vocabulary."""
+
+    # Minimum Jaccard similarity between trigram sets to accept a term
+    SIMILARITY_THRESHOLD = 0.4
+
+    # Expansions kept per query word
+    MAX_EXPANSIONS = 5
+
+    def __init__(self):
+        self.terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        self._term_grams: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def add_terms(self, terms: Iterable[str]):
+        """Add terms to the index; already known terms are ignored."""
+        for term in terms:
+            term = fold_term(term)
+            if len(term) < 3 or term in self._term_ids or term.isdigit():
+                continue
+
+            term_id = len(self.terms)
+            grams = trigrams(term)
+            self.terms.append(term)
+            self._term_ids[term] = term_id
+            self._term_grams.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(term_id)
+
+    def expand(self, word: str) -> List[Tuple[str, float]]:
+        """
+        Find indexed terms similar to a query word.
+
+        Args:
+            word: Query word (any case)
+
+        Returns:
+            List of (term, similarity), most similar first, including the
+            word itself when it is an indexed term
+        """
+        word = fold_term(word)
+        grams = trigrams(word)
+        if not grams:
+            return []
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for term_id in self._postings.get(gram, ()):
+                shared[term_id] += 1
+
+        matches = []
+        for term_id, count in shared.items():
+            similarity = count / (len(grams) + self._term_grams[term_id] - count)
+            if similarity >= self.SIMILARITY_THRESHOLD:
+                matches.append((self.terms[term_id], similarity))
+
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches[:self.MAX_EXPANSIONS]
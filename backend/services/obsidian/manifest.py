@@ -0,0 +1,221 @@
+"""
+In-memory manifest of the notes in the vault.
+
+Built once with the shared VaultWalker and then kept current from VaultWatcher
+batches, so listing notes is a memory read rather than a directory walk.
+Notes are kept both in path order (for listings) and in mtime order (so
+the k most recent notes are a slice, not a sort).
+"""
+
+import os
+import time
+import uuid
+import bisect
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..tools.walker import VaultWalker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NoteEntry:
+    """A note's manifest record."""
+    path: str
+    folder: str
+    name: str
+    size: int
+    mtime: float
+    content_hash: Optional[str] = None  # sha1 of the content, filled in on demand
+
+
+class VaultManifest:
+    """Path- and mtime-ordered index of vault notes, updated incrementally."""
+
+    # Without a watcher, rebuild at most this often
+    REFRESH_INTERVAL_SECONDS = 60
+
+    def __init__(self, vault_path: str, walker: Optional[VaultWalker] = None):
+        """
+        Initialize vault manifest.
+
+        Args:
+            vault_path: Path to Obsidian vault
+            walker: Walker with the vault's ignore rules (default ignores if omitted)
+        """
+        self.vault_path = Path(vault_path)
+        self.walker = walker or VaultWalker(vault_path)
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, NoteEntry] = {}
+        self._paths: List[str] = []                    # Sorted by path
+        self._by_mtime: List[Tuple[float, str]] = []   # Sorted oldest first
+        self._last_build: Optional[float] = None
+
+        # Bumped on every change; lets clients detect an unchanged listing.
+        # The instance id keeps versions distinct across restarts.
+        self.generation = 0
+        self.instance_id = uuid.uuid4().hex[:12]
+
+        # Set when a VaultWatcher feeds changes in; periodic rebuilds stop
+        self.watched = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def built(self) -> bool:
+        """Whether the manifest has been built from disk yet."""
+        return self._last_build is not None
+
+    def needs_refresh(self) -> bool:
+        """Check if the manifest should be rebuilt from disk."""
+        if not self.built:
+            return True
+        if self.watched:
+            return False
+        return time.monotonic() - self._last_build >= self.REFRESH_INTERVAL_SECONDS
+
+    def build(self):
+        """Walk the vault and replace the manifest contents (blocking)."""
+        entries: Dict[str, NoteEntry] = {
+            entry.relative: NoteEntry(
+                path=entry.relative,
+                folder=entry.relative.rpartition('/')[0],
+                name=entry.name,
+                size=entry.size,
+                mtime=entry.mtime
+            )
+            for entry in self.walker.walk(str(self.vault_path), '**/*.md')
+        }
+
+        with self._lock:
+            # Keep hashes of notes that did not change since the last build
+            for path, entry in entries.items():
+                previous = self._entries.get(path)
+                if previous and (previous.mtime, previous.size) == (entry.mtime, entry.size):
+                    entry.content_hash = previous.content_hash
+
+            changed = entries.keys() != self._entries.keys() or any(
+                (e.mtime, e.size) != (self._entries[p].mtime, self._entries[p].size)
+                for p, e in entries.items()
+            )
+
+            self._entries = entries
+            self._paths = sorted(entries)
+            self._by_mtime = sorted((e.mtime, p) for p, e in entries.items())
+            self._last_build = time.monotonic()
+            if changed:
+                self.generation += 1
+
+        logger.debug(f"Vault manifest built: {len(entries)} notes")
+
+    def apply_changes(self, changes):
+        """Update entries for a batch of VaultChange records (blocking)."""
+        if any(change.kind == 'rescan' for change in changes):
+            self.build()
+            return
+
+        for change in changes:
+            if change.kind == 'deleted':
+                self._remove(change.path)
+                continue
+            try:
+                stat = os.stat(self.vault_path / change.path)
+            except OSError:
+                self._remove(change.path)
+                continue
+            self._upsert(change.path, stat.st_size, stat.st_mtime)
+
+    def _upsert(self, path: str, size: int, mtime: float):
+        with self._lock:
+            previous = self._entries.get(path)
+            if previous:
+                if (previous.mtime, previous.size) == (mtime, size):
+                    return
+                self._by_mtime.pop(bisect.bisect_left(self._by_mtime, (previous.mtime, path)))
+            else:
+                bisect.insort(self._paths, path)
+
+            folder, _, name = path.rpartition('/')
+            self._entries[path] = NoteEntry(path=path, folder=folder, name=name, size=size, mtime=mtime)
+            bisect.insort(self._by_mtime, (mtime, path))
+            self.generation += 1
+
+    def _remove(self, path: str):
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None:
+                return
+            self._paths.pop(bisect.bisect_left(self._paths, path))
+            self._by_mtime.pop(bisect.bisect_left(self._by_mtime, (entry.mtime, path)))
+            self.generation += 1
+
+    def get(self, path: str) -> Optional[NoteEntry]:
+        """Look up a note by its vault-relative path."""
+        return self._entries.get(path)
+
+    def notes(self) -> List[NoteEntry]:
+        """All notes in path order."""
+        with self._lock:
+            return [self._entries[path] for path in self._paths]
+
+    @property
+    def version(self) -> str:
+        """Opaque token that changes whenever the manifest does."""
+        return f"{self.instance_id}-{self.generation}"
+
+    def page(
+        self,
+        folder: str = '',
+        after: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[NoteEntry], int, bool]:
+        """
+        A slice of the path-ordered notes.
+
+        Args:
+            folder: Only notes under this folder (recursively)
+            after: Start after this path (the last path of the previous page)
+            limit: Maximum notes to return (None for all)
+
+        Returns:
+            (notes, total notes under folder, whether more notes follow)
+        """
+        prefix = f"{folder.strip('/')}/" if folder.strip('/') else ''
+        with self._lock:
+            lo = bisect.bisect_left(self._paths, prefix)
+            hi = bisect.bisect_left(self._paths, prefix + '\U0010ffff') if prefix else len(self._paths)
+            start = max(lo, bisect.bisect_right(self._paths, after)) if after else lo
+            end = hi if limit is None else min(hi, start + limit)
+            notes = [self._entries[path] for path in self._paths[start:end]]
+        return notes, hi - lo, end < hi
+
+    def recent(self, limit: int = 10) -> List[NoteEntry]:
+        """The most recently modified notes, newest first."""
+        with self._lock:
+            newest = self._by_mtime[-limit:] if limit > 0 else []
+            return [self._entries[path] for _, path in reversed(newest)]
+
+    def content_hash(self, path: str) -> Optional[str]:
+        """
+        sha1 of a note's content, computed on first use and cached until
+        the note changes (blocking).
+        """
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if entry.content_hash is None:
+            try:
+                entry.content_hash = hashlib.sha1(
+                    (self.vault_path / path).read_bytes()
+                ).hexdigest()
+            except OSError as e:
+                logger.warning(f"Error hashing {path}: {e}")
+                return None
+        return entry.content_hash
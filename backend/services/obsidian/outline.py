@@ -0,0 +1,140 @@
+"""
+Heading outlines for notes.
+
+An outline lists a note's headings with the line and byte span of each
+section, so callers can fetch one section (or any byte/line range)
+instead of the whole note. Outlines are small and kept per note,
+validated against the note's (mtime, size) like the content cache.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t]*#*[ \t]*$')
+FENCE_RE = re.compile(r'^[ \t]*(```|~~~)')
+
+
+@dataclass
+class Heading:
+    """A heading and the span of its section (which includes subsections)."""
+    level: int
+    title: str
+    line: int          # 1-based line of the heading
+    end_line: int      # Last line of the section (inclusive)
+    start_byte: int    # Byte offset of the heading line
+    end_byte: int      # Byte offset just past the section
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def parse_outline(content: str) -> List[Heading]:
+    """
+    Find the headings of a note and the extent of each section.
+
+    Frontmatter and fenced code blocks are skipped, so '# comment' lines
+    inside code are not mistaken for headings.
+    """
+    headings: List[Heading] = []
+    open_sections: List[Heading] = []
+
+    offset = 0
+    in_fence = None
+    in_frontmatter = False
+    line_number = 0
+
+    for line_number, line in enumerate(content.splitlines(keepends=True), start=1):
+        line_bytes = len(line.encode('utf-8'))
+        text = line.rstrip('\r\n')
+
+        if line_number == 1 and text.strip() == '---':
+            in_frontmatter = True
+        elif in_frontmatter:
+            if text.strip() == '---':
+                in_frontmatter = False
+        elif in_fence:
+            if text.lstrip().startswith(in_fence):
+                in_fence = None
+        elif FENCE_RE.match(text):
+            in_fence = FENCE_RE.match(text).group(1)
+        else:
+            match = HEADING_RE.match(text)
+            if match:
+                level = len(match.group(1))
+
+                # A heading closes every open section at its level or deeper
+                while open_sections and open_sections[-1].level >= level:
+                    closed = open_sections.pop()
+                    closed.end_line = line_number - 1
+                    closed.end_byte = offset
+
+                heading = Heading(
+                    level=level,
+                    title=match.group(2).strip(),
+                    line=line_number,
+                    end_line=line_number,
+                    start_byte=offset,
+                    end_byte=offset
+                )
+                headings.append(heading)
+                open_sections.append(heading)
+
+        offset += line_bytes
+
+    for heading in open_sections:
+        heading.end_line = line_number
+        heading.end_byte = offset
+
+    return headings
+
+
+def find_section(headings: List[Heading], query: str) -> Optional[Heading]:
+    """
+    Find a section by heading title.
+
+    Exact (case-insensitive) matches win, then the first heading that
+    contains the query.
+    """
+    wanted = query.strip().lstrip('#').strip().lower()
+    if not wanted:
+        return None
+
+    for heading in headings:
+        if heading.title.lower() == wanted:
+            return heading
+    for heading in headings:
+        if wanted in heading.title.lower():
+            return heading
+    return None
+
+
+class OutlineIndex:
+    """Per-note outlines, validated against each note's (mtime, size)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outlines: Dict[str, Tuple[float, int, List[Heading]]] = {}
+
+    def get(self, path: str, mtime: float, size: int) -> Optional[List[Heading]]:
+        """Return the outline if it is still current for (mtime, size)."""
+        with self._lock:
+            cached = self._outlines.get(path)
+        if cached and cached[:2] == (mtime, size):
+            return cached[2]
+        return None
+
+    def put(self, path: str, mtime: float, size: int, headings: List[Heading]):
+        with self._lock:
+            self._outlines[path] = (mtime, size, headings)
+
+    def invalidate(self, paths: Iterable[str]):
+        """Drop outlines for changed or deleted notes."""
+        with self._lock:
+            for path in paths:
+                self._outlines.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._outlines.clear()
@@ -3,29 +3,48 @@ Project and goal management for Obsidian vault.
 """
 
 import os
+import asyncio
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 import frontmatter
 
+from ..tools.async_io import AsyncFileIO, get_default_io
+from ..tools.walker import VaultWalker
+
 logger = logging.getLogger(__name__)
 
 
 class ProjectManager:
     """Manages projects and goals in Obsidian vault."""
 
-    def __init__(self, vault_path: str):
+    def __init__(
+        self,
+        vault_path: str,
+        on_write: Optional[Callable[[str], None]] = None,
+        io: Optional[AsyncFileIO] = None,
+        walker: Optional[VaultWalker] = None
+    ):
         """
         Initialize project manager.
 
         Args:
             vault_path: Path to Obsidian vault
+            on_write: Optional callback invoked with the path of every file written
+            io: Thread pool for blocking file I/O (defaults to the shared pool)
+            walker: Walker with the vault's ignore rules (default ignores if omitted)
         """
         self.vault_path = Path(vault_path)
+        self.on_write = on_write
+        self.io = io or get_default_io()
+        self.walker = walker or VaultWalker(vault_path)
         self.projects_folder = self.vault_path / "Projects"
 
+        # Parsed frontmatter per project file: relative path -> (mtime, metadata)
+        self._metadata_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
         # Ensure folders exist
         self.projects_folder.mkdir(parents=True, exist_ok=True)
 
@@ -49,7 +68,7 @@ class ProjectManager:
         filename = self._sanitize_filename(name)
         file_path = self.projects_folder / f"{filename}.md"
 
-        if file_path.exists():
+        if await self.io.exists(file_path):
             return {
                 'success': False,
                 'path': str(file_path),
@@ -59,8 +78,8 @@ class ProjectManager:
         try:
             content = self._get_project_template(name, description, priority)
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            await self.io.write_text(file_path, content)
+            self._notify_write(file_path)
 
             logger.info(f"Created project: {name}")
             return {
@@ -99,7 +118,7 @@ class ProjectManager:
         filename = self._sanitize_filename(name)
         file_path = self.projects_folder / f"Goal-{filename}.md"
 
-        if file_path.exists():
+        if await self.io.exists(file_path):
             return {
                 'success': False,
                 'path': str(file_path),
@@ -111,8 +130,8 @@ class ProjectManager:
                 name, description, target_date, habit_tracking
             )
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            await self.io.write_text(file_path, content)
+            self._notify_write(file_path)
 
             logger.info(f"Created goal: {name}")
             return {
@@ -147,7 +166,7 @@ class ProjectManager:
             {'success': bool, 'error': str}
         """
         # Find the file
-        file_path = self._find_project_file(name)
+        file_path = await self._find_project_file(name)
         if not file_path:
             return {
                 'success': False,
@@ -156,7 +175,7 @@ class ProjectManager:
 
         try:
             # Load with frontmatter
-            post = frontmatter.load(file_path)
+            post = await self.io.run(frontmatter.load, file_path)
 
             # Update frontmatter
             post['progress'] = progress
@@ -178,8 +197,8 @@ class ProjectManager:
                     post.content += progress_section + progress_entry
 
             # Save
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(frontmatter.dumps(post))
+            await self.io.write_text(file_path, frontmatter.dumps(post))
+            self._notify_write(file_path)
 
             logger.info(f"Updated {name} to {progress}%")
             return {'success': True, 'error': None}
@@ -195,29 +214,19 @@ class ProjectManager:
         Returns:
             List of project metadata dicts
         """
-        projects = []
+        file_paths = await self.io.run(
+            lambda: [Path(entry.path) for entry in self.walker.walk(str(self.projects_folder), "*.md")]
+        )
 
-        for file_path in self.projects_folder.glob("*.md"):
-            if file_path.name.startswith('.'):
-                continue
+        # Files are checked (and re-parsed if changed) in parallel on the I/O pool
+        all_metadata = await asyncio.gather(*(
+            self.io.run(self._load_metadata, file_path) for file_path in file_paths
+        ))
 
-            try:
-                post = frontmatter.load(file_path)
-                progress = post.get('progress', 0)
-
-                if progress < 100:
-                    projects.append({
-                        'name': post.get('title', file_path.stem),
-                        'type': 'goal' if file_path.name.startswith('Goal-') else 'project',
-                        'progress': progress,
-                        'priority': post.get('priority', 'medium'),
-                        'last_updated': post.get('last_updated', ''),
-                        'path': str(file_path.relative_to(self.vault_path))
-                    })
-
-            except Exception as e:
-                logger.warning(f"Error reading {file_path}: {e}")
-                continue
+        projects = [
+            dict(metadata) for metadata in all_metadata
+            if metadata and metadata['progress'] < 100
+        ]
 
         # Sort by priority then progress
         priority_order = {'high': 0, 'medium': 1, 'low': 2}
@@ -228,6 +237,42 @@ class ProjectManager:
 
         return projects
 
+    def _load_metadata(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Get project metadata, re-parsing frontmatter only when the file changed."""
+        relative_path = str(file_path.relative_to(self.vault_path))
+
+        try:
+            mtime = file_path.stat().st_mtime
+            cached = self._metadata_cache.get(relative_path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+            post = frontmatter.load(file_path)
+            metadata = {
+                'name': post.get('title', file_path.stem),
+                'type': 'goal' if file_path.name.startswith('Goal-') else 'project',
+                'progress': post.get('progress', 0),
+                'priority': post.get('priority', 'medium'),
+                'last_updated': post.get('last_updated', ''),
+                'path': relative_path
+            }
+            self._metadata_cache[relative_path] = (mtime, metadata)
+            return metadata
+
+        except Exception as e:
+            logger.warning(f"Error reading {file_path}: {e}")
+            self._metadata_cache.pop(relative_path, None)
+            return None
+
+    def apply_changes(self, changes) -> None:
+        """Drop cached metadata for project files in a batch of VaultChange records."""
+        if any(change.kind == 'rescan' for change in changes):
+            self._metadata_cache.clear()
+            return
+
+        for change in changes:
+            self._metadata_cache.pop(change.path, None)
+
     async def get_stalled_projects(self, days_threshold: int = 7) -> List[Dict[str, Any]]:
         """
         Get projects not updated recently.
@@ -273,7 +318,7 @@ class ProjectManager:
         Returns:
             {'success': bool, 'error': str}
         """
-        file_path = self._find_project_file(project_name)
+        file_path = await self._find_project_file(project_name)
         if not file_path:
             return {
                 'success': False,
@@ -281,7 +326,7 @@ class ProjectManager:
             }
 
         try:
-            post = frontmatter.load(file_path)
+            post = await self.io.run(frontmatter.load, file_path)
 
             # Add to related conversations
             conversations = post.get('related_conversations', [])
@@ -289,8 +334,8 @@ class ProjectManager:
                 conversations.append(conversation_path)
                 post['related_conversations'] = conversations
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(frontmatter.dumps(post))
+            await self.io.write_text(file_path, frontmatter.dumps(post))
+            self._notify_write(file_path)
 
             return {'success': True, 'error': None}
 
@@ -298,18 +343,23 @@ class ProjectManager:
             logger.error(f"Failed to link conversation: {e}")
             return {'success': False, 'error': str(e)}
 
-    def _find_project_file(self, name: str) -> Optional[Path]:
+    def _notify_write(self, file_path: Path):
+        """Report a written file to the on_write callback."""
+        if self.on_write:
+            self.on_write(str(file_path))
+
+    async def _find_project_file(self, name: str) -> Optional[Path]:
         """Find project or goal file by name."""
         filename = self._sanitize_filename(name)
 
         # Try project
         project_path = self.projects_folder / f"{filename}.md"
-        if project_path.exists():
+        if await self.io.exists(project_path):
             return project_path
 
         # Try goal
         goal_path = self.projects_folder / f"Goal-{filename}.md"
-        if goal_path.exists():
+        if await self.io.exists(goal_path):
             return goal_path
 
         return None
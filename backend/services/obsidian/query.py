@@ -0,0 +1,413 @@
+"""
+Search query language for the vault index.
+
+Supports AND / OR / NOT (uppercase), parentheses, "quoted phrases" and
+field filters:
+
+    tag:japanese              frontmatter or inline #tag
+    folder:Projects           notes under a folder
+    type:goal                 frontmatter type
+    modified:>2025-01-01      mtime comparison (>, >=, <, <=, =)
+
+Adjacent terms are ANDed. Text parts compile into a single FTS5 MATCH
+expression so the index intersects posting lists; metadata filters
+compile into SQL predicates over the files table.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+
+class QuerySyntaxError(ValueError):
+    """Raised when a search query cannot be parsed."""
+
+
+# ===== AST =====
+
+@dataclass
+class Term:
+    """A word, matched as a prefix."""
+    text: str
+
+
+@dataclass
+class Phrase:
+    """Words that must appear consecutively."""
+    text: str
+
+
+@dataclass
+class Field:
+    """A field filter such as tag:x or modified:>2025-01-01."""
+    name: str
+    op: str
+    value: str
+
+
+@dataclass
+class And:
+    children: List[Any]
+
+
+@dataclass
+class Or:
+    children: List[Any]
+
+
+@dataclass
+class Not:
+    child: Any
+
+
+Node = Union[Term, Phrase, Field, And, Or, Not]
+
+FIELDS = ('tag', 'folder', 'type', 'modified')
+
+TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\()
+      | (?P<rparen>\))
+      | (?P<field>(?P<fname>[a-zA-Z]+):(?P<fop>>=|<=|>|<|=)?(?:"(?P<fquoted>[^"]*)"|(?P<fvalue>[^\s()]+)))
+      | "(?P<phrase>[^"]*)(?P<pclose>")?
+      | (?P<word>[^\s()"]+)
+    )
+''', re.VERBOSE)
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+# ===== Parsing =====
+
+def _tokenize(query: str) -> List[Tuple[str, Any]]:
+    """Split a query into (kind, value) tokens."""
+    tokens = []
+    pos = 0
+    query = query.strip()
+
+    while pos < len(query):
+        match = TOKEN_RE.match(query, pos)
+        if not match or match.end() == pos:
+            raise QuerySyntaxError(f"Unexpected character at position {pos}")
+        pos = match.end()
+
+        if match.group('lparen'):
+            tokens.append(('lparen', None))
+        elif match.group('rparen'):
+            tokens.append(('rparen', None))
+        elif match.group('field') and match.group('fname').lower() in FIELDS:
+            value = match.group('fquoted')
+            if value is None:
+                value = match.group('fvalue')
+                if value.startswith('"'):
+                    raise QuerySyntaxError(f"Unclosed quote at position {match.start('fvalue')}")
+            tokens.append(('field', Field(
+                name=match.group('fname').lower(),
+                op=match.group('fop') or '=',
+                value=value
+            )))
+        elif match.group('field'):
+            # Unknown field - treat "foo:bar" as plain words
+            tokens.append(('word', match.group('field')))
+        elif match.group('phrase') is not None:
+            if match.group('pclose') is None:
+                raise QuerySyntaxError(f"Unclosed quote at position {match.start('phrase') - 1}")
+            tokens.append(('phrase', match.group('phrase')))
+        elif match.group('word') in ('AND', 'OR', 'NOT'):
+            tokens.append((match.group('word').lower(), None))
+        else:
+            tokens.append(('word', match.group('word')))
+
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser: or := and (OR and)*, and := not (AND? not)*."""
+
+    def __init__(self, tokens: List[Tuple[str, Any]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self) -> Tuple[str, Any]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self) -> Optional[Node]:
+        if not self.tokens:
+            return None
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QuerySyntaxError("Unbalanced ')' in query")
+        return node
+
+    def parse_or(self) -> Optional[Node]:
+        start = self.pos
+        children = [self.parse_and()]
+        while self.peek() == 'or':
+            if self.pos == start:
+                raise QuerySyntaxError("OR must follow a term")
+            self.take()
+            start = self.pos
+            children.append(self.parse_and())
+            if self.pos == start:
+                raise QuerySyntaxError("OR must be followed by a term")
+        children = [c for c in children if c is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else Or(children)
+
+    def parse_and(self) -> Optional[Node]:
+        children = []
+        consumed = False
+        while self.peek() not in (None, 'or', 'rparen'):
+            if self.peek() == 'and':
+                if not consumed:
+                    raise QuerySyntaxError("AND must follow a term")
+                self.take()
+                if self.peek() in (None, 'or', 'rparen', 'and'):
+                    raise QuerySyntaxError("AND must be followed by a term")
+                continue
+            consumed = True
+            node = self.parse_not()
+            if node is not None:
+                children.append(node)
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else And(children)
+
+    def parse_not(self) -> Optional[Node]:
+        if self.peek() == 'not':
+            self.take()
+            child = self.parse_not()
+            if child is None:
+                raise QuerySyntaxError("NOT must be followed by a term")
+            return Not(child)
+        return self.parse_atom()
+
+    def parse_atom(self) -> Optional[Node]:
+        if self.peek() is None:
+            raise QuerySyntaxError("Query ended unexpectedly")
+        kind, value = self.take()
+
+        if kind == 'lparen':
+            node = self.parse_or()
+            if self.peek() != 'rparen':
+                raise QuerySyntaxError("Missing ')' in query")
+            self.take()
+            return node
+        if kind == 'phrase':
+            return Phrase(value) if WORD_RE.search(value) else None
+        if kind == 'field':
+            return value
+        if kind == 'word':
+            words = WORD_RE.findall(value)
+            if not words:
+                return None
+            if len(words) == 1:
+                return Term(words[0])
+            # "e-mail" / "foo:bar" behave like phrases
+            return Phrase(" ".join(words))
+
+        raise QuerySyntaxError(f"Unexpected '{kind.upper()}' in query")
+
+
+def parse_query(query: str) -> Optional[Node]:
+    """
+    Parse a search query into an AST.
+
+    Returns:
+        Root node, or None for an empty query
+
+    Raises:
+        QuerySyntaxError: If the query is malformed
+    """
+    return _Parser(_tokenize(query)).parse()
+
+
+# ===== Compilation =====
+
+@dataclass
+class CompiledQuery:
+    """SQL pieces for running a parsed query against the search index."""
+    match: Optional[str] = None       # FTS5 expression the note must match
+    where: Optional[str] = None       # SQL predicate over files/notes_fts
+    params: List[Any] = field(default_factory=list)
+    rank_match: Optional[str] = None  # FTS5 expression used only for ranking
+    highlight: List[List[str]] = field(default_factory=list)  # Excerpt term groups
+
+
+def _fts_string(text: str) -> str:
+    """Quote text as an FTS5 string."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _day_bounds(value: str) -> Tuple[float, float]:
+    """Timestamps for the start and end of a YYYY-MM-DD day (local time)."""
+    try:
+        day = datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise QuerySyntaxError(f"Invalid date '{value}', expected YYYY-MM-DD")
+    return day.timestamp(), (day + timedelta(days=1)).timestamp()
+
+
+class _Compiler:
+    """Turns an AST into FTS5 and SQL fragments."""
+
+    FTS_SUBQUERY = "files.id IN (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ?)"
+
+    def __init__(self, expand: Optional[Callable[[str], List[str]]] = None):
+        self.expand = expand
+        self.highlight: List[List[str]] = []
+        self.rank_terms: List[str] = []
+
+    def compile(self, node: Node, negated: bool = False) -> Tuple[str, str, List[Any]]:
+        """
+        Compile a node.
+
+        Returns:
+            ('fts', expression, []) when the node is pure full-text, or
+            ('sql', predicate, params) otherwise
+        """
+        if isinstance(node, Term):
+            word = node.text.lower()
+            similar = [t for t in self.expand(word) if t != word] if self.expand else []
+            expression = " OR ".join(
+                [f'{_fts_string(word)}*'] + [_fts_string(t) for t in similar]
+            )
+            expression = f"({expression})"
+            if not negated:
+                self.highlight.append([word] + similar)
+                self.rank_terms.append(expression)
+            return 'fts', expression, []
+
+        if isinstance(node, Phrase):
+            phrase = " ".join(WORD_RE.findall(node.text)).lower()
+            expression = _fts_string(phrase)
+            if not negated:
+                self.highlight.append([phrase])
+                self.rank_terms.append(expression)
+            return 'fts', expression, []
+
+        if isinstance(node, Field):
+            return self.compile_field(node)
+
+        if isinstance(node, Not):
+            kind, expression, params = self.compile(node.child, not negated)
+            if kind == 'fts':
+                return 'sql', f"NOT {self.FTS_SUBQUERY}", [expression]
+            return 'sql', f"NOT ({expression})", params
+
+        if isinstance(node, Or):
+            compiled = [self.compile(child, negated) for child in node.children]
+            if all(kind == 'fts' for kind, _, _ in compiled):
+                return 'fts', "(" + " OR ".join(e for _, e, _ in compiled) + ")", []
+            return self.combine_sql(compiled, " OR ")
+
+        if isinstance(node, And):
+            positive = []
+            excluded = []
+            for child in node.children:
+                if isinstance(child, Not):
+                    kind, expression, params = self.compile(child.child, not negated)
+                    if kind == 'fts':
+                        excluded.append(expression)
+                        continue
+                    positive.append(('sql', f"NOT ({expression})", params))
+                else:
+                    positive.append(self.compile(child, negated))
+
+            fts_parts = [e for kind, e, _ in positive if kind == 'fts']
+            sql_parts = [(kind, e, p) for kind, e, p in positive if kind == 'sql']
+
+            if fts_parts:
+                # FTS5 NOT is binary, so exclusions hang off the positive terms
+                expression = "(" + " AND ".join(fts_parts) + ")"
+                for exclusion in excluded:
+                    expression = f"({expression} NOT {exclusion})"
+                if not sql_parts:
+                    return 'fts', expression, []
+                sql_parts.append(('fts', expression, []))
+            else:
+                for exclusion in excluded:
+                    sql_parts.append(('sql', f"NOT {self.FTS_SUBQUERY}", [exclusion]))
+
+            return self.combine_sql(sql_parts, " AND ")
+
+        raise QuerySyntaxError(f"Unsupported query node: {node!r}")
+
+    def combine_sql(self, compiled: List[Tuple[str, str, List[Any]]], joiner: str) -> Tuple[str, str, List[Any]]:
+        """Join compiled children as SQL, wrapping full-text parts as subqueries."""
+        predicates = []
+        params: List[Any] = []
+        for kind, expression, child_params in compiled:
+            if kind == 'fts':
+                predicates.append(self.FTS_SUBQUERY)
+                params.append(expression)
+            else:
+                predicates.append(f"({expression})")
+                params.extend(child_params)
+        return 'sql', joiner.join(predicates), params
+
+    def compile_field(self, node: Field) -> Tuple[str, str, List[Any]]:
+        """Compile a field filter."""
+        if node.name == 'tag':
+            words = WORD_RE.findall(node.value.lstrip('#').lower())
+            if not words:
+                raise QuerySyntaxError("tag: needs a value")
+            return 'fts', f"tags : {_fts_string(' '.join(words))}", []
+
+        if node.name == 'folder':
+            folder = node.value.strip('/')
+            escaped = folder.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            return 'sql', "files.path LIKE ? ESCAPE '\\'", [f"{escaped}/%"]
+
+        if node.name == 'type':
+            return 'sql', "lower(files.note_type) = ?", [node.value.lower()]
+
+        if node.name == 'modified':
+            start, end = _day_bounds(node.value)
+            if node.op == '>':
+                return 'sql', "files.mtime >= ?", [end]
+            if node.op == '>=':
+                return 'sql', "files.mtime >= ?", [start]
+            if node.op == '<':
+                return 'sql', "files.mtime < ?", [start]
+            if node.op == '<=':
+                return 'sql', "files.mtime < ?", [end]
+            return 'sql', "files.mtime >= ? AND files.mtime < ?", [start, end]
+
+        raise QuerySyntaxError(f"Unknown field: {node.name}")
+
+
+def compile_query(
+    node: Node,
+    expand: Optional[Callable[[str], List[str]]] = None
+) -> CompiledQuery:
+    """
+    Compile a parsed query for the search index.
+
+    Args:
+        node: Root AST node from parse_query
+        expand: Optional callback mapping a word to similar terms (fuzzy mode)
+
+    Returns:
+        CompiledQuery with either a MATCH expression (pure full-text) or
+        a WHERE predicate plus an optional ranking expression
+    """
+    compiler = _Compiler(expand)
+    kind, expression, params = compiler.compile(node)
+
+    if kind == 'fts':
+        return CompiledQuery(match=expression, highlight=compiler.highlight)
+
+    return CompiledQuery(
+        where=expression,
+        params=params,
+        rank_match=" OR ".join(compiler.rank_terms) or None,
+        highlight=compiler.highlight
+    )
@@ -0,0 +1,545 @@
+"""
+Persistent full-text search index for the Obsidian vault.
+
+Backed by SQLite FTS5 so searches cost an index lookup instead of a
+scan of every note. The index lives outside the vault and is reused
+across restarts; only notes whose mtime or size changed are re-read.
+Results are ranked with BM25, boosting filename, title, tag and heading
+matches over passing mentions in the body. Queries use the language in
+query.py (boolean operators, phrases and field filters).
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import frontmatter
+
+from ..tools.walker import VaultWalker
+from .fuzzy import TrigramIndex, fold_term
+from .query import CompiledQuery, compile_query, parse_query
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+HEADING_RE = re.compile(r'^#{1,6}\s+(.+?)\s*#*\s*$', re.MULTILINE)
+INLINE_TAG_RE = re.compile(r'(?:^|\s)#([\w/-]+)', re.UNICODE)
+
+
+def default_index_path(vault_path: str, name: str, suffix: str = '') -> str:
+    """
+    Build a per-vault path for derived data in OBSIDIAN_INDEX_DIR.
+
+    Args:
+        vault_path: Path to Obsidian vault
+        name: Kind of index, e.g. 'search'
+        suffix: File extension, empty for directories
+    """
+    index_dir = os.getenv(
+        'OBSIDIAN_INDEX_DIR',
+        os.path.join(Path.home(), '.cache', 'personal-ai')
+    )
+    vault_key = hashlib.sha1(str(Path(vault_path).resolve()).encode()).hexdigest()[:12]
+    return os.path.join(os.path.expanduser(index_dir), f"{name}-{vault_key}{suffix}")
+
+
+def extract_note_fields(relative_path: str, body: str) -> Dict[str, str]:
+    """
+    Split a note into the separately weighted index fields.
+
+    Args:
+        relative_path: Note path within the vault
+        body: Raw note text including frontmatter
+
+    Returns:
+        {'name': str, 'title': str, 'tags': str, 'headings': str, 'body': str,
+         'type': str}
+    """
+    metadata: Dict[str, Any] = {}
+    try:
+        metadata = frontmatter.loads(body).metadata
+    except Exception:
+        # Malformed frontmatter - index the note as plain text
+        pass
+
+    tags = metadata.get('tags') or []
+    if isinstance(tags, str):
+        tags = [tags]
+    tags = [str(tag) for tag in tags] + INLINE_TAG_RE.findall(body)
+
+    return {
+        'name': Path(relative_path).stem.replace('-', ' ').replace('_', ' '),
+        'title': str(metadata.get('title') or ''),
+        'tags': " ".join(tags),
+        'headings': "\n".join(HEADING_RE.findall(body)),
+        'body': body,
+        'type': str(metadata.get('type') or '')
+    }
+
+
+class SearchIndex:
+    """SQLite FTS5 inverted index over the markdown notes in a vault."""
+
+    # Bump when the table layout changes to force a rebuild
+    SCHEMA_VERSION = 3
+
+    # BM25 weights for (name, title, tags, headings, body)
+    FIELD_WEIGHTS = (10.0, 8.0, 5.0, 3.0, 1.0)
+
+    # Excerpts returned per note
+    MAX_EXCERPTS = 3
+
+    # Without a watcher, re-check the vault for changes at most this often
+    REFRESH_INTERVAL_SECONDS = 60
+
+    def __init__(
+        self,
+        vault_path: str,
+        index_path: Optional[str] = None,
+        scanner=None,
+        walker: Optional[VaultWalker] = None
+    ):
+        """
+        Initialize search index.
+
+        Args:
+            vault_path: Path to Obsidian vault
+            index_path: Path to the SQLite index file (defaults to a file
+                under OBSIDIAN_INDEX_DIR keyed by the vault path)
+            scanner: Optional VaultScanner used to read notes in parallel
+                during (re)builds
+            walker: Walker with the vault's ignore rules (default ignores if omitted)
+        """
+        self.vault_path = Path(vault_path)
+        self.scanner = scanner
+        self.walker = walker or VaultWalker(vault_path)
+        self.index_path = Path(index_path or default_index_path(vault_path, 'search', '.db'))
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+        self._last_sync: Optional[float] = None
+
+        # Set when a VaultWatcher feeds changes in; periodic re-walks stop
+        self.watched = False
+
+        # Trigram index over the vocabulary for fuzzy queries (built lazily)
+        self.vocabulary: Optional[TrigramIndex] = None
+        self._vocabulary_lock = threading.Lock()
+        # Terms written while the vocabulary is being built
+        self._vocabulary_pending: Optional[List[str]] = None
+
+    def _ensure_schema(self):
+        """Create tables, dropping an index built with an older schema."""
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                if version:
+                    logger.info(f"Search index schema {version} is outdated - rebuilding")
+                self._conn.executescript("""
+                    DROP TABLE IF EXISTS notes_vocab;
+                    DROP TABLE IF EXISTS notes_fts;
+                    DROP TABLE IF EXISTS files;
+                """)
+
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT UNIQUE NOT NULL,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    note_type TEXT NOT NULL DEFAULT ''
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+                    name, title, tags, headings, body,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS notes_vocab USING fts5vocab(
+                    notes_fts, 'row'
+                );
+            """)
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            self._conn.commit()
+
+    # ===== Maintenance =====
+
+    def needs_refresh(self) -> bool:
+        """Check if the index should be re-synced with the vault."""
+        if self._last_sync is None:
+            return True
+        if self.watched:
+            return False
+        return time.monotonic() - self._last_sync >= self.REFRESH_INTERVAL_SECONDS
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with the vault.
+
+        Only notes that are new or whose mtime/size changed are read.
+        Blocking - run it off the event loop.
+
+        Returns:
+            {'indexed': int, 'removed': int, 'total': int}
+        """
+        started = time.monotonic()
+        on_disk: Dict[str, Tuple[float, int]] = {
+            entry.relative: (entry.mtime, entry.size)
+            for entry in self.walker.walk(str(self.vault_path), '**/*.md')
+        }
+
+        with self._lock:
+            known = {
+                path: (file_id, mtime, size)
+                for file_id, path, mtime, size in self._conn.execute(
+                    "SELECT id, path, mtime, size FROM files"
+                )
+            }
+
+        changed = []
+        for relative_path, (mtime, size) in sorted(on_disk.items()):
+            existing = known.get(relative_path)
+            if existing and existing[1:] == (mtime, size):
+                continue
+            changed.append((relative_path, mtime, size))
+
+        bodies = self._read_notes([relative_path for relative_path, _, _ in changed])
+
+        indexed = removed = 0
+        with self._lock:
+            for (relative_path, mtime, size), body in zip(changed, bodies):
+                if body is None:
+                    continue
+                self._write_note(relative_path, mtime, size, body)
+                indexed += 1
+
+            for relative_path in known.keys() - on_disk.keys():
+                self._delete_file(known[relative_path][0])
+                removed += 1
+
+            self._conn.commit()
+
+        self._last_sync = time.monotonic()
+        if indexed or removed:
+            logger.info(
+                f"Search index synced: {indexed} indexed, {removed} removed, "
+                f"{len(on_disk)} total ({time.monotonic() - started:.2f}s)"
+            )
+
+        return {'indexed': indexed, 'removed': removed, 'total': len(on_disk)}
+
+    def apply_changes(self, changes) -> None:
+        """
+        Update the index for a batch of VaultChange records.
+
+        Blocking - run it off the event loop.
+        """
+        if any(change.kind == 'rescan' for change in changes):
+            self.sync()
+            return
+
+        # Read outside the lock so searches don't wait on disk I/O
+        updates = []
+        for change in changes:
+            if change.kind == 'deleted':
+                updates.append((change.path, None, None))
+                continue
+
+            try:
+                stat = (self.vault_path / change.path).stat()
+            except OSError:
+                continue
+            body = self._read_note(change.path)
+            if body is not None:
+                updates.append((change.path, stat, body))
+
+        with self._lock:
+            for relative_path, stat, body in updates:
+                if body is None:
+                    row = self._conn.execute(
+                        "SELECT id FROM files WHERE path = ?", (relative_path,)
+                    ).fetchone()
+                    if row:
+                        self._delete_file(row[0])
+                else:
+                    self._write_note(relative_path, stat.st_mtime, stat.st_size, body)
+
+            self._conn.commit()
+
+    def _read_notes(self, relative_paths: List[str]) -> List[Optional[str]]:
+        """Read notes for indexing, in parallel when a scanner is available."""
+        if self.scanner and len(relative_paths) > 1:
+            return self.scanner.read_files(
+                [str(self.vault_path / relative_path) for relative_path in relative_paths]
+            )
+        return [self._read_note(relative_path) for relative_path in relative_paths]
+
+    def _read_note(self, relative_path: str) -> Optional[str]:
+        """Read a single note, returning None if it cannot be read."""
+        try:
+            with open(self.vault_path / relative_path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        except OSError as e:
+            logger.warning(f"Error indexing {relative_path}: {e}")
+            return None
+
+    def _write_note(self, relative_path: str, mtime: float, size: int, body: str):
+        """(Re)write the index rows for a note. Caller holds the lock."""
+        fields = extract_note_fields(relative_path, body)
+        row = self._conn.execute(
+            "SELECT id FROM files WHERE path = ?", (relative_path,)
+        ).fetchone()
+
+        if row:
+            file_id = row[0]
+            self._conn.execute(
+                "UPDATE files SET mtime = ?, size = ?, note_type = ? WHERE id = ?",
+                (mtime, size, fields['type'], file_id)
+            )
+            self._conn.execute("DELETE FROM notes_fts WHERE rowid = ?", (file_id,))
+        else:
+            file_id = self._conn.execute(
+                "INSERT INTO files (path, mtime, size, note_type) VALUES (?, ?, ?, ?)",
+                (relative_path, mtime, size, fields['type'])
+            ).lastrowid
+
+        if self.vocabulary is not None:
+            for value in fields.values():
+                self.vocabulary.add_terms(TOKEN_RE.findall(value))
+        elif self._vocabulary_pending is not None:
+            for value in fields.values():
+                self._vocabulary_pending.extend(TOKEN_RE.findall(value))
+
+        self._conn.execute(
+            """
+            INSERT INTO notes_fts (rowid, name, title, tags, headings, body)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (file_id, fields['name'], fields['title'], fields['tags'],
+             fields['headings'], fields['body'])
+        )
+
+    def _delete_file(self, file_id: int):
+        """Remove a note from the index. Caller holds the lock."""
+        self._conn.execute("DELETE FROM notes_fts WHERE rowid = ?", (file_id,))
+        self._conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    # ===== Queries =====
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        count_total: bool = False,
+        fuzzy: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Find the notes that best match a query.
+
+        Words match as case-insensitive prefixes, so "japan" finds
+        "Japanese"; see query.py for operators, phrases and field
+        filters. With fuzzy, each word also matches the closest terms in
+        the vocabulary, so "meditaton" finds "meditation". Notes are
+        ranked by BM25 with FIELD_WEIGHTS boosts (filter-only queries by
+        most recently modified), and each note appears once with its best
+        matching lines. Blocking - run it off the event loop.
+
+        Args:
+            query: Search query
+            limit: Maximum number of notes
+            count_total: Also count every matching note
+            fuzzy: Expand words to similar vocabulary terms
+
+        Returns:
+            (results, total) where results is a list of
+            {'file': str, 'line_number': int, 'line_content': str,
+             'score': float, 'excerpts': List[Dict]} and total is the number
+            of matching notes, or None if not counted
+
+        Raises:
+            QuerySyntaxError: If the query is malformed
+        """
+        node = parse_query(query)
+        if node is None:
+            return [], 0
+
+        results: List[Dict[str, Any]] = []
+        total = None
+
+        if fuzzy:
+            self._ensure_vocabulary()
+
+        with self._lock:
+            compiled = compile_query(node, self._expand_word if fuzzy else None)
+            select_sql, select_params, count_sql, count_params = self._build_sql(compiled)
+
+            rows = self._conn.execute(select_sql, select_params + [limit]).fetchall()
+            if count_total:
+                total = self._conn.execute(count_sql, count_params).fetchone()[0]
+
+        highlight = [[fold_term(term) for term in group] for group in compiled.highlight]
+
+        for relative_path, body, rank in rows:
+            excerpts = self._best_lines(body, highlight)
+            results.append({
+                'file': relative_path,
+                'line_number': excerpts[0]['line_number'],
+                'line_content': excerpts[0]['line_content'],
+                # bm25() is negative, lower is better; flip it for readability
+                'score': round(-rank, 4),
+                'excerpts': excerpts
+            })
+
+        return results, total
+
+    def _build_sql(self, compiled: CompiledQuery) -> Tuple[str, List[Any], str, List[Any]]:
+        """
+        Turn a compiled query into (select_sql, select_params, count_sql, count_params).
+
+        The select takes one extra trailing parameter, the LIMIT.
+        """
+        weights = ", ".join(str(w) for w in self.FIELD_WEIGHTS)
+
+        if compiled.match:
+            # Pure full-text: one MATCH, FTS5 intersects the posting lists
+            select_sql = f"""
+                SELECT files.path, notes_fts.body, bm25(notes_fts, {weights}) AS rank
+                FROM notes_fts JOIN files ON files.id = notes_fts.rowid
+                WHERE notes_fts MATCH ?
+                ORDER BY rank, files.path
+                LIMIT ?
+            """
+            count_sql = "SELECT count(*) FROM notes_fts WHERE notes_fts MATCH ?"
+            return select_sql, [compiled.match], count_sql, [compiled.match]
+
+        count_sql = f"SELECT count(*) FROM files WHERE {compiled.where}"
+
+        if compiled.rank_match:
+            # Mixed text/metadata: filter with the predicate, rank by the text
+            select_sql = f"""
+                SELECT files.path, notes_fts.body, COALESCE(ranked.rank, 0) AS rank
+                FROM files
+                JOIN notes_fts ON notes_fts.rowid = files.id
+                LEFT JOIN (
+                    SELECT rowid, bm25(notes_fts, {weights}) AS rank
+                    FROM notes_fts WHERE notes_fts MATCH ?
+                ) AS ranked ON ranked.rowid = files.id
+                WHERE {compiled.where}
+                ORDER BY rank, files.mtime DESC
+                LIMIT ?
+            """
+            return select_sql, [compiled.rank_match] + compiled.params, count_sql, compiled.params
+
+        # Filters only: newest first
+        select_sql = f"""
+            SELECT files.path, notes_fts.body, 0 AS rank
+            FROM files JOIN notes_fts ON notes_fts.rowid = files.id
+            WHERE {compiled.where}
+            ORDER BY files.mtime DESC
+            LIMIT ?
+        """
+        return select_sql, list(compiled.params), count_sql, compiled.params
+
+    def _ensure_vocabulary(self):
+        """
+        Build the trigram vocabulary for fuzzy queries on first use.
+
+        The terms are read on a separate connection without the index
+        lock, so other searches and updates carry on meanwhile; terms they
+        write are collected and added before the vocabulary is swapped in.
+        Later writes add their terms incrementally.
+        """
+        with self._vocabulary_lock:
+            if self.vocabulary is not None:
+                return
+
+            started = time.monotonic()
+            with self._lock:
+                self._vocabulary_pending = []
+
+            vocabulary = TrigramIndex()
+            try:
+                conn = sqlite3.connect(str(self.index_path))
+                try:
+                    vocabulary.add_terms(
+                        term for (term,) in conn.execute("SELECT term FROM notes_vocab")
+                    )
+                finally:
+                    conn.close()
+            except BaseException:
+                with self._lock:
+                    self._vocabulary_pending = None
+                raise
+
+            with self._lock:
+                vocabulary.add_terms(self._vocabulary_pending)
+                self._vocabulary_pending = None
+                self.vocabulary = vocabulary
+
+            logger.info(
+                f"Built fuzzy vocabulary: {len(vocabulary)} terms "
+                f"({time.monotonic() - started:.2f}s)"
+            )
+
+    def _expand_word(self, word: str) -> List[str]:
+        """Find vocabulary terms similar to a query word (fuzzy mode)."""
+        if self.vocabulary is None:
+            return []
+        return [term for term, _ in self.vocabulary.expand(word)]
+
+    def _best_lines(self, body: str, term_groups: List[List[str]]) -> List[Dict[str, Any]]:
+        """
+        Pick the lines of a matched note to show as excerpts.
+
+        Lines are scored by how many query words (or their fuzzy
+        expansions) they contain,
+        with headings ahead of body text at equal coverage. Notes that only
+        matched on filename/title/tags fall back to their first heading or
+        line. Frontmatter lines are skipped.
+        """
+        scored = []
+        first_heading = None
+        first_line = None
+        in_frontmatter = body.startswith('---')
+
+        for line_number, line in enumerate(body.splitlines(), 1):
+            stripped = line.strip()
+            if in_frontmatter:
+                # Frontmatter already feeds the title/tags fields
+                if line_number > 1 and stripped == '---':
+                    in_frontmatter = False
+                continue
+            if not stripped:
+                continue
+            is_heading = stripped.startswith('#')
+            if first_line is None:
+                first_line = (line_number, stripped)
+            if is_heading and first_heading is None:
+                first_heading = (line_number, stripped)
+
+            line_folded = fold_term(stripped)
+            coverage = sum(
+                1 for group in term_groups
+                if any(term in line_folded for term in group)
+            )
+            if coverage:
+                scored.append((-coverage, not is_heading, line_number, stripped))
+
+        if not scored:
+            line_number, stripped = first_heading or first_line or (1, '')
+            return [{'line_number': line_number, 'line_content': stripped}]
+
+        scored.sort()
+        return [
+            {'line_number': line_number, 'line_content': stripped}
+            for _, _, line_number, stripped in scored[:self.MAX_EXCERPTS]
+        ]
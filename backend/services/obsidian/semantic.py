@@ -0,0 +1,339 @@
+"""
+Semantic (embedding) search over the vault.
+
+Notes are split into one chunk per heading, embedded, and stored in a
+persistent chromadb collection. Each chunk records its note's content
+hash, so on restart or change only notes whose content changed are
+re-embedded.
+"""
+
+import os
+import re
+import math
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..tools.walker import VaultWalker
+from .search_index import default_index_path
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+HEADING_LINE_RE = re.compile(r'^#{1,6}\s+\S')
+
+
+# ===== Embedders =====
+
+class OllamaEmbedder:
+    """Embeds text with a local Ollama embedding model."""
+
+    def __init__(self, model: str = None):
+        """
+        Initialize Ollama embedder.
+
+        Args:
+            model: Embedding model (defaults to OLLAMA_EMBED_MODEL or nomic-embed-text)
+        """
+        self.model = model or os.getenv('OLLAMA_EMBED_MODEL', 'nomic-embed-text')
+        self.name = f"ollama-{self.model}"
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts (blocking)."""
+        import ollama
+        return [
+            ollama.embeddings(model=self.model, prompt=text)['embedding']
+            for text in texts
+        ]
+
+
+class HashingEmbedder:
+    """
+    Deterministic offline stand-in for a real embedding model.
+
+    Hashes word unigrams and bigrams into a fixed-size vector. Needs no
+    model download, so it suits tests and machines without Ollama, but
+    it only captures word overlap, not meaning.
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts (blocking)."""
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        words = [w.lower() for w in WORD_RE.findall(text)]
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+        for feature in features:
+            digest = hashlib.md5(feature.encode('utf-8')).digest()
+            index = int.from_bytes(digest[:4], 'little') % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+
+def get_embedder(name: Optional[str] = None):
+    """
+    Create the configured embedder.
+
+    Args:
+        name: 'ollama' or 'hashing' (defaults to SEMANTIC_EMBEDDER or 'ollama')
+    """
+    name = name or os.getenv('SEMANTIC_EMBEDDER', 'ollama')
+    if name == 'hashing':
+        return HashingEmbedder()
+    return OllamaEmbedder()
+
+
+# ===== Chunking =====
+
+def chunk_note(body: str, max_chars: int = 2000) -> List[Dict[str, Any]]:
+    """
+    Split a note into one chunk per heading section.
+
+    Frontmatter is skipped and sections longer than max_chars are split
+    further so each chunk stays within the embedding model's context.
+
+    Returns:
+        List of {'heading': str, 'line_number': int, 'text': str}
+    """
+    lines = body.splitlines()
+    start = 0
+    if lines and lines[0].strip() == '---':
+        for i in range(1, len(lines)):
+            if lines[i].strip() == '---':
+                start = i + 1
+                break
+
+    sections = []
+    heading = ''
+    section_start = start
+    buffer: List[str] = []
+
+    def flush():
+        text = "\n".join(buffer).strip()
+        if not text:
+            return
+        for offset in range(0, len(text), max_chars):
+            sections.append({
+                'heading': heading,
+                'line_number': section_start + 1,
+                'text': text[offset:offset + max_chars]
+            })
+
+    for index in range(start, len(lines)):
+        line = lines[index]
+        if HEADING_LINE_RE.match(line):
+            flush()
+            heading = line.lstrip('#').strip()
+            section_start = index
+            buffer = [line]
+        else:
+            buffer.append(line)
+    flush()
+
+    return sections
+
+
+# ===== Index =====
+
+class SemanticIndex:
+    """Persistent chromadb collection of embedded note chunks."""
+
+    COLLECTION_PREFIX = "vault-chunks"
+
+    def __init__(
+        self,
+        vault_path: str,
+        persist_dir: Optional[str] = None,
+        embedder=None,
+        walker: Optional[VaultWalker] = None
+    ):
+        """
+        Initialize semantic index.
+
+        Args:
+            vault_path: Path to Obsidian vault
+            persist_dir: chromadb directory (defaults to OBSIDIAN_INDEX_DIR)
+            embedder: Object with name and embed(texts) (defaults to get_embedder())
+            walker: Walker with the vault's ignore rules (default ignores if omitted)
+
+        Raises:
+            ImportError: If chromadb is not installed
+        """
+        import chromadb
+
+        self.vault_path = Path(vault_path)
+        self.embedder = embedder or get_embedder()
+        self.walker = walker or VaultWalker(vault_path)
+        self.persist_dir = persist_dir or default_index_path(vault_path, 'semantic')
+
+        self._lock = threading.Lock()
+        self._client = chromadb.PersistentClient(path=self.persist_dir)
+
+        # One collection per embedder so vectors of different models never mix
+        collection_name = re.sub(
+            r'[^a-zA-Z0-9_-]', '-', f"{self.COLLECTION_PREFIX}-{self.embedder.name}"
+        )[:63]
+        self._collection = self._client.get_or_create_collection(
+            name=collection_name,
+            metadata={'hnsw:space': 'cosine'}
+        )
+
+        self.synced = False
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Embed new and changed notes and drop deleted ones.
+
+        Blocking and potentially slow on first run - call it from a
+        background thread.
+
+        Returns:
+            {'embedded': int, 'removed': int, 'total': int}
+        """
+        with self._lock:
+            stored = self._stored_hashes()
+
+        on_disk = {
+            entry.relative: entry.path
+            for entry in self.walker.walk(str(self.vault_path), '**/*.md')
+        }
+
+        embedded = removed = 0
+        for relative_path, file_path in sorted(on_disk.items()):
+            if self._embed_note(relative_path, stored.get(relative_path)):
+                embedded += 1
+
+        with self._lock:
+            for relative_path in stored.keys() - on_disk.keys():
+                self._collection.delete(where={'path': relative_path})
+                removed += 1
+
+        self.synced = True
+        if embedded or removed:
+            logger.info(
+                f"Semantic index synced: {embedded} embedded, {removed} removed, "
+                f"{len(on_disk)} total"
+            )
+
+        return {'embedded': embedded, 'removed': removed, 'total': len(on_disk)}
+
+    def apply_changes(self, changes) -> None:
+        """Re-embed or drop notes for a batch of VaultChange records (blocking)."""
+        if any(change.kind == 'rescan' for change in changes):
+            self.sync()
+            return
+
+        for change in changes:
+            if change.kind == 'deleted':
+                with self._lock:
+                    self._collection.delete(where={'path': change.path})
+            else:
+                with self._lock:
+                    stored = self._collection.get(
+                        where={'path': change.path}, limit=1, include=['metadatas']
+                    )
+                previous = stored['metadatas'][0]['content_hash'] if stored['metadatas'] else None
+                self._embed_note(change.path, previous)
+
+    def _stored_hashes(self) -> Dict[str, str]:
+        """Map each stored note to the content hash it was embedded from."""
+        stored = self._collection.get(include=['metadatas'])
+        return {
+            metadata['path']: metadata['content_hash']
+            for metadata in stored['metadatas']
+        }
+
+    def _embed_note(self, relative_path: str, previous_hash: Optional[str]) -> bool:
+        """Embed a note if its content changed; returns True if it was re-embedded."""
+        try:
+            raw = (self.vault_path / relative_path).read_bytes()
+        except OSError as e:
+            logger.warning(f"Error reading {relative_path} for embedding: {e}")
+            return False
+
+        content_hash = hashlib.sha1(raw).hexdigest()
+        if content_hash == previous_hash:
+            return False
+
+        chunks = chunk_note(raw.decode('utf-8', errors='replace'))
+
+        # Embed outside the lock; it is the slow part
+        embeddings = self.embedder.embed([
+            f"{relative_path}\n{chunk['text']}" for chunk in chunks
+        ]) if chunks else []
+
+        with self._lock:
+            self._collection.delete(where={'path': relative_path})
+            if chunks:
+                self._collection.add(
+                    ids=[f"{relative_path}#{i}" for i in range(len(chunks))],
+                    embeddings=embeddings,
+                    documents=[chunk['text'] for chunk in chunks],
+                    metadatas=[
+                        {
+                            'path': relative_path,
+                            'heading': chunk['heading'],
+                            'line_number': chunk['line_number'],
+                            'content_hash': content_hash
+                        }
+                        for chunk in chunks
+                    ]
+                )
+        return True
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find the notes whose sections are closest in meaning to the query.
+
+        Blocking - run it off the event loop.
+
+        Returns:
+            List of {'file': str, 'line_number': int, 'line_content': str,
+            'score': float, 'excerpts': List[Dict]}, best first
+        """
+        query_embedding = self.embedder.embed([query])[0]
+
+        with self._lock:
+            available = self._collection.count()
+            if not available:
+                return []
+            found = self._collection.query(
+                query_embeddings=[query_embedding],
+                n_results=min(available, limit * 3),
+                include=['metadatas', 'documents', 'distances']
+            )
+
+        # Several sections of one note may match; keep notes in best-chunk order
+        notes: Dict[str, Dict[str, Any]] = {}
+        for metadata, document, distance in zip(
+            found['metadatas'][0], found['documents'][0], found['distances'][0]
+        ):
+            excerpt = {
+                'line_number': metadata['line_number'],
+                'line_content': " ".join(document.split())[:200]
+            }
+            note = notes.get(metadata['path'])
+            if note is None:
+                if len(notes) >= limit:
+                    continue
+                notes[metadata['path']] = {
+                    'file': metadata['path'],
+                    'line_number': excerpt['line_number'],
+                    'line_content': excerpt['line_content'],
+                    'score': round(1.0 - distance, 4),
+                    'excerpts': [excerpt]
+                }
+            elif len(note['excerpts']) < 3:
+                note['excerpts'].append(excerpt)
+
+        return list(notes.values())
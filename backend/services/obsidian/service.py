@@ -3,13 +3,28 @@ Core Obsidian service for vault operations.
 """
 
 import os
+import asyncio
 import logging
+import sqlite3
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
+import frontmatter
+
+from ..tools.async_io import AsyncFileIO, get_default_io
 from ..tools.file_tools import FileTools
+from ..tools.vault_scanner import VaultScanner
+from ..tools.walker import IgnoreRules, VaultWalker
 from .projects import ProjectManager
+from .changes import ChangeLog
+from .content_cache import ContentCache
 from .conversations import ConversationSaver
+from .manifest import VaultManifest
+from .outline import Heading, OutlineIndex, find_section, parse_outline
+from .query import QuerySyntaxError
+from .search_index import SearchIndex
+from .semantic import SemanticIndex
+from .watcher import VaultChange, VaultWatcher
 
 logger = logging.getLogger(__name__)
 
@@ -32,33 +47,237 @@ class ObsidianService:
             default_path
         )
 
-        # Initialize components
-        self.file_tools = FileTools(allowed_paths=[self.vault_path])
-        self.project_manager = ProjectManager(self.vault_path)
+        # Initialize components; all blocking vault I/O shares one bounded pool
+        self.io = get_default_io()
+        ignore = IgnoreRules.for_vault(self.vault_path)
+        self.walker = VaultWalker(self.vault_path, ignore)
+        self.watcher = VaultWatcher(self.vault_path, ignore)
+        self.scanner = VaultScanner()
+        self.file_tools = FileTools(
+            allowed_paths=[self.vault_path],
+            scanner=self.scanner,
+            io=self.io,
+            walker=self.walker
+        )
+        self.project_manager = ProjectManager(
+            self.vault_path,
+            on_write=self.watcher.notify,
+            io=self.io,
+            walker=self.walker
+        )
         self.conversation_saver = ConversationSaver(
             self.vault_path,
-            claude_service
+            claude_service,
+            on_write=self.watcher.notify,
+            io=self.io
         )
 
+        self.manifest = VaultManifest(self.vault_path, self.walker)
+        self.change_log = ChangeLog()
+        self.content_cache = ContentCache()
+        self.outline_index = OutlineIndex()
+
+        try:
+            self.search_index = SearchIndex(
+                self.vault_path,
+                scanner=self.scanner,
+                walker=self.walker
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Search index unavailable, falling back to file scan: {e}")
+            self.search_index = None
+
+        # Embedding index, created on the first semantic search. Syncing it
+        # takes a model call per chunk, so it gets its own small pool
+        # rather than tying up the workers that serve reads
+        self.semantic_index = None
+        self.embed_io = AsyncFileIO(max_workers=2)
+        self._semantic_sync_task = None
+
+        # Vault changes waiting to be embedded, and the task embedding them
+        self._semantic_pending: List[VaultChange] = []
+        self._semantic_update_task = None
+
+        # Derived structures updated per-file from vault changes
+        self.watcher.add_listener(self._apply_vault_changes)
+
         logger.info(f"ObsidianService initialized with vault: {self.vault_path}")
 
+    # ===== Change Tracking =====
+
+    async def start_watching(self):
+        """Start the vault watcher so derived structures update incrementally."""
+        await self.watcher.start()
+        if self.watcher.running:
+            self.manifest.watched = True
+            if self.search_index:
+                self.search_index.watched = True
+
+    async def stop_watching(self):
+        """Stop the vault watcher, flushing pending changes."""
+        await self.watcher.stop()
+        self.manifest.watched = False
+        if self.search_index:
+            self.search_index.watched = False
+
+    def close(self):
+        """Release worker processes used for vault scans."""
+        self.scanner.shutdown()
+        self.embed_io.shutdown()
+
+    async def _apply_vault_changes(self, changes: List[VaultChange]):
+        """Feed a batch of vault changes into every derived structure."""
+        self.project_manager.apply_changes(changes)
+
+        if any(change.kind == 'rescan' for change in changes):
+            self.content_cache.clear()
+            self.outline_index.clear()
+        else:
+            changed = [change.path for change in changes]
+            self.content_cache.invalidate(changed)
+            self.outline_index.invalidate(changed)
+
+        if self.manifest.built:
+            await self.io.run(self.manifest.apply_changes, changes)
+
+        if self.search_index:
+            try:
+                await self.io.run(self.search_index.apply_changes, changes)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to update search index: {e}")
+
+        # Publish once listings are current, so clients reacting to an event see them
+        self.change_log.record(changes)
+
+        # Embedding takes a model call per chunk, so it never holds up the next batch
+        if self.semantic_index and self.semantic_index.synced:
+            self._semantic_pending.extend(changes)
+            if self._semantic_update_task is None or self._semantic_update_task.done():
+                self._semantic_update_task = asyncio.create_task(self._update_semantic_index())
+
+    async def _update_semantic_index(self):
+        """Embed queued vault changes until none are left, coalescing each round."""
+        while self._semantic_pending:
+            pending, self._semantic_pending = self._semantic_pending, []
+
+            # Notes are re-read from disk, so only each path's last change matters
+            rescan = next((change for change in pending if change.kind == 'rescan'), None)
+            if rescan:
+                changes = [rescan]
+            else:
+                latest: Dict[str, VaultChange] = {}
+                for change in pending:
+                    latest.pop(change.path, None)
+                    latest[change.path] = change
+                changes = list(latest.values())
+
+            try:
+                await self.embed_io.run(self.semantic_index.apply_changes, changes)
+            except Exception as e:
+                logger.error(f"Failed to update semantic index: {e}")
+
     # ===== Search Operations =====
 
-    async def search_vault(self, query: str, limit: int = 20) -> Dict[str, Any]:
+    SEARCH_MODES = ('keyword', 'fuzzy', 'semantic')
+
+    async def search_vault(
+        self,
+        query: str,
+        limit: int = 20,
+        count_total: bool = False,
+        mode: str = 'keyword'
+    ) -> Dict[str, Any]:
         """
         Search for notes in the vault.
 
+        With the index, the query supports AND/OR/NOT, "phrases" and
+        tag:/folder:/type:/modified: filters, and results are ranked notes
+        (one per note, best first) carrying up to three excerpts. The scan
+        fallback treats the query as a literal substring and returns one
+        unranked result per matching line.
+
         Args:
             query: Search query
             limit: Maximum number of results
+            count_total: Also count every match beyond the limit
+            mode: 'keyword' (word prefixes), 'fuzzy' (typo-tolerant) or
+                'semantic' (closest in meaning, via embeddings)
 
         Returns:
-            {'success': bool, 'results': List[Dict], 'count': int, 'error': str}
+            {
+                'success': bool,
+                'results': List[Dict],  # 'file', 'excerpt', 'line_number', 'score', 'excerpts'
+                'count': int,    # Number of results returned
+                'total': int,    # All matches, or None if not counted
+                'error': str
+            }
         """
+        if mode not in self.SEARCH_MODES:
+            return {
+                'success': False,
+                'results': [],
+                'count': 0,
+                'total': 0,
+                'error': f'Unknown search mode: {mode}'
+            }
+
+        if mode == 'semantic':
+            return await self._semantic_search(query, limit)
+
+        if self.search_index:
+            try:
+                if self.search_index.needs_refresh():
+                    await self.io.run(self.search_index.sync)
+
+                matches, total = await self.io.run(
+                    self.search_index.search,
+                    query,
+                    limit,
+                    count_total,
+                    mode == 'fuzzy'
+                )
+                results = [
+                    {
+                        'file': match['file'],
+                        'excerpt': match['line_content'][:200],
+                        'line_number': match['line_number'],
+                        'score': match['score'],
+                        'excerpts': [
+                            {
+                                'line_number': excerpt['line_number'],
+                                'excerpt': excerpt['line_content'][:200]
+                            }
+                            for excerpt in match['excerpts']
+                        ]
+                    }
+                    for match in matches
+                ]
+
+                return {
+                    'success': True,
+                    'results': results,
+                    'count': len(results),
+                    'total': total,
+                    'error': None
+                }
+
+            except QuerySyntaxError as e:
+                return {
+                    'success': False,
+                    'results': [],
+                    'count': 0,
+                    'total': 0,
+                    'error': f'Invalid search query: {e}'
+                }
+            except sqlite3.Error as e:
+                logger.error(f"Search index query failed, falling back to file scan: {e}")
+
         search_result = await self.file_tools.search_in_files(
             directory=self.vault_path,
             query=query,
-            pattern="**/*.md"
+            pattern="**/*.md",
+            limit=limit,
+            count_total=count_total
         )
 
         if not search_result['success']:
@@ -66,30 +285,115 @@ class ObsidianService:
                 'success': False,
                 'results': [],
                 'count': 0,
+                'total': 0,
                 'error': search_result['error']
             }
 
         results = []
-        for result in search_result['results'][:limit]:
+        for result in search_result['results']:
             file_path = Path(result['file'])
             try:
                 relative_path = file_path.relative_to(self.vault_path)
             except ValueError:
                 relative_path = file_path.name
 
+            excerpt = result['line_content'][:200]
             results.append({
                 'file': str(relative_path),
-                'excerpt': result['line_content'][:200],
-                'line_number': result['line_number']
+                'excerpt': excerpt,
+                'line_number': result['line_number'],
+                'score': None,
+                'excerpts': [{'line_number': result['line_number'], 'excerpt': excerpt}]
             })
 
         return {
             'success': True,
             'results': results,
             'count': len(results),
+            'total': search_result['total'],
+            'error': None
+        }
+
+    async def _semantic_search(self, query: str, limit: int) -> Dict[str, Any]:
+        """Search by meaning, building the embedding index in the background."""
+        if self.semantic_index is None:
+            try:
+                self.semantic_index = await self.embed_io.run(
+                    SemanticIndex, self.vault_path, walker=self.walker
+                )
+            except ImportError:
+                return {
+                    'success': False,
+                    'results': [],
+                    'count': 0,
+                    'total': 0,
+                    'error': 'Semantic search unavailable: chromadb not installed'
+                }
+            except Exception as e:
+                logger.error(f"Could not open semantic index: {e}")
+                return {
+                    'success': False,
+                    'results': [],
+                    'count': 0,
+                    'total': 0,
+                    'error': f"Semantic search unavailable: {e}"
+                }
+
+        if not self.semantic_index.synced and (
+            self._semantic_sync_task is None or self._semantic_sync_task.done()
+        ):
+            self._semantic_sync_task = asyncio.create_task(self._sync_semantic_index())
+
+        try:
+            matches = await self.io.run(self.semantic_index.search, query, limit)
+        except Exception as e:
+            logger.error(f"Semantic search failed: {e}")
+            return {
+                'success': False,
+                'results': [],
+                'count': 0,
+                'total': 0,
+                'error': str(e)
+            }
+
+        if not matches and not self.semantic_index.synced:
+            return {
+                'success': False,
+                'results': [],
+                'count': 0,
+                'total': 0,
+                'error': 'Semantic index is still being built - try again shortly'
+            }
+
+        results = [
+            {
+                'file': match['file'],
+                'excerpt': match['line_content'],
+                'line_number': match['line_number'],
+                'score': match['score'],
+                'excerpts': [
+                    {'line_number': e['line_number'], 'excerpt': e['line_content']}
+                    for e in match['excerpts']
+                ]
+            }
+            for match in matches
+        ]
+
+        return {
+            'success': True,
+            'results': results,
+            'count': len(results),
+            'total': None,
             'error': None
         }
 
+    async def _sync_semantic_index(self):
+        """Embed new and changed notes without blocking searches."""
+        try:
+            await self.embed_io.run(self.semantic_index.sync)
+        except Exception as e:
+            logger.error(f"Semantic index sync failed: {e}")
+
     # ===== File Operations =====
 
     async def read_note(self, note_path: str) -> Dict[str, Any]:
@@ -105,40 +409,401 @@ class ObsidianService:
         full_path = os.path.join(self.vault_path, note_path)
         return await self.file_tools.read_file(full_path)
 
-    async def list_all_notes(self) -> Dict[str, Any]:
+    async def _note_stat(self, note_path: str) -> Optional[Tuple[float, int]]:
+        """(mtime, size) of a note, or None if it cannot be stat'ed."""
+        try:
+            stat = await self.io.stat(os.path.join(self.vault_path, note_path))
+            return stat.st_mtime, stat.st_size
+        except OSError:
+            return None
+
+    async def _current_stat(self, note_path: str) -> Optional[Tuple[float, int]]:
+        """(mtime, size) of a note, from the manifest while the watcher is running."""
+        entry = self.manifest.get(note_path) if self.manifest.watched else None
+        return (entry.mtime, entry.size) if entry else await self._note_stat(note_path)
+
+    async def get_note(self, note_path: str) -> Dict[str, Any]:
+        """
+        Read a note through the content cache.
+
+        A cached note is revalidated against its (mtime, size) - taken from
+        the manifest while the watcher is running, so a revisit touches
+        neither the disk nor the path checks. Misses go through read_note.
+
+        Args:
+            note_path: Relative path to note within vault
+
+        Returns:
+            {'success': bool, 'note': CachedNote, 'error': str}
+        """
+        if note_path in self.content_cache:
+            current = await self._current_stat(note_path)
+            if current:
+                cached = self.content_cache.get(note_path, *current)
+                if cached:
+                    return {'success': True, 'note': cached, 'error': None}
+
+        before = await self._note_stat(note_path)
+        result = await self.read_note(note_path)
+        if not result['success']:
+            return {'success': False, 'note': None, 'error': result['error']}
+
+        # Only cache content that did not change while it was being read
+        after = await self._note_stat(note_path)
+        mtime, size = after or (0.0, 0)
+        note = ContentCache.make_entry(note_path, mtime, size, result['content'])
+        if before and before == after:
+            self.content_cache.put(note)
+
+        return {'success': True, 'note': note, 'error': None}
+
+    BATCH_MODES = ('full', 'frontmatter', 'head')
+
+    # Notes read at once by read_notes
+    BATCH_CONCURRENCY = 16
+
+    async def read_notes(
+        self,
+        note_paths: List[str],
+        mode: str = 'full',
+        max_bytes: int = 4096
+    ) -> Dict[str, Any]:
+        """
+        Read many notes concurrently, with a bounded fan-out.
+
+        A missing or denied note gets its own error entry rather than
+        failing the batch.
+
+        Args:
+            note_paths: Relative paths to notes within vault
+            mode: 'full' (content), 'frontmatter' (metadata only) or
+                'head' (first max_bytes bytes of content)
+            max_bytes: Byte limit for 'head' mode
+
+        Returns:
+            {'success': bool, 'notes': List[Dict], 'error': str} - each
+            note is {'path', 'content' or 'frontmatter', 'truncated', 'error'}
+        """
+        if mode not in self.BATCH_MODES:
+            return {
+                'success': False,
+                'notes': [],
+                'error': f"Invalid mode '{mode}', expected one of: {', '.join(self.BATCH_MODES)}"
+            }
+
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+
+        async def read_one(note_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self._read_batch_note(note_path, mode, max_bytes)
+                except Exception as e:
+                    logger.error(f"Error reading {note_path} in batch: {e}")
+                    return {'path': note_path, 'error': str(e)}
+
+        notes = await asyncio.gather(*(read_one(path) for path in note_paths))
+
+        return {
+            'success': True,
+            'notes': list(notes),
+            'error': None
+        }
+
+    async def _read_batch_note(self, note_path: str, mode: str, max_bytes: int) -> Dict[str, Any]:
+        """Read one note for read_notes."""
+        if mode == 'head' and note_path not in self.content_cache:
+            # Uncached: read only the head from disk
+            result = await self.file_tools.read_file(
+                os.path.join(self.vault_path, note_path),
+                max_bytes=max_bytes
+            )
+            if not result['success']:
+                return {'path': note_path, 'error': result['error']}
+            return {
+                'path': note_path,
+                'content': result['content'],
+                'truncated': result['truncated'],
+                'error': None
+            }
+
+        result = await self.get_note(note_path)
+        if not result['success']:
+            return {'path': note_path, 'error': result['error']}
+        content = result['note'].content
+
+        if mode == 'frontmatter':
+            return {
+                'path': note_path,
+                'frontmatter': frontmatter.loads(content).metadata,
+                'truncated': False,
+                'error': None
+            }
+
+        if mode == 'head':
+            head = content.encode('utf-8')[:max_bytes].decode('utf-8', errors='ignore')
+            return {
+                'path': note_path,
+                'content': head,
+                'truncated': len(head) < len(content),
+                'error': None
+            }
+
+        return {
+            'path': note_path,
+            'content': content,
+            'truncated': False,
+            'error': None
+        }
+
+    # ===== Sections and Ranges =====
+
+    async def _get_outline(
+        self,
+        note_path: str,
+        cached_only: bool = False
+    ) -> Tuple[Optional[List[Heading]], Optional[str]]:
+        """A note's headings (from the outline index when current) and an error."""
+        current = await self._current_stat(note_path)
+        if current:
+            headings = self.outline_index.get(note_path, *current)
+            if headings is not None:
+                return headings, None
+
+        if cached_only and note_path not in self.content_cache:
+            return None, f"Outline of {note_path} is not cached"
+
+        result = await self.get_note(note_path)
+        if not result['success']:
+            return None, result['error']
+
+        note = result['note']
+        headings = parse_outline(note.content)
+        if note_path in self.content_cache:
+            # Only index outlines of content known to match (mtime, size)
+            self.outline_index.put(note_path, note.mtime, note.size, headings)
+        return headings, None
+
+    async def get_outline(self, note_path: str, cached_only: bool = False) -> Dict[str, Any]:
+        """
+        List a note's headings and the span of each section.
+
+        Args:
+            note_path: Relative path to note within vault
+            cached_only: Fail instead of reading the note when neither its
+                outline nor its content is cached
+
+        Returns:
+            {'success': bool, 'outline': List[Dict], 'error': str} - each
+            heading is {'level', 'title', 'line', 'end_line', 'start_byte', 'end_byte'}
+        """
+        headings, error = await self._get_outline(note_path, cached_only)
+        if headings is None:
+            return {'success': False, 'outline': [], 'error': error}
+
+        return {
+            'success': True,
+            'outline': [heading.to_dict() for heading in headings],
+            'error': None
+        }
+
+    async def read_range(
+        self,
+        note_path: str,
+        start_byte: Optional[int] = None,
+        end_byte: Optional[int] = None,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Read part of a note by byte range or by (1-based, inclusive) line range.
+
+        Byte ranges of uncached notes are read straight from disk without
+        loading the rest of the file; a range that splits a UTF-8 character
+        drops the partial character.
+
+        Args:
+            note_path: Relative path to note within vault
+            start_byte: First byte to read (default: start of note)
+            end_byte: Byte offset to stop at (default: end of note)
+            start_line: First line to read (takes precedence over bytes)
+            end_line: Last line to read (default: end of note)
+
+        Returns:
+            {'success': bool, 'content': str, 'truncated': bool, 'error': str}
+            - truncated is True if the note continues past the range
+        """
+        if start_line is not None or end_line is not None:
+            result = await self.get_note(note_path)
+            if not result['success']:
+                return {'success': False, 'content': None, 'truncated': False, 'error': result['error']}
+
+            lines = result['note'].content.splitlines(keepends=True)
+            first = max((start_line or 1) - 1, 0)
+            last = len(lines) if end_line is None else max(end_line, first)
+            return {
+                'success': True,
+                'content': ''.join(lines[first:last]),
+                'truncated': last < len(lines),
+                'error': None
+            }
+
+        start = start_byte or 0
+        if end_byte is not None and end_byte < start:
+            return {
+                'success': False,
+                'content': None,
+                'truncated': False,
+                'error': 'end_byte must not be before start_byte'
+            }
+
+        if note_path in self.content_cache:
+            result = await self.get_note(note_path)
+            if result['success']:
+                data = result['note'].content.encode('utf-8')
+                end = len(data) if end_byte is None else min(end_byte, len(data))
+                return {
+                    'success': True,
+                    'content': data[start:end].decode('utf-8', errors='ignore'),
+                    'truncated': end < len(data),
+                    'error': None
+                }
+
+        result = await self.file_tools.read_file(
+            os.path.join(self.vault_path, note_path),
+            max_bytes=None if end_byte is None else end_byte - start,
+            offset=start
+        )
+        return {
+            'success': result['success'],
+            'content': result['content'],
+            'truncated': result['truncated'],
+            'error': result['error']
+        }
+
+    async def read_section(self, note_path: str, heading: str) -> Dict[str, Any]:
+        """
+        Read one section of a note: a heading and everything up to the next
+        heading of the same or higher level.
+
+        Args:
+            note_path: Relative path to note within vault
+            heading: Heading title (exact match preferred, else first containing it)
+
+        Returns:
+            {'success': bool, 'content': str, 'heading': Dict, 'error': str}
+        """
+        headings, error = await self._get_outline(note_path)
+        if headings is None:
+            return {'success': False, 'content': None, 'heading': None, 'error': error}
+
+        section = find_section(headings, heading)
+        if section is None:
+            return {
+                'success': False,
+                'content': None,
+                'heading': None,
+                'error': f"Heading not found: {heading}"
+            }
+
+        result = await self.read_range(
+            note_path,
+            start_byte=section.start_byte,
+            end_byte=section.end_byte
+        )
+
+        # An outline can be a step behind a note edited without the watcher
+        # running; if the range no longer starts at the heading, re-parse
+        if result['success'] and section.title not in result['content'].split('\n', 1)[0]:
+            self.outline_index.invalidate([note_path])
+            note = await self.get_note(note_path)
+            if not note['success']:
+                return {'success': False, 'content': None, 'heading': None, 'error': note['error']}
+
+            content = note['note'].content
+            section = find_section(parse_outline(content), heading)
+            if section is None:
+                return {
+                    'success': False,
+                    'content': None,
+                    'heading': None,
+                    'error': f"Heading not found: {heading}"
+                }
+            data = content.encode('utf-8')[section.start_byte:section.end_byte]
+            result = {'success': True, 'content': data.decode('utf-8', errors='ignore'), 'error': None}
+
+        if not result['success']:
+            return {'success': False, 'content': None, 'heading': None, 'error': result['error']}
+
+        return {
+            'success': True,
+            'content': result['content'],
+            'heading': section.to_dict(),
+            'error': None
+        }
+
+    async def _ensure_manifest(self) -> bool:
+        """Build or refresh the note manifest if needed; False if the vault is missing."""
+        if not await self.io.exists(self.manifest.vault_path):
+            return False
+        if self.manifest.needs_refresh():
+            await self.io.run(self.manifest.build)
+        return True
+
+    NOTE_FIELDS = ('path', 'name', 'folder', 'size', 'mtime')
+
+    async def notes_version(self) -> Optional[str]:
+        """
+        Token identifying the current note listing; it changes whenever a
+        note is added, removed or modified. None if the vault is missing.
+        """
+        if not await self._ensure_manifest():
+            return None
+        return self.manifest.version
+
+    async def list_all_notes(
+        self,
+        folder: str = '',
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Get list of all markdown notes in the vault.
 
+        Args:
+            folder: Only list notes under this folder
+            after: Continue after this note path (pagination)
+            limit: Maximum notes to return (None for all)
+            fields: Note fields to include, from NOTE_FIELDS
+                (defaults to path, name and folder)
+
         Returns:
-            {'success': bool, 'notes': List[Dict], 'error': str}
+            {'success': bool, 'notes': List[Dict], 'total': int,
+            'next_after': str, 'error': str} - next_after is the path to
+            continue from, or None on the last page
         """
         try:
-            vault_path = Path(self.vault_path)
-            if not vault_path.exists():
+            if not await self._ensure_manifest():
                 return {
                     'success': False,
                     'notes': [],
+                    'total': 0,
+                    'next_after': None,
                     'error': f'Vault not found: {self.vault_path}'
                 }
 
-            md_files = list(vault_path.glob("**/*.md"))
-            md_files.sort(key=lambda f: str(f))
-
-            notes = []
-            for file_path in md_files:
-                try:
-                    relative_path = file_path.relative_to(vault_path)
-                    notes.append({
-                        'path': str(relative_path),
-                        'name': file_path.name,
-                        'folder': str(relative_path.parent) if relative_path.parent != Path('.') else ''
-                    })
-                except ValueError:
-                    continue
+            fields = fields or ['path', 'name', 'folder']
+            entries, total, has_more = self.manifest.page(folder, after, limit)
+            notes = [
+                {field: getattr(entry, field) for field in fields}
+                for entry in entries
+            ]
 
             return {
                 'success': True,
                 'notes': notes,
+                'total': total,
+                'next_after': entries[-1].path if has_more and entries else None,
                 'error': None
             }
 
@@ -147,6 +812,8 @@ class ObsidianService:
             return {
                 'success': False,
                 'notes': [],
+                'total': 0,
+                'next_after': None,
                 'error': str(e)
             }
 
@@ -161,28 +828,16 @@ class ObsidianService:
             {'success': bool, 'notes': List[str], 'error': str}
         """
         try:
-            vault_path = Path(self.vault_path)
-            if not vault_path.exists():
+            if not await self._ensure_manifest():
                 return {
                     'success': False,
                     'notes': [],
                     'error': f'Vault not found: {self.vault_path}'
                 }
 
-            md_files = list(vault_path.glob("**/*.md"))
-            md_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-
-            recent_notes = []
-            for file_path in md_files[:limit]:
-                try:
-                    relative_path = file_path.relative_to(vault_path)
-                    recent_notes.append(str(relative_path))
-                except ValueError:
-                    continue
-
             return {
                 'success': True,
-                'notes': recent_notes,
+                'notes': [entry.path for entry in self.manifest.recent(limit)],
                 'error': None
             }
 
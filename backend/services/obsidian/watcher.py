@@ -0,0 +1,265 @@
+"""
+Vault file watcher.
+
+Turns watchdog filesystem events into debounced, coalesced batches of
+per-note changes so derived structures (search index, project metadata)
+can update incrementally instead of being rebuilt.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ..tools.walker import IgnoreRules
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VaultChange:
+    """A single coalesced change to a note."""
+    kind: str  # 'created', 'modified', 'deleted' or 'rescan'
+    path: str  # Relative path within the vault ('' for rescan)
+    old_path: Optional[str] = None  # Previous path when the note was moved
+
+
+class VaultWatcher:
+    """Watches the vault and dispatches batched note changes to listeners."""
+
+    # Quiet period after the last event before a batch is flushed
+    DEBOUNCE_SECONDS = 0.5
+
+    # Upper bound on how long a continuous burst can delay a flush
+    MAX_DELAY_SECONDS = 5.0
+
+    def __init__(self, vault_path: str, ignore: Optional[IgnoreRules] = None):
+        """
+        Initialize vault watcher.
+
+        Args:
+            vault_path: Path to Obsidian vault
+            ignore: Ignore rules; events for ignored paths are dropped
+        """
+        self.vault_path = Path(vault_path).resolve()
+        self.ignore = ignore or IgnoreRules()
+        self.listeners: List[Callable[[List[VaultChange]], None]] = []
+
+        self._observer = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, VaultChange] = {}
+        self._first_pending_at: Optional[float] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Held while a batch is in the listeners, so batches never overlap
+        # and reach every listener in the order they were taken
+        self._dispatch_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether filesystem events are being received."""
+        return self._observer is not None
+
+    def add_listener(self, callback: Callable[[List[VaultChange]], None]):
+        """
+        Register a callback for change batches.
+
+        The callback receives a list of VaultChange and may be a plain
+        function or a coroutine function.
+        """
+        self.listeners.append(callback)
+
+    async def start(self):
+        """Start watching the vault for changes."""
+        if self._observer:
+            return
+
+        self._loop = asyncio.get_running_loop()
+
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            logger.error("watchdog not installed - vault watcher disabled")
+            return
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                watcher._on_fs_event(event)
+
+        try:
+            observer = Observer()
+            observer.schedule(_Handler(), str(self.vault_path), recursive=True)
+            observer.start()
+            self._observer = observer
+            logger.info(f"Watching vault for changes: {self.vault_path}")
+        except Exception as e:
+            logger.error(f"Failed to start vault watcher: {e}")
+
+    async def stop(self):
+        """Stop watching and flush any pending changes."""
+        if self._observer:
+            observer = self._observer
+            self._observer = None
+            observer.stop()
+            await asyncio.to_thread(observer.join)
+            logger.info("Vault watcher stopped")
+
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await self._flush()
+
+    def notify(self, path: str, kind: str = 'modified'):
+        """
+        Record a change made by this process.
+
+        Lets writes from ConversationSaver/ProjectManager reach listeners
+        even when filesystem events are unavailable. Must be called from
+        the event loop thread.
+
+        Args:
+            path: Absolute or vault-relative path of the note
+            kind: 'created', 'modified' or 'deleted'
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+
+        relative_path = self._relative_note_path(path)
+        if relative_path:
+            self._record(VaultChange(kind=kind, path=relative_path))
+
+    # ===== Event handling =====
+
+    def _on_fs_event(self, event):
+        """Translate a watchdog event (observer thread) into changes."""
+        if event.is_directory:
+            # Directory moves/deletes can affect many notes at once, unless
+            # they happen entirely inside ignored folders (.git, .obsidian...)
+            paths = [event.src_path, getattr(event, 'dest_path', None)]
+            visible = any(path and not self._is_ignored_dir(path) for path in paths)
+            if event.event_type in ('moved', 'deleted') and visible:
+                change = VaultChange(kind='rescan', path='')
+                self._loop.call_soon_threadsafe(self._record, change)
+            return
+
+        src = self._relative_note_path(event.src_path)
+
+        if event.event_type == 'moved':
+            dest = self._relative_note_path(event.dest_path)
+            changes = []
+            if src:
+                changes.append(VaultChange(kind='deleted', path=src))
+            if dest:
+                changes.append(VaultChange(kind='created', path=dest, old_path=src))
+        elif event.event_type in ('created', 'modified', 'deleted') and src:
+            changes = [VaultChange(kind=event.event_type, path=src)]
+        else:
+            changes = []
+
+        for change in changes:
+            self._loop.call_soon_threadsafe(self._record, change)
+
+    def _relative_note_path(self, path: str) -> Optional[str]:
+        """Return the vault-relative path for a visible note, else None."""
+        candidate = Path(path)
+        if not candidate.is_absolute():
+            candidate = self.vault_path / candidate
+
+        try:
+            relative = candidate.resolve().relative_to(self.vault_path)
+        except (ValueError, OSError):
+            return None
+
+        if relative.suffix != '.md':
+            return None
+        if self.ignore.is_ignored(relative.as_posix()):
+            return None
+
+        return str(relative)
+
+    def _is_ignored_dir(self, path: str) -> bool:
+        """Whether a directory is ignored (or outside the vault)."""
+        try:
+            relative = Path(path).resolve().relative_to(self.vault_path)
+        except (ValueError, OSError):
+            return True
+        return bool(relative.parts) and self.ignore.is_ignored(relative.as_posix(), is_dir=True)
+
+    def _record(self, change: VaultChange):
+        """Coalesce a change into the pending batch and (re)arm the flush."""
+        previous = self._pending.get(change.path)
+        merged = self._coalesce(previous, change) if previous else change
+
+        if merged is None:
+            self._pending.pop(change.path, None)
+        else:
+            self._pending[change.path] = merged
+
+        now = time.monotonic()
+        if self._first_pending_at is None:
+            self._first_pending_at = now
+
+        if self._flush_handle:
+            self._flush_handle.cancel()
+
+        delay = min(
+            self.DEBOUNCE_SECONDS,
+            max(0.0, self._first_pending_at + self.MAX_DELAY_SECONDS - now)
+        )
+        self._flush_handle = self._loop.call_later(
+            delay, lambda: asyncio.ensure_future(self._flush())
+        )
+
+    @staticmethod
+    def _coalesce(previous: VaultChange, change: VaultChange) -> Optional[VaultChange]:
+        """
+        Merge two changes to the same path.
+
+        created + modified -> created, created + deleted -> nothing,
+        deleted + created -> modified, otherwise the later change wins.
+        """
+        if change.kind == 'rescan':
+            return change
+        if previous.kind == 'created' and change.kind == 'modified':
+            return previous
+        if previous.kind == 'created' and change.kind == 'deleted':
+            return None
+        if previous.kind == 'deleted' and change.kind == 'created':
+            return VaultChange(kind='modified', path=change.path, old_path=change.old_path)
+        return change
+
+    async def _flush(self):
+        """
+        Dispatch the pending batch to every listener.
+
+        The batch is taken before waiting for an earlier one to finish;
+        asyncio.Lock wakes waiters first in, first out, so batches are
+        delivered in order even when listeners outlast the debounce.
+        """
+        self._flush_handle = None
+        self._first_pending_at = None
+
+        if not self._pending:
+            return
+
+        changes = list(self._pending.values())
+        self._pending = {}
+
+        if any(c.kind == 'rescan' for c in changes):
+            changes = [VaultChange(kind='rescan', path='')]
+
+        async with self._dispatch_lock:
+            logger.debug(f"Dispatching {len(changes)} vault changes")
+
+            for listener in self.listeners:
+                try:
+                    result = listener(changes)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Vault change listener failed: {e}")
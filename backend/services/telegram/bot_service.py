@@ -7,8 +7,10 @@ management, Obsidian integration, and proactive nudging support.
 
 import os
 import logging
-from typing import Set
+from typing import Any, Dict, List, Set
 
+from ..llm_scheduler import SchedulerSaturated
+from ..context_window import ContextWindow
 from .conversation import ConversationManager, Conversation
 from .handlers import TelegramHandlers
 
@@ -68,6 +70,12 @@ class TelegramBotService:
         # Use Claude if available, otherwise Ollama
         self.use_claude = claude_service is not None and claude_service.enabled
 
+        # Keeps prompts within the token budget; older turns are folded into
+        # each conversation's summary by the same backend, in the background
+        self.context_window = ContextWindow(
+            summarize=self._summarize if self.use_claude or llm_service else None
+        )
+
         logger.info(f"TelegramBotService initialized (Claude: {self.use_claude})")
 
     def is_authorized(self, user_id: int) -> bool:
@@ -140,23 +148,55 @@ class TelegramBotService:
             await self.application.stop()
             await self.application.shutdown()
 
-    async def generate_response(self, conversation: Conversation) -> str:
+    async def _summarize(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Background generation folding older turns into a conversation summary."""
+        if self.use_claude:
+            return await self.claude_service.generate_response(
+                messages,
+                priority='background',
+                user='telegram-context'
+            )
+        return await self.llm_service.complete(messages, user='telegram-context')
+
+    async def generate_response(self, conversation: Conversation, user_id: int = None) -> str:
         """Generate AI response for conversation."""
-        if self.use_claude and self.claude_service:
-            result = await self.claude_service.generate_response(conversation.messages)
+        user = str(user_id or 'telegram')
+        backend = self.claude_service if self.use_claude else self.llm_service
+        if not backend:
+            return "No LLM service available. Please configure Ollama or Claude."
+
+        # Recent turns within the token budget; older ones are in the summary
+        messages, summary = self.context_window.prepare(
+            conversation.messages,
+            system_prompt=backend.system_prompt,
+            summary=conversation.summary,
+            key=user
+        )
+
+        if self.use_claude:
+            result = await self.claude_service.generate_response(
+                messages,
+                priority='telegram',
+                user=user,
+                summary=summary
+            )
             if result['success']:
                 return result['content']
             return f"Error: {result['error']}"
-        elif self.llm_service:
+        else:
             response_parts = []
-            async for chunk in self.llm_service.generate_response(
-                conversation.messages,
-                stream=False
-            ):
-                response_parts.append(chunk)
+            try:
+                async for chunk in self.llm_service.generate_response(
+                    messages,
+                    stream=False,
+                    priority='telegram',
+                    user=user,
+                    summary=summary
+                ):
+                    response_parts.append(chunk)
+            except SchedulerSaturated as e:
+                return f"I'm busy right now - please try again in {e.retry_after} seconds."
             return "".join(response_parts)
-        else:
-            return "No LLM service available. Please configure Ollama or Claude."
 
     async def save_conversation(self, user_id: int):
         """Save conversation to Obsidian vault."""
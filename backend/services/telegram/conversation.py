@@ -6,6 +6,8 @@ from datetime import datetime
 from typing import Optional, Dict, List
 from dataclasses import dataclass, field
 
+from ..context_window import RollingSummary
+
 
 @dataclass
 class Conversation:
@@ -17,6 +19,7 @@ class Conversation:
     context_name: str = ""
     last_save_time: Optional[datetime] = None
     message_count_since_save: int = 0
+    summary: RollingSummary = field(default_factory=RollingSummary)  # Turns left out of the prompt
 
 
 class ConversationManager:
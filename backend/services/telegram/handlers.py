@@ -57,7 +57,7 @@ I'll help you stay productive and aligned with your goals!"""
 
 **Knowledge Base:**
 /search <query> - Search your Obsidian vault
-/today - View today's daily note
+/today [heading] - View today's daily note, or one section of it
 
 **Projects & Goals:**
 /project <name> - Create or switch to a project
@@ -89,6 +89,10 @@ Just send a regular message to chat with AI!"""
         query = " ".join(context.args)
         result = await self.bot.obsidian_service.search_vault(query, limit=5)
 
+        # Phone keyboards make typos likely; retry approximately if nothing matched
+        if result['success'] and not result['results']:
+            result = await self.bot.obsidian_service.search_vault(query, limit=5, mode='fuzzy')
+
         if not result['success']:
             await update.message.reply_text(f"Search error: {result['error']}")
             return
@@ -116,7 +120,28 @@ Just send a regular message to chat with AI!"""
 
         today = datetime.now().strftime("%Y-%m-%d")
         note_path = f"Daily-Notes/{today}.md"
-        result = await self.bot.obsidian_service.read_note(note_path)
+        obsidian = self.bot.obsidian_service
+
+        # /today <heading> shows just that section
+        if context.args:
+            heading = " ".join(context.args)
+            result = await obsidian.read_section(note_path, heading)
+            if not result['success']:
+                await update.message.reply_text(f"Couldn't read '{heading}': {result['error']}")
+                return
+
+            content = result['content']
+            if len(content) > 3000:
+                content = content[:3000] + "\n\n...(truncated)"
+
+            await update.message.reply_text(
+                f"**Daily Note - {today}**\n\n{content}",
+                parse_mode='Markdown'
+            )
+            return
+
+        # Read only as much of the note as fits in the reply
+        result = await obsidian.read_range(note_path, start_byte=0, end_byte=3000)
 
         if not result['success']:
             await update.message.reply_text(
@@ -126,8 +151,15 @@ Just send a regular message to chat with AI!"""
             return
 
         content = result['content']
-        if len(content) > 3000:
-            content = content[:3000] + "\n\n...(truncated)"
+        if result['truncated']:
+            content += "\n\n...(truncated)"
+
+            # Point at the sections that didn't fit, if that needs no full read
+            outline = await obsidian.get_outline(note_path, cached_only=True)
+            remaining = [h['title'] for h in outline['outline'] if h['start_byte'] >= 3000]
+            if remaining:
+                content += "\nMore sections: " + ", ".join(remaining[:10])
+                content += "\nUse /today <heading> to read one."
 
         await update.message.reply_text(
             f"**Daily Note - {today}**\n\n{content}",
@@ -188,6 +220,7 @@ Just send a regular message to chat with AI!"""
 
         user_id = update.effective_user.id
         self.bot.conversation_manager.reset(user_id)
+        self.bot.context_window.forget(str(user_id))
 
         await update.message.reply_text(
             "Started a new conversation.\n\nPrevious conversation saved to Obsidian."
@@ -271,7 +304,7 @@ Topic: {conversation.topic or '(auto-detected)'}
         status_parts.append("Telegram Bot: Online")
 
         if self.bot.llm_service:
-            healthy = self.bot.llm_service.check_health()
+            healthy = await self.bot.llm_service.check_health()
             status_parts.append(f"Ollama: {'Online' if healthy else 'Offline'}")
         else:
             status_parts.append("Ollama: Not configured")
@@ -309,7 +342,7 @@ Topic: {conversation.topic or '(auto-detected)'}
         conversation.message_count_since_save += 1
 
         try:
-            response = await self.bot.generate_response(conversation)
+            response = await self.bot.generate_response(conversation, user_id)
 
             conversation.messages.append({'role': 'assistant', 'content': response})
             conversation.message_count_since_save += 1
@@ -1,3 +1,9 @@
+from .async_io import AsyncFileIO, get_default_io
 from .file_tools import FileTools
+from .vault_scanner import VaultScanner
+from .walker import IgnoreRules, VaultWalker, WalkEntry
 
-__all__ = ['FileTools']
+__all__ = [
+    'AsyncFileIO', 'get_default_io', 'FileTools', 'VaultScanner',
+    'IgnoreRules', 'VaultWalker', 'WalkEntry'
+]
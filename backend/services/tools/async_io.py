@@ -0,0 +1,185 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def _summarize(samples: deque) -> Dict[str, float]:
+    """avg/p50/p95/max in milliseconds over recent samples (seconds)"""
+    if not samples:
+        return {'avg': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    ordered = sorted(samples)
+    return {
+        'avg': round(sum(ordered) / len(ordered) * 1000, 3),
+        'p50': round(ordered[len(ordered) // 2] * 1000, 3),
+        'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        'max': round(ordered[-1] * 1000, 3)
+    }
+
+
+class AsyncFileIO:
+    """
+    Non-blocking file I/O on a dedicated, bounded thread pool
+
+    Keeps disk work off the event loop without competing with other users
+    of the loop's default executor, and records how long operations wait
+    for a worker so a slow disk shows up as queueing, not as a stalled bot.
+    """
+
+    # Recent operations kept for wait/run time percentiles
+    SAMPLE_SIZE = 1024
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize async file I/O
+
+        Args:
+            max_workers: Worker threads (defaults to VAULT_IO_WORKERS or 8)
+        """
+        self.max_workers = max_workers or int(os.getenv('VAULT_IO_WORKERS', 8))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='vault-io'
+        )
+
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._wait_times: deque = deque(maxlen=self.SAMPLE_SIZE)
+        self._run_times: deque = deque(maxlen=self.SAMPLE_SIZE)
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run a blocking function on the I/O pool
+
+        Args:
+            func: Blocking callable
+            *args, **kwargs: Passed to func
+
+        Returns:
+            func's return value (exceptions propagate)
+        """
+        submitted = time.perf_counter()
+        claimed = False
+
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+
+        def task():
+            nonlocal claimed
+            started = time.perf_counter()
+            with self._lock:
+                if not claimed:
+                    claimed = True
+                    self._queued -= 1
+                self._running += 1
+                self._wait_times.append(started - submitted)
+
+            failed = False
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._run_times.append(time.perf_counter() - started)
+                    if failed:
+                        self._failed += 1
+                    else:
+                        self._completed += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, task)
+        except asyncio.CancelledError:
+            # A task cancelled before a worker picked it up never runs
+            with self._lock:
+                if not claimed:
+                    claimed = True
+                    self._queued -= 1
+                self._cancelled += 1
+            raise
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Pool utilisation and latency
+
+        Returns:
+            {'workers', 'queue_depth', 'max_queue_depth', 'in_flight',
+            'completed', 'failed', 'cancelled', 'wait_ms', 'run_ms'} where
+            wait_ms/run_ms are {'avg', 'p50', 'p95', 'max'} over recent
+            operations
+        """
+        with self._lock:
+            return {
+                'workers': self.max_workers,
+                'queue_depth': self._queued,
+                'max_queue_depth': self._max_queued,
+                'in_flight': self._running,
+                'completed': self._completed,
+                'failed': self._failed,
+                'cancelled': self._cancelled,
+                'wait_ms': _summarize(self._wait_times),
+                'run_ms': _summarize(self._run_times)
+            }
+
+    # ===== Convenience wrappers =====
+
+    async def read_text(self, path, encoding: str = 'utf-8') -> str:
+        """Read a whole text file, keeping line endings as they are on disk"""
+        def read():
+            with open(path, 'r', encoding=encoding, newline='') as f:
+                return f.read()
+        return await self.run(read)
+
+    async def read_bytes(self, path) -> bytes:
+        """Read a whole file as bytes"""
+        return await self.run(Path(path).read_bytes)
+
+    async def write_text(self, path, content: str, make_dirs: bool = False, encoding: str = 'utf-8'):
+        """Write a text file, optionally creating its parent directories"""
+        def write():
+            if make_dirs:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding=encoding) as f:
+                f.write(content)
+        await self.run(write)
+
+    async def exists(self, path) -> bool:
+        """Check if a path exists"""
+        return await self.run(os.path.exists, path)
+
+    async def stat(self, path) -> os.stat_result:
+        """stat() a path"""
+        return await self.run(os.stat, path)
+
+    def shutdown(self):
+        """Stop the worker threads once queued operations finish"""
+        self._executor.shutdown(wait=False)
+
+
+_default_io: Optional[AsyncFileIO] = None
+
+
+def get_default_io() -> AsyncFileIO:
+    """Process-wide I/O pool shared by every vault component"""
+    global _default_io
+    if _default_io is None:
+        _default_io = AsyncFileIO()
+    return _default_io
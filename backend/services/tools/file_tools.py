@@ -1,21 +1,38 @@
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import AsyncGenerator, Optional, List, Dict, Any
 import logging
 
+from .async_io import AsyncFileIO, get_default_io
+from .vault_scanner import VaultScanner
+from .walker import VaultWalker
+
 logger = logging.getLogger(__name__)
 
 class FileTools:
     """File operation tools with security protections"""
 
-    def __init__(self, allowed_paths: List[str] = None):
+    def __init__(
+        self,
+        allowed_paths: List[str] = None,
+        scanner: Optional[VaultScanner] = None,
+        io: Optional[AsyncFileIO] = None,
+        walker: Optional[VaultWalker] = None
+    ):
         """
         Initialize file tools with allowed paths
 
         Args:
             allowed_paths: List of absolute paths that are allowed for file operations
+            scanner: Parallel scanner for searches (a private one is created if omitted)
+            io: Thread pool for blocking file I/O (defaults to the shared pool)
+            walker: Directory walker with the vault's ignore rules (directories
+                are walked with the default rules if omitted)
         """
         self.allowed_paths = [Path(p).resolve() for p in (allowed_paths or [])]
+        self.scanner = scanner or VaultScanner()
+        self.io = io or get_default_io()
+        self.walker = walker
 
     def _is_path_allowed(self, file_path: str) -> bool:
         """
@@ -45,34 +62,79 @@ class FileTools:
             logger.error(f"Error checking path: {e}")
             return False
 
-    async def read_file(self, file_path: str) -> Dict[str, Any]:
+    def _walk(self, directory: str, pattern: str) -> List[str]:
+        """Sorted paths of files matching pattern, skipping ignored folders (blocking)"""
+        walker = self.walker or VaultWalker(directory)
+        return sorted(entry.path for entry in walker.walk(directory, pattern))
+
+    @staticmethod
+    def _read_range(file_path: str, offset: int, max_bytes: Optional[int]):
+        """Read up to max_bytes from a byte offset, never splitting a UTF-8 character"""
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            if max_bytes is None:
+                data = f.read()
+                truncated = False
+            else:
+                data = f.read(max_bytes + 1)
+                truncated = len(data) > max_bytes
+                data = data[:max_bytes]
+
+        # Skip the tail of a character cut off at the start
+        skip = 0
+        while skip < min(3, len(data)) and 0x80 <= data[skip] <= 0xBF:
+            skip += 1
+        data = data[skip:]
+
+        # Drop a multi-byte character cut off at the end (at most 3 bytes)
+        for cut in range(4):
+            try:
+                return data[:len(data) - cut].decode('utf-8'), truncated
+            except UnicodeDecodeError:
+                continue
+        return data.decode('utf-8', errors='replace'), truncated
+
+    async def read_file(
+        self,
+        file_path: str,
+        max_bytes: Optional[int] = None,
+        offset: int = 0
+    ) -> Dict[str, Any]:
         """
         Read file contents
 
         Args:
             file_path: Path to file to read
+            max_bytes: Only read this many bytes (default: to the end of the file)
+            offset: Byte offset to start reading from
 
         Returns:
             {
                 'success': bool,
                 'content': str,
+                'truncated': bool,  # True if max_bytes cut the content short
                 'error': str
             }
         """
-        if not self._is_path_allowed(file_path):
+        if not await self.io.run(self._is_path_allowed, file_path):
             return {
                 'success': False,
                 'content': None,
+                'truncated': False,
                 'error': 'Path not allowed'
             }
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if max_bytes is None and not offset:
+                content = await self.io.read_text(file_path)
+                truncated = False
+            else:
+                content, truncated = await self.io.run(self._read_range, file_path, offset, max_bytes)
 
             return {
                 'success': True,
                 'content': content,
+                'truncated': truncated,
                 'error': None
             }
 
@@ -80,6 +142,7 @@ class FileTools:
             return {
                 'success': False,
                 'content': None,
+                'truncated': False,
                 'error': f'File not found: {file_path}'
             }
         except Exception as e:
@@ -87,6 +150,7 @@ class FileTools:
             return {
                 'success': False,
                 'content': None,
+                'truncated': False,
                 'error': str(e)
             }
 
@@ -104,7 +168,7 @@ class FileTools:
                 'error': str
             }
         """
-        if not self._is_path_allowed(file_path):
+        if not await self.io.run(self._is_path_allowed, file_path):
             return {
                 'success': False,
                 'error': 'Path not allowed'
@@ -112,10 +176,7 @@ class FileTools:
 
         try:
             # Create parent directories if they don't exist
-            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            await self.io.write_text(file_path, content, make_dirs=True)
 
             return {
                 'success': True,
@@ -144,7 +205,7 @@ class FileTools:
                 'error': str
             }
         """
-        if not self._is_path_allowed(directory):
+        if not await self.io.run(self._is_path_allowed, directory):
             return {
                 'success': False,
                 'files': [],
@@ -152,15 +213,14 @@ class FileTools:
             }
 
         try:
-            dir_path = Path(directory)
-            if not dir_path.exists():
+            if not await self.io.exists(directory):
                 return {
                     'success': False,
                     'files': [],
                     'error': f'Directory not found: {directory}'
                 }
 
-            files = [str(f) for f in dir_path.glob(pattern)]
+            files = await self.io.run(self._walk, directory, pattern)
 
             return {
                 'success': True,
@@ -176,11 +236,45 @@ class FileTools:
                 'error': str(e)
             }
 
-    async def search_in_files(
+    async def _iter_search_in_files(
         self,
         directory: str,
         query: str,
         pattern: str = "**/*.md"
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Yield matching lines one at a time, in file/line order.
+
+        Files are scanned in parallel by the VaultScanner. Scanning stops as
+        soon as the consumer stops iterating, so callers that only need the
+        first few hits do not pay for the whole tree.
+
+        Args:
+            directory: Directory to search (the caller checks it is allowed and exists)
+            query: Search query (case-insensitive substring)
+            pattern: Glob pattern (default: **/*.md for recursive search)
+
+        Yields:
+            {'file': str, 'line_number': int, 'line_content': str}
+        """
+        # Listing and scanning both happen off the event loop; files are
+        # sorted so results come back in a deterministic order
+        paths = await self.io.run(self._walk, directory, pattern)
+
+        matches = self.scanner.iter_matches(paths, query)
+        try:
+            async for match in matches:
+                yield match
+        finally:
+            await matches.aclose()
+
+    async def search_in_files(
+        self,
+        directory: str,
+        query: str,
+        pattern: str = "**/*.md",
+        limit: Optional[int] = None,
+        count_total: bool = False
     ) -> Dict[str, Any]:
         """
         Search for query in files
@@ -189,51 +283,56 @@ class FileTools:
             directory: Directory to search
             query: Search query
             pattern: Glob pattern (default: **/*.md for recursive search)
+            limit: Stop collecting after this many results (default: no limit)
+            count_total: Keep scanning past the limit to count every match
 
         Returns:
             {
                 'success': bool,
                 'results': List[Dict],  # Each result has 'file', 'line_number', 'line_content'
+                'total': int,  # Exact match count if count_total, else None when truncated
                 'error': str
             }
         """
-        if not self._is_path_allowed(directory):
+        if not await self.io.run(self._is_path_allowed, directory):
             return {
                 'success': False,
                 'results': [],
+                'total': 0,
                 'error': 'Path not allowed'
             }
 
         try:
-            dir_path = Path(directory)
-            if not dir_path.exists():
+            if not await self.io.exists(directory):
                 return {
                     'success': False,
                     'results': [],
+                    'total': 0,
                     'error': f'Directory not found: {directory}'
                 }
 
             results = []
-            query_lower = query.lower()
-
-            for file_path in dir_path.glob(pattern):
-                if file_path.is_file():
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            for line_num, line in enumerate(f, 1):
-                                if query_lower in line.lower():
-                                    results.append({
-                                        'file': str(file_path),
-                                        'line_number': line_num,
-                                        'line_content': line.strip()
-                                    })
-                    except Exception as e:
-                        logger.warning(f"Error reading {file_path}: {e}")
+            total = 0
+            truncated = False
+
+            matches = self._iter_search_in_files(directory, query, pattern)
+            try:
+                async for match in matches:
+                    total += 1
+                    if limit is None or len(results) < limit:
+                        results.append(match)
+                    elif count_total:
                         continue
+                    else:
+                        truncated = True
+                        break
+            finally:
+                await matches.aclose()
 
             return {
                 'success': True,
                 'results': results,
+                'total': None if truncated else total,
                 'error': None
             }
 
@@ -242,5 +341,6 @@ class FileTools:
             return {
                 'success': False,
                 'results': [],
+                'total': 0,
                 'error': str(e)
             }
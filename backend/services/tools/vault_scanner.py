@@ -0,0 +1,218 @@
+import os
+import re
+import mmap
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncGenerator, Dict, Any, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _compile_query(query: str) -> Tuple[Pattern, bool]:
+    """
+    Compile a case-insensitive literal pattern for a query
+
+    Bytes patterns only fold ASCII case, so non-ASCII queries get a str
+    pattern and are matched against decoded text instead.
+
+    Returns:
+        (pattern, is_bytes)
+    """
+    if query.isascii():
+        return re.compile(re.escape(query.encode('utf-8')), re.IGNORECASE), True
+    return re.compile(re.escape(query), re.IGNORECASE), False
+
+
+def _find_lines(buf, pattern: Pattern, newline) -> List[Tuple[int, Any]]:
+    """
+    Find lines containing a pattern match in a whole-file buffer
+
+    Line numbers and line text are only worked out at hits; lines that
+    do not match are never split out or decoded.
+
+    Returns:
+        List of (line_number, raw_line) with one entry per matching line
+    """
+    hits = []
+    line_number = 1
+    counted_to = 0
+    pos = 0
+
+    while True:
+        match = pattern.search(buf, pos)
+        if not match:
+            break
+
+        start = match.start()
+        line_number += buf[counted_to:start].count(newline)
+        counted_to = start
+
+        line_start = buf.rfind(newline, 0, start) + 1
+        line_end = buf.find(newline, start)
+        if line_end == -1:
+            line_end = len(buf)
+
+        hits.append((line_number, buf[line_start:line_end]))
+        pos = line_end + 1
+
+    return hits
+
+
+def _scan_file(path: str, pattern: Pattern, is_bytes: bool) -> List[Tuple[str, int, str]]:
+    """Search one file, memory-mapping it when the pattern is a bytes pattern"""
+    with open(path, 'rb') as f:
+        if not is_bytes:
+            text = f.read().decode('utf-8', errors='replace')
+            return [
+                (path, line_number, line.strip())
+                for line_number, line in _find_lines(text, pattern, '\n')
+            ]
+
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return [
+                (path, line_number, line.decode('utf-8', errors='replace').strip())
+                for line_number, line in _find_lines(buf, pattern, b'\n')
+            ]
+
+
+def _scan_shard(paths: List[str], query: str) -> List[Tuple[str, int, str]]:
+    """
+    Search a shard of files for a case-insensitive substring (worker process)
+
+    Returns:
+        List of (file, line_number, line_content) in file/line order
+    """
+    pattern, is_bytes = _compile_query(query)
+    hits = []
+
+    for path in paths:
+        try:
+            hits.extend(_scan_file(path, pattern, is_bytes))
+        except Exception as e:
+            logger.warning(f"Error reading {path}: {e}")
+            continue
+
+    return hits
+
+
+def _read_shard(paths: List[str]) -> List[Optional[str]]:
+    """Read and decode a shard of files (worker process); None for unreadable files"""
+    contents = []
+
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                contents.append(f.read())
+        except OSError as e:
+            logger.warning(f"Error reading {path}: {e}")
+            contents.append(None)
+
+    return contents
+
+
+class VaultScanner:
+    """Multi-core file scanning that runs off the event loop"""
+
+    # Files handed to a worker per task; large enough to amortize pickling
+    FILES_PER_SHARD = 64
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize vault scanner
+
+        Args:
+            max_workers: Worker processes (defaults to VAULT_SCAN_WORKERS or CPU count)
+        """
+        self.max_workers = max_workers or int(
+            os.getenv('VAULT_SCAN_WORKERS', os.cpu_count() or 1)
+        )
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        """Create the worker pool on first use"""
+        if self._executor is None:
+            # The server already runs threads (watcher, I/O pool), and forking
+            # a threaded process can deadlock the child; start workers clean
+            methods = multiprocessing.get_all_start_methods()
+            method = 'forkserver' if 'forkserver' in methods else 'spawn'
+            try:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(method)
+                )
+            except (OSError, NotImplementedError, ValueError) as e:
+                logger.warning(f"Process pool unavailable, scanning with threads: {e}")
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _shards(self, paths: List[str]) -> List[List[str]]:
+        """Split a file list into consecutive shards, preserving order"""
+        size = self.FILES_PER_SHARD
+        return [paths[i:i + size] for i in range(0, len(paths), size)]
+
+    async def iter_matches(
+        self,
+        paths: List[str],
+        query: str
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Search files in parallel, yielding hits in file/line order
+
+        Only a bounded window of shards is in flight, so a consumer that
+        stops early leaves the rest of the vault unscanned.
+
+        Args:
+            paths: Files to search, in the order results should come back
+            query: Case-insensitive substring to find
+
+        Yields:
+            {'file': str, 'line_number': int, 'line_content': str}
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        shards = self._shards(paths)
+        window = self.max_workers * 2
+
+        pending: List[asyncio.Future] = []
+        next_shard = 0
+
+        try:
+            while next_shard < len(shards) or pending:
+                while next_shard < len(shards) and len(pending) < window:
+                    pending.append(loop.run_in_executor(
+                        executor, _scan_shard, shards[next_shard], query
+                    ))
+                    next_shard += 1
+
+                for path, line_num, line in await pending.pop(0):
+                    yield {
+                        'file': path,
+                        'line_number': line_num,
+                        'line_content': line
+                    }
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def read_files(self, paths: List[str]) -> List[Optional[str]]:
+        """
+        Read many files in parallel, returning contents in input order
+
+        Blocking - call it from a worker thread, not the event loop.
+        """
+        executor = self._get_executor()
+        contents: List[Optional[str]] = []
+        for shard_contents in executor.map(_read_shard, self._shards(paths)):
+            contents.extend(shard_contents)
+        return contents
+
+    def shutdown(self):
+        """Stop worker processes, abandoning queued shards"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
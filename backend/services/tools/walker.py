@@ -0,0 +1,320 @@
+import os
+import re
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Skipped in every vault: dot entries (.obsidian, .trash, .git, ...) and
+# dependency folders that end up in vaults kept under version control
+DEFAULT_IGNORE_PATTERNS = ['.*', 'node_modules/']
+
+# gitignore-style patterns, one per line, read from the vault root
+IGNORE_FILE = '.vaultignore'
+
+
+def _translate(pattern: str) -> Pattern:
+    """
+    Compile a glob (with gitignore's ** semantics) into a regex
+
+    '*' and '?' never match '/', '**/' matches any number of directories
+    and a trailing '**' matches everything below
+    """
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif pattern[i] == '*':
+            regex += '[^/]*'
+            i += 1
+        elif pattern[i] == '?':
+            regex += '[^/]'
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 1:]:
+            end = pattern.index(']', i + 1)
+            regex += '[' + pattern[i + 1:end].replace('\\', '\\\\').replace('!', '^', 1) + ']'
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return re.compile(regex, re.DOTALL)
+
+
+@dataclass
+class _Rule:
+    regex: Pattern
+    negate: bool
+    dir_only: bool
+    anchored: bool  # Matched against the whole relative path, not just the name
+
+
+class IgnoreRules:
+    """
+    gitignore-style ignore patterns for vault-relative paths
+
+    Supports comments, '!' negation (last matching pattern wins), a trailing
+    '/' for directory-only patterns and a leading or inner '/' to anchor a
+    pattern at the vault root. Obsidian's "Excluded files" filters are added
+    with add_obsidian_filters.
+    """
+
+    def __init__(self, patterns: Optional[List[str]] = None):
+        """
+        Initialize ignore rules
+
+        Args:
+            patterns: gitignore-style patterns (default: DEFAULT_IGNORE_PATTERNS)
+        """
+        self._rules: List[_Rule] = []
+        self._regexes: List[Pattern] = []
+        self.add(DEFAULT_IGNORE_PATTERNS if patterns is None else patterns)
+
+    def add(self, patterns: List[str]):
+        """Add gitignore-style patterns after the existing ones"""
+        for line in patterns:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            anchored = '/' in line
+            line = line.lstrip('/')
+            if not line:
+                continue
+
+            self._rules.append(_Rule(_translate(line), negate, dir_only, anchored))
+
+    def add_obsidian_filters(self, filters: List[str]):
+        """
+        Add Obsidian "Excluded files" filters (app.json userIgnoreFilters)
+
+        Plain filters are vault-relative path prefixes ('Archive/' excludes
+        the folder, 'Templates' also files starting with it); '/.../' filters
+        are regular expressions searched in the path.
+        """
+        for value in filters:
+            if not isinstance(value, str) or not value:
+                continue
+            if len(value) > 2 and value.startswith('/') and value.endswith('/'):
+                try:
+                    self._regexes.append(re.compile(value[1:-1]))
+                except re.error as e:
+                    logger.warning(f"Invalid Obsidian exclude filter {value!r}: {e}")
+            else:
+                self._regexes.append(re.compile('^' + re.escape(value.lstrip('/'))))
+
+    def matches(self, relative: str, is_dir: bool) -> bool:
+        """
+        Check one path against the rules, without looking at its parents
+
+        Walkers prune ignored directories, so checking each entry as it is
+        reached is enough; use is_ignored for arbitrary paths.
+        """
+        for regex in self._regexes:
+            if regex.search(relative + '/' if is_dir else relative):
+                return True
+
+        name = relative.rsplit('/', 1)[-1]
+        ignored = False
+        for rule in self._rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(relative if rule.anchored else name):
+                ignored = not rule.negate
+        return ignored
+
+    def is_ignored(self, relative: str, is_dir: bool = False) -> bool:
+        """Check a vault-relative path, including whether a parent folder is ignored"""
+        parts = relative.replace(os.sep, '/').strip('/').split('/')
+        for depth in range(1, len(parts)):
+            if self.matches('/'.join(parts[:depth]), True):
+                return True
+        return self.matches('/'.join(parts), is_dir)
+
+    @classmethod
+    def for_vault(cls, vault_path: str) -> 'IgnoreRules':
+        """
+        Ignore rules configured for a vault
+
+        Combines the defaults, VAULT_IGNORE (comma-separated patterns), the
+        vault's .vaultignore file and Obsidian's own excluded files from
+        .obsidian/app.json
+        """
+        rules = cls()
+        rules.add([p.strip() for p in os.getenv('VAULT_IGNORE', '').split(',') if p.strip()])
+
+        root = Path(vault_path)
+        try:
+            rules.add((root / IGNORE_FILE).read_text(encoding='utf-8').splitlines())
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not read {IGNORE_FILE}: {e}")
+
+        try:
+            config = json.loads((root / '.obsidian' / 'app.json').read_text(encoding='utf-8'))
+            rules.add_obsidian_filters(config.get('userIgnoreFilters') or [])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Could not read Obsidian excluded files: {e}")
+
+        return rules
+
+
+@dataclass
+class WalkEntry:
+    """A file found by the walker, stat'ed once"""
+    path: str       # Absolute path
+    relative: str   # '/'-separated path from the walker root (or from the walk's start if outside it)
+    name: str
+    size: int
+    mtime: float
+
+
+class VaultWalker:
+    """
+    Shared os.scandir walker for every vault traversal
+
+    Ignored directories are pruned rather than filtered, so nothing below
+    .obsidian/.trash/.git (or a user-excluded folder) is ever listed.
+    Symlinked directories are followed once each; a link back to a folder
+    already on the walk is skipped. Directory listings are cached and
+    reused while the directory's mtime is unchanged, and each file is
+    stat'ed once per walk with the result carried on its WalkEntry.
+    """
+
+    def __init__(self, root: str, ignore: Optional[IgnoreRules] = None, follow_symlinks: bool = True):
+        """
+        Initialize walker
+
+        Args:
+            root: Directory ignore patterns are relative to
+            ignore: Ignore rules (default: DEFAULT_IGNORE_PATTERNS)
+            follow_symlinks: Descend into symlinked directories
+        """
+        self.root = Path(root)
+        self.ignore = ignore or IgnoreRules()
+        self.follow_symlinks = follow_symlinks
+
+        self._lock = threading.Lock()
+        # Directory path -> (st_mtime_ns, [(name, is_dir, is_file)])
+        self._listings: Dict[str, Tuple[int, List[Tuple[str, bool, bool]]]] = {}
+
+    def walk(
+        self,
+        directory: Optional[str] = None,
+        pattern: str = '**/*.md'
+    ) -> Iterator[WalkEntry]:
+        """
+        Yield files under a directory matching a glob, in no particular order
+
+        Blocking - run it off the event loop.
+
+        Args:
+            directory: Where to start (default: the root)
+            pattern: Glob relative to directory; '*.md' lists one folder,
+                '**/*.md' the whole tree
+
+        Yields:
+            WalkEntry for each matching, non-ignored file
+        """
+        start = Path(directory) if directory else self.root
+        try:
+            base = start.resolve().relative_to(self.root.resolve()).as_posix()
+            if base == '.':
+                base = ''
+        except (ValueError, OSError):
+            base = None  # Outside the root: patterns apply relative to start
+
+        if base and self.ignore.is_ignored(base, is_dir=True):
+            return
+
+        recursive = '**' in pattern or '/' in pattern
+        regex = _translate(pattern)
+        match_name = '/' not in pattern.replace('**/', '')
+
+        visited = set()
+        stack = [(str(start), '')]
+        while stack:
+            dir_path, relative_dir = stack.pop()
+
+            try:
+                stat = os.stat(dir_path)
+            except OSError as e:
+                logger.warning(f"Error listing {dir_path}: {e}")
+                continue
+            if (stat.st_dev, stat.st_ino) in visited:
+                logger.debug(f"Skipping symlink loop at {dir_path}")
+                continue
+            visited.add((stat.st_dev, stat.st_ino))
+
+            for name, is_dir, is_file in self._list(dir_path, stat.st_mtime_ns):
+                relative = f"{relative_dir}/{name}" if relative_dir else name
+                rooted = relative if base is None else (f"{base}/{relative}" if base else relative)
+                if self.ignore.matches(rooted, is_dir):
+                    continue
+
+                entry_path = os.path.join(dir_path, name)
+                if is_dir:
+                    if recursive:
+                        stack.append((entry_path, relative))
+                    continue
+                if not is_file or not regex.fullmatch(name if match_name else relative):
+                    continue
+
+                try:
+                    file_stat = os.stat(entry_path)
+                except OSError as e:
+                    logger.warning(f"Error reading {entry_path}: {e}")
+                    continue
+                yield WalkEntry(
+                    path=entry_path,
+                    relative=rooted,
+                    name=name,
+                    size=file_stat.st_size,
+                    mtime=file_stat.st_mtime
+                )
+
+    def _list(self, dir_path: str, mtime_ns: int) -> List[Tuple[str, bool, bool]]:
+        """A directory's (name, is_dir, is_file) entries, cached by directory mtime"""
+        with self._lock:
+            cached = self._listings.get(dir_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        listing = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=self.follow_symlinks)
+                        is_file = not is_dir and entry.is_file()
+                    except OSError:
+                        continue
+                    listing.append((entry.name, is_dir, is_file))
+        except OSError as e:
+            logger.warning(f"Error listing {dir_path}: {e}")
+            return []
+
+        with self._lock:
+            self._listings[dir_path] = (mtime_ns, listing)
+        return listing
+
+    def clear_cache(self):
+        """Forget cached directory listings"""
+        with self._lock:
+            self._listings.clear()
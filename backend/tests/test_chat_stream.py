@@ -0,0 +1,77 @@
+import asyncio
+import sqlite3
+import unittest
+from unittest import mock
+
+from routers import chat
+
+
+class ConnectedClient:
+    """Stand-in for a Request whose client never disconnects."""
+
+    async def receive(self):
+        await asyncio.Event().wait()
+
+
+class StreamUntilDisconnectTest(unittest.IsolatedAsyncioTestCase):
+    """A failing generation ends the relayed stream instead of leaving it open."""
+
+    async def relay(self, chunks, heartbeat=0.01):
+        events = []
+        async for event in chat._stream_until_disconnect(ConnectedClient(), chunks, heartbeat=heartbeat):
+            if event is not None:
+                events.append(event)
+        return events
+
+    async def test_chunks_are_relayed_in_order(self):
+        async def generation():
+            for i in range(3):
+                yield {'type': 'token', 'content': str(i)}
+
+        events = await asyncio.wait_for(self.relay(generation()), 1)
+        self.assertEqual([e['content'] for e in events], ['0', '1', '2'])
+
+    async def test_raising_stream_ends_with_an_error_event(self):
+        closed = []
+
+        async def generation():
+            try:
+                yield {'type': 'token', 'content': 'partial'}
+                raise RuntimeError('model went away')
+            finally:
+                closed.append(True)
+
+        events = await asyncio.wait_for(self.relay(generation()), 1)
+        self.assertEqual(events, [
+            {'type': 'token', 'content': 'partial'},
+            {'type': 'error', 'message': 'model went away'}
+        ])
+        self.assertEqual(closed, [True])
+
+    async def test_failed_save_ends_with_an_error_event(self):
+        async def generation():
+            yield {'type': 'token', 'content': 'hello'}
+            yield {'type': 'done'}
+
+        messages = [{'role': 'user', 'content': 'hi'}]
+        failing = mock.AsyncMock(side_effect=sqlite3.OperationalError('database is locked'))
+        with mock.patch.object(chat.session_store, 'append', failing):
+            events = await asyncio.wait_for(
+                self.relay(chat._recorded('session', messages, generation())), 1
+            )
+
+        failing.assert_awaited_once()
+        self.assertEqual(events[0], {'type': 'token', 'content': 'hello'})
+        self.assertEqual(events[-1], {'type': 'error', 'message': 'database is locked'})
+
+    async def test_scheduler_saturation_is_reraised(self):
+        async def generation():
+            raise chat.SchedulerSaturated('interactive', 5)
+            yield
+
+        with self.assertRaises(chat.SchedulerSaturated):
+            await asyncio.wait_for(self.relay(generation()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
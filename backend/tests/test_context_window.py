@@ -0,0 +1,134 @@
+import asyncio
+import unittest
+
+from services.context_window import ContextWindow, RollingSummary, message_tokens
+
+
+def conversation(turns):
+    """Alternating user/assistant messages of about 25 tokens each."""
+    return [
+        {'role': 'user' if i % 2 == 0 else 'assistant', 'content': f"{i:03d} " + 'x' * 92}
+        for i in range(turns)
+    ]
+
+
+class ContextWindowTest(unittest.IsolatedAsyncioTestCase):
+    """Prompts stay within budget while older turns are folded in the background."""
+
+    async def asyncSetUp(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+        async def summarize(messages):
+            self.calls.append(messages)
+            await self.release.wait()
+            return {'success': True, 'content': f"summary {len(self.calls)}", 'error': None}
+
+        self.window = ContextWindow(summarize=summarize, budget=200)
+
+    def tokens(self, messages):
+        return sum(message_tokens(m) for m in messages)
+
+    async def test_short_conversations_are_sent_whole(self):
+        messages = conversation(3)
+        sent, summary = self.window.prepare(messages, summary=RollingSummary(), key='k')
+        self.assertEqual(sent, messages)
+        self.assertIsNone(summary)
+        self.assertEqual(self.calls, [])
+
+    async def test_pending_fold_keeps_recent_turns_within_budget(self):
+        messages = conversation(20)
+        summary = RollingSummary()
+        sent, text = self.window.prepare(messages, summary=summary, key='k')
+        await asyncio.sleep(0)
+
+        # The fold is still running: send the newest turns that fit, not fewer
+        self.assertEqual(len(self.calls), 1)
+        self.assertIsNone(text)
+        self.assertEqual(sent, messages[-len(sent):])
+        self.assertLessEqual(self.tokens(sent), 200)
+        self.assertGreater(self.tokens(sent) + self.tokens(messages[-len(sent) - 2:-len(sent)]), 200)
+        self.assertEqual(sent[0]['role'], 'user')
+
+        # A later turn during the same fold does not start another
+        messages += conversation(22)[20:]
+        again, _ = self.window.prepare(messages, summary=summary, key='k')
+        await asyncio.sleep(0)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(again, messages[-len(again):])
+        self.assertLessEqual(self.tokens(again), 200)
+
+        self.release.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(summary.text, 'summary 1')
+        self.assertGreaterEqual(summary.covered, len(messages) - len(sent))
+        self.assertEqual(self.window.metrics()['folding'], 0)
+
+    async def test_finished_summary_replaces_the_turns_it_covers(self):
+        messages = conversation(20)
+        summary = RollingSummary(text='earlier', covered=10)
+        sent, text = self.window.prepare(messages, summary=summary)
+
+        self.assertEqual(text, 'earlier')
+        self.assertEqual(sent, messages[10:][-len(sent):])
+        self.assertNotIn(messages[9], sent)
+
+    async def test_on_summary_receives_the_fold(self):
+        saved = []
+
+        async def on_summary(summary):
+            saved.append((summary.text, summary.covered))
+
+        self.release.set()
+        self.window.prepare(conversation(20), summary=RollingSummary(), start=5, key='k', on_summary=on_summary)
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(saved), 1)
+        self.assertGreater(saved[0][1], 5)
+
+    async def test_forget_cancels_the_pending_fold(self):
+        saved = []
+
+        async def on_summary(summary):
+            saved.append(summary.text)
+
+        old = RollingSummary()
+        self.window.prepare(conversation(20), summary=old, key='k', on_summary=on_summary)
+        await asyncio.sleep(0)
+        self.window.forget('k')
+        self.assertEqual(self.window.metrics()['folding'], 0)
+
+        # The reset conversation folds again right away
+        new = RollingSummary()
+        self.window.prepare(conversation(20), summary=new, key='k', on_summary=on_summary)
+        await asyncio.sleep(0)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.window.metrics()['folding'], 1)
+
+        self.release.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(old.text, '')
+        self.assertEqual(new.text, 'summary 2')
+        self.assertEqual(saved, ['summary 2'])
+
+    async def test_forget_without_a_fold(self):
+        self.window.forget('unknown')
+
+    async def test_failed_fold_is_retried_on_the_next_turn(self):
+        async def failing(messages):
+            return {'success': False, 'content': '', 'error': 'model offline'}
+
+        window = ContextWindow(summarize=failing, budget=200)
+        summary = RollingSummary()
+        messages = conversation(20)
+        window.prepare(messages, summary=summary, key='k')
+        await asyncio.sleep(0.01)
+        self.assertEqual(summary.text, '')
+        self.assertEqual(window.metrics()['fold_failures'], 1)
+
+        sent, _ = window.prepare(messages, summary=summary, key='k')
+        self.assertLessEqual(self.tokens(sent), 200)
+        self.assertEqual(window.metrics()['folding'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import asyncio
+import unittest
+
+from services.llm_scheduler import LLMScheduler, SchedulerSaturated
+
+
+class LLMSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    """Slots go to waiting generations by priority, then round robin per user."""
+
+    async def asyncSetUp(self):
+        self.scheduler = LLMScheduler(max_concurrency=1, max_queue=8)
+        self.running = self.scheduler.submit('interactive', 'holder')
+
+    def queue(self, *requests):
+        """Submit (priority, user, label) requests behind the running one."""
+        return [(label, self.scheduler.submit(priority, user)) for priority, user, label in requests]
+
+    def drain(self, queued):
+        """Release one generation at a time, returning labels in the order they ran."""
+        order = []
+        current = self.running
+        while True:
+            current.release()
+            started = [(label, a) for label, a in queued if a.granted and label not in order]
+            if not started:
+                return order
+            self.assertEqual(len(started), 1)
+            label, current = started[0]
+            order.append(label)
+
+    async def test_free_slot_is_granted_immediately(self):
+        self.assertTrue(self.running.granted)
+        await asyncio.wait_for(self.running.wait(), 0.1)
+        self.assertEqual(self.scheduler.metrics()['running'], 1)
+
+    async def test_priorities_run_in_order(self):
+        queued = self.queue(
+            ('background', 'u', 'summary'),
+            ('telegram', 'u', 'telegram'),
+            ('interactive', 'u', 'chat'),
+        )
+        self.assertEqual(self.drain(queued), ['chat', 'telegram', 'summary'])
+
+    async def test_users_take_turns_within_a_priority(self):
+        queued = self.queue(
+            ('interactive', 'alice', 'a1'),
+            ('interactive', 'alice', 'a2'),
+            ('interactive', 'alice', 'a3'),
+            ('interactive', 'bob', 'b1'),
+            ('interactive', 'carol', 'c1'),
+            ('interactive', 'bob', 'b2'),
+        )
+        self.assertEqual(self.drain(queued), ['a1', 'b1', 'c1', 'a2', 'b2', 'a3'])
+
+    async def test_interleaved_users_and_priorities(self):
+        queued = self.queue(
+            ('background', 'alice', 'bg-a'),
+            ('interactive', 'alice', 'a1'),
+            ('telegram', 'bob', 'tg-b'),
+            ('interactive', 'alice', 'a2'),
+            ('interactive', 'bob', 'b1'),
+        )
+        self.assertEqual(self.drain(queued), ['a1', 'b1', 'a2', 'tg-b', 'bg-a'])
+
+    async def test_new_requests_queue_behind_waiting_ones(self):
+        # A slot freeing up while others wait goes to the queue, not a newcomer
+        first = self.scheduler.submit('interactive', 'alice')
+        self.running.release()
+        self.assertTrue(first.granted)
+        late = self.scheduler.submit('interactive', 'bob')
+        self.assertFalse(late.granted)
+
+    async def test_full_queue_is_rejected_with_retry_after(self):
+        self.queue(*[('interactive', f'u{i}', i) for i in range(8)])
+        with self.assertRaises(SchedulerSaturated) as caught:
+            self.scheduler.submit('interactive', 'late')
+        self.assertEqual(caught.exception.priority, 'interactive')
+        self.assertEqual(caught.exception.retry_after, self.scheduler.retry_after())
+        self.assertGreaterEqual(caught.exception.retry_after, 1)
+        self.assertEqual(self.scheduler.metrics()['priorities']['interactive']['rejected'], 1)
+        self.assertEqual(self.scheduler.metrics()['queued'], 8)
+
+    async def test_background_may_only_fill_half_the_queue(self):
+        self.queue(*[('background', 'summaries', i) for i in range(4)])
+        with self.assertRaises(SchedulerSaturated):
+            self.scheduler.check('background', 'summaries')
+        with self.assertRaises(SchedulerSaturated):
+            self.scheduler.submit('background', 'other')
+
+        # Interactive and Telegram requests still get the other half
+        self.queue(*[('interactive', 'chat', i) for i in range(3)], ('telegram', 'bot', 't'))
+        with self.assertRaises(SchedulerSaturated):
+            self.scheduler.check('interactive', 'chat')
+
+    async def test_check_passes_while_a_slot_is_free(self):
+        self.running.release()
+        self.scheduler.check('background', 'summaries')
+
+    async def test_retry_after_grows_with_the_queue(self):
+        self.scheduler._avg_hold = 4.0
+        self.assertEqual(self.scheduler.retry_after(), 4)
+        self.queue(*[('interactive', 'u', i) for i in range(3)])
+        self.assertEqual(self.scheduler.retry_after(), 16)
+
+    async def test_unknown_priority(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.submit('urgent', 'u')
+
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        waiting = self.scheduler.submit('interactive', 'alice')
+        behind = self.scheduler.submit('interactive', 'bob')
+        task = asyncio.create_task(waiting.wait())
+        await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertEqual(self.scheduler.metrics()['queued'], 1)
+        self.running.release()
+        self.assertFalse(waiting.granted)
+        self.assertTrue(behind.granted)
+
+    async def test_release_is_idempotent(self):
+        queued = self.scheduler.submit('interactive', 'alice')
+        self.running.release()
+        self.running.release()
+        self.assertTrue(queued.granted)
+        self.assertEqual(self.scheduler.metrics()['running'], 1)
+
+    async def test_waiters_resume_when_granted(self):
+        async def generate(admission, label, log):
+            async with admission:
+                log.append(label)
+                await asyncio.sleep(0)
+
+        log = []
+        self.running.release()
+        tasks = [
+            asyncio.create_task(generate(self.scheduler.submit('background', 'u'), 'bg', log)),
+            asyncio.create_task(generate(self.scheduler.submit('background', 'u'), 'bg2', log)),
+            asyncio.create_task(generate(self.scheduler.submit('interactive', 'u'), 'chat', log)),
+        ]
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+        self.assertEqual(log, ['bg', 'chat', 'bg2'])
+        self.assertEqual(self.scheduler.metrics()['running'], 0)
+        self.assertEqual(self.scheduler.metrics()['priorities']['background']['admitted'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+
+from benchmarks.bench_llm_streams import StandInOllama
+from services.llm_scheduler import LLMScheduler
+from services.llm_service import LLMService
+
+
+class LLMStreamsTest(unittest.IsolatedAsyncioTestCase):
+    """Streams from a stand-in Ollama run side by side and stop when abandoned."""
+
+    TOKENS = 10
+
+    async def asyncSetUp(self):
+        self.server = StandInOllama(self.TOKENS, 0.01)
+        host = await self.server.start()
+        self.llm = LLMService(model='stand-in', host=host, scheduler=LLMScheduler(max_concurrency=4))
+
+    async def asyncTearDown(self):
+        await self.llm.close()
+        await self.server.stop()
+
+    async def wait_for_disconnect(self, before):
+        for _ in range(100):
+            if self.server.disconnects > before:
+                return
+            await asyncio.sleep(0.01)
+
+    async def test_concurrent_streams_interleave(self):
+        arrivals = []
+
+        async def consume(stream_id):
+            async for chunk in self.llm.generate_response([{'role': 'user', 'content': 'hi'}]):
+                self.assertFalse(chunk.startswith('Error'), chunk)
+                arrivals.append(stream_id)
+
+        await asyncio.wait_for(asyncio.gather(consume('a'), consume('b')), 5)
+
+        self.assertEqual(arrivals.count('a'), self.TOKENS)
+        self.assertEqual(arrivals.count('b'), self.TOKENS)
+        # Back to back there would be a single switch from one stream to the other
+        switches = sum(1 for x, y in zip(arrivals, arrivals[1:]) if x != y)
+        self.assertGreater(switches, self.TOKENS // 2)
+        self.assertEqual(self.llm.metrics()['completed'], 2)
+
+    async def test_cancelled_stream_disconnects_and_is_counted(self):
+        started = asyncio.Event()
+
+        async def consume():
+            async for _ in self.llm.generate_response([{'role': 'user', 'content': 'hi'}]):
+                started.set()
+
+        # What the chat router does when the client goes away mid-reply
+        task = asyncio.create_task(consume())
+        await asyncio.wait_for(started.wait(), 5)
+        before = self.server.disconnects
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        await self.wait_for_disconnect(before)
+        self.assertGreater(self.server.disconnects, before)
+        metrics = self.llm.metrics()
+        self.assertEqual(metrics['cancelled'], 1)
+        self.assertEqual(metrics['completed'], 0)
+        self.assertEqual(self.llm.scheduler.metrics()['running'], 0)
+
+    async def test_closed_stream_disconnects(self):
+        stream = self.llm.generate_response([{'role': 'user', 'content': 'hi'}])
+        for _ in range(3):
+            await asyncio.wait_for(stream.__anext__(), 5)
+        before = self.server.disconnects
+        await stream.aclose()
+
+        await self.wait_for_disconnect(before)
+        self.assertGreater(self.server.disconnects, before)
+        self.assertEqual(self.llm.metrics()['cancelled'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from services.obsidian.manifest import VaultManifest
+from services.obsidian.watcher import VaultChange
+
+
+class VaultManifestTest(unittest.TestCase):
+    """Listings come from memory; content hashes are computed only on demand."""
+
+    def setUp(self):
+        self.vault = tempfile.TemporaryDirectory()
+        self.write('b.md', 'beta')
+        self.write('Projects/a.md', 'alpha')
+        self.manifest = VaultManifest(self.vault.name)
+        self.manifest.build()
+
+    def tearDown(self):
+        self.vault.cleanup()
+
+    def write(self, name, text, mtime=None):
+        path = Path(self.vault.name, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_listing_and_recent(self):
+        self.write('c.md', 'gamma', mtime=2_000_000_000)
+        self.manifest.apply_changes([VaultChange('created', 'c.md')])
+        self.assertEqual([e.path for e in self.manifest.notes()], ['Projects/a.md', 'b.md', 'c.md'])
+        self.assertEqual(self.manifest.recent(1)[0].path, 'c.md')
+        notes, total, more = self.manifest.page('Projects')
+        self.assertEqual(([e.path for e in notes], total, more), (['Projects/a.md'], 1, False))
+
+    def test_hashes_are_not_computed_by_listing(self):
+        self.assertTrue(all(e.content_hash is None for e in self.manifest.notes()))
+
+    def test_content_hash_is_computed_once(self):
+        expected = hashlib.sha1(b'beta').hexdigest()
+        self.assertEqual(self.manifest.content_hash('b.md'), expected)
+        with mock.patch.object(Path, 'read_bytes', side_effect=AssertionError('re-read')):
+            self.assertEqual(self.manifest.content_hash('b.md'), expected)
+        self.assertIsNone(self.manifest.content_hash('missing.md'))
+
+    def test_changed_note_is_hashed_again(self):
+        self.manifest.content_hash('b.md')
+        self.write('b.md', 'beta, edited', mtime=2_000_000_000)
+        self.manifest.apply_changes([VaultChange('modified', 'b.md')])
+        self.assertIsNone(self.manifest.get('b.md').content_hash)
+        self.assertEqual(self.manifest.content_hash('b.md'), hashlib.sha1(b'beta, edited').hexdigest())
+
+    def test_rebuild_keeps_hashes_of_unchanged_notes(self):
+        first = self.manifest.content_hash('b.md')
+        self.manifest.build()
+        self.assertEqual(self.manifest.get('b.md').content_hash, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
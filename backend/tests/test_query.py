@@ -0,0 +1,139 @@
+import sqlite3
+import unittest
+
+from services.obsidian.query import (
+    And, Field, Not, Or, Phrase, QuerySyntaxError, Term, compile_query, parse_query
+)
+
+
+class ParseQueryTest(unittest.TestCase):
+    """Queries parse into the expected tree, and malformed ones are rejected."""
+
+    def test_empty_query(self):
+        self.assertIsNone(parse_query(''))
+        self.assertIsNone(parse_query('   '))
+
+    def test_adjacent_terms_are_anded(self):
+        self.assertEqual(parse_query('foo bar'), And([Term('foo'), Term('bar')]))
+        self.assertEqual(parse_query('foo AND bar'), And([Term('foo'), Term('bar')]))
+
+    def test_or_binds_looser_than_and(self):
+        self.assertEqual(
+            parse_query('a b OR c'),
+            Or([And([Term('a'), Term('b')]), Term('c')])
+        )
+
+    def test_parentheses_and_not(self):
+        self.assertEqual(
+            parse_query('(a OR b) NOT c'),
+            And([Or([Term('a'), Term('b')]), Not(Term('c'))])
+        )
+
+    def test_phrases_and_punctuated_words(self):
+        self.assertEqual(parse_query('"hello world"'), Phrase('hello world'))
+        self.assertEqual(parse_query('e-mail'), Phrase('e mail'))
+
+    def test_fields(self):
+        self.assertEqual(parse_query('tag:japanese'), Field('tag', '=', 'japanese'))
+        self.assertEqual(parse_query('folder:"My Projects"'), Field('folder', '=', 'My Projects'))
+        self.assertEqual(parse_query('modified:>=2025-01-01'), Field('modified', '>=', '2025-01-01'))
+
+    def test_unknown_field_is_text(self):
+        self.assertEqual(parse_query('foo:bar'), Phrase('foo bar'))
+
+    def test_lowercase_operators_are_words(self):
+        self.assertEqual(parse_query('cats or dogs'), And([Term('cats'), Term('or'), Term('dogs')]))
+
+    def test_dangling_operators(self):
+        for query in ('a OR', 'OR a', 'a OR OR b', '(a OR)', 'a AND', 'AND a', 'a AND AND b', 'NOT', 'a NOT'):
+            with self.subTest(query=query):
+                with self.assertRaises(QuerySyntaxError):
+                    parse_query(query)
+
+    def test_unclosed_quote(self):
+        for query in ('"foo', 'bar "foo baz', 'tag:"foo'):
+            with self.subTest(query=query):
+                with self.assertRaises(QuerySyntaxError):
+                    parse_query(query)
+
+    def test_unbalanced_parentheses(self):
+        for query in ('(a b', 'a b)', ')'):
+            with self.subTest(query=query):
+                with self.assertRaises(QuerySyntaxError):
+                    parse_query(query)
+
+
+class CompileQueryTest(unittest.TestCase):
+    """Parsed queries compile into FTS5 expressions and SQL predicates."""
+
+    def compile(self, query, expand=None):
+        return compile_query(parse_query(query), expand)
+
+    def test_pure_text_is_one_match_expression(self):
+        compiled = self.compile('foo "bar baz"')
+        self.assertEqual(compiled.match, '(("foo"*) AND "bar baz")')
+        self.assertIsNone(compiled.where)
+        self.assertEqual(compiled.highlight, [['foo'], ['bar baz']])
+
+    def test_text_or(self):
+        self.assertEqual(self.compile('foo OR bar').match, '(("foo"*) OR ("bar"*))')
+
+    def test_not_hangs_off_positive_terms(self):
+        compiled = self.compile('foo NOT bar')
+        self.assertEqual(compiled.match, '((("foo"*)) NOT ("bar"*))')
+        self.assertEqual(compiled.highlight, [['foo']])
+
+    def test_tag_is_a_column_filter(self):
+        self.assertEqual(self.compile('tag:#Japanese').match, 'tags : "japanese"')
+
+    def test_fields_become_sql(self):
+        compiled = self.compile('folder:Projects_2 type:Goal foo')
+        self.assertEqual(
+            compiled.where,
+            "(files.path LIKE ? ESCAPE '\\') AND (lower(files.note_type) = ?) AND "
+            "files.id IN (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ?)"
+        )
+        self.assertEqual(compiled.params, ['Projects\\_2/%', 'goal', '(("foo"*))'])
+        self.assertEqual(compiled.rank_match, '("foo"*)')
+
+    def test_modified_bounds(self):
+        day = self.compile('modified:2025-01-01')
+        after = self.compile('modified:>2025-01-01')
+        self.assertEqual(day.where, "files.mtime >= ? AND files.mtime < ?")
+        self.assertEqual(after.where, "files.mtime >= ?")
+        self.assertEqual(after.params, [day.params[1]])
+
+    def test_invalid_date(self):
+        with self.assertRaises(QuerySyntaxError):
+            self.compile('modified:yesterday')
+
+    def test_expand_adds_similar_terms(self):
+        compiled = self.compile('colour', expand=lambda word: ['colour', 'color'])
+        self.assertEqual(compiled.match, '("colour"* OR "color")')
+        self.assertEqual(compiled.highlight, [['colour', 'color']])
+
+    def test_expressions_run_against_fts5(self):
+        conn = sqlite3.connect(':memory:')
+        conn.execute("CREATE VIRTUAL TABLE notes_fts USING fts5(title, tags, body)")
+        conn.executemany("INSERT INTO notes_fts (rowid, title, tags, body) VALUES (?, ?, ?, ?)", [
+            (1, 'Trip', 'japanese travel', 'Kyoto temples and ramen'),
+            (2, 'Groceries', 'home', 'eggs, ramen, coffee'),
+        ])
+
+        def matches(query):
+            compiled = self.compile(query)
+            rows = conn.execute(
+                "SELECT rowid FROM notes_fts WHERE notes_fts MATCH ? ORDER BY rowid",
+                (compiled.match,)
+            )
+            return [row[0] for row in rows]
+
+        self.assertEqual(matches('ramen'), [1, 2])
+        self.assertEqual(matches('ramen NOT coffee'), [1])
+        self.assertEqual(matches('tag:japanese OR eggs'), [1, 2])
+        self.assertEqual(matches('"temples and ramen"'), [1])
+        self.assertEqual(matches('kyo'), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
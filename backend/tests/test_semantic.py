@@ -0,0 +1,184 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from services.obsidian.semantic import HashingEmbedder, SemanticIndex, chunk_note
+from services.obsidian.watcher import VaultChange
+
+try:
+    import chromadb  # noqa: F401
+    HAS_CHROMADB = True
+except ImportError:
+    HAS_CHROMADB = False
+
+
+class ChunkNoteTest(unittest.TestCase):
+    """Notes are split into one chunk per heading section."""
+
+    def test_one_chunk_per_heading(self):
+        chunks = chunk_note("Intro line\n# First\nalpha\n\n## Second\nbeta\ngamma\n")
+        self.assertEqual(
+            [(c['heading'], c['line_number']) for c in chunks],
+            [('', 1), ('First', 2), ('Second', 5)]
+        )
+        self.assertEqual(chunks[2]['text'], "## Second\nbeta\ngamma")
+
+    def test_frontmatter_is_skipped(self):
+        chunks = chunk_note("---\ntags: [a]\n---\n# Title\nbody\n")
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0]['heading'], 'Title')
+        self.assertEqual(chunks[0]['line_number'], 4)
+        self.assertNotIn('tags', chunks[0]['text'])
+
+    def test_empty_sections_are_dropped(self):
+        self.assertEqual([c['heading'] for c in chunk_note("\n\n# A\nx\n")], ['A'])
+        self.assertEqual(chunk_note(""), [])
+
+    def test_long_sections_are_split(self):
+        chunks = chunk_note("# Long\n" + "x" * 45, max_chars=20)
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(all(len(c['text']) <= 20 for c in chunks))
+        self.assertTrue(all(c['heading'] == 'Long' for c in chunks))
+
+
+class CountingEmbedder(HashingEmbedder):
+    """HashingEmbedder that remembers what it was asked to embed."""
+
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.texts = []
+
+    def embed(self, texts):
+        self.texts.extend(texts)
+        return super().embed(texts)
+
+
+@unittest.skipUnless(HAS_CHROMADB, "chromadb not installed")
+class SemanticIndexTest(unittest.TestCase):
+    """Chunks are embedded once per content change and dropped with their note."""
+
+    def setUp(self):
+        self.vault = tempfile.TemporaryDirectory()
+        self.store = tempfile.TemporaryDirectory()
+        self.write('travel.md', "# Kyoto\ntemples and gardens\n# Food\nramen and tea\n")
+        self.write('home.md', "# Chores\nlaundry and dishes\n")
+        self.embedder = CountingEmbedder()
+        self.index = SemanticIndex(self.vault.name, persist_dir=self.store.name, embedder=self.embedder)
+
+    def tearDown(self):
+        self.vault.cleanup()
+        self.store.cleanup()
+
+    def write(self, name, text):
+        Path(self.vault.name, name).write_text(text, encoding='utf-8')
+
+    def chunks(self, path):
+        return self.index._collection.get(where={'path': path}, include=['metadatas'])['metadatas']
+
+    def test_sync_embeds_each_heading(self):
+        self.assertEqual(self.index.sync(), {'embedded': 2, 'removed': 0, 'total': 2})
+        self.assertTrue(self.index.synced)
+        self.assertEqual(sorted(c['heading'] for c in self.chunks('travel.md')), ['Food', 'Kyoto'])
+        self.assertEqual(len(self.embedder.texts), 3)
+
+    def test_unchanged_notes_are_not_embedded_again(self):
+        self.index.sync()
+        self.embedder.texts.clear()
+
+        self.assertEqual(self.index.sync()['embedded'], 0)
+        self.index.apply_changes([VaultChange('modified', 'home.md')])
+        self.assertEqual(self.embedder.texts, [])
+
+        self.write('home.md', "# Chores\nlaundry\n# Garden\nweeding\n")
+        self.index.apply_changes([VaultChange('modified', 'home.md')])
+        self.assertEqual(len(self.embedder.texts), 2)
+        self.assertEqual(sorted(c['heading'] for c in self.chunks('home.md')), ['Chores', 'Garden'])
+
+    def test_deleted_note_loses_its_chunks(self):
+        self.index.sync()
+        os.remove(Path(self.vault.name, 'travel.md'))
+        self.index.apply_changes([VaultChange('deleted', 'travel.md')])
+        self.assertEqual(self.chunks('travel.md'), [])
+        self.assertEqual(len(self.chunks('home.md')), 1)
+
+    def test_sync_removes_notes_gone_from_disk(self):
+        self.index.sync()
+        os.remove(Path(self.vault.name, 'home.md'))
+        self.assertEqual(self.index.sync()['removed'], 1)
+        self.assertEqual(self.chunks('home.md'), [])
+
+    def test_search_ranks_matching_note_first(self):
+        self.index.sync()
+        results = self.index.search('ramen and tea', limit=2)
+        self.assertEqual(results[0]['file'], 'travel.md')
+        self.assertEqual(results[0]['line_number'], 3)
+
+
+class BlockingSemanticIndex:
+    """Semantic index whose updates wait until released."""
+
+    synced = True
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.batches = []
+
+    def apply_changes(self, changes):
+        self.release.wait(5)
+        self.batches.append([(c.kind, c.path) for c in changes])
+
+
+class SemanticUpdateTest(unittest.IsolatedAsyncioTestCase):
+    """Embedding runs behind the watcher dispatch instead of holding it up."""
+
+    async def asyncSetUp(self):
+        from services.obsidian import ObsidianService
+
+        self.vault = tempfile.TemporaryDirectory()
+        self.index_dir = tempfile.TemporaryDirectory()
+        with mock.patch.dict(os.environ, {'OBSIDIAN_INDEX_DIR': self.index_dir.name}):
+            self.service = ObsidianService(vault_path=self.vault.name)
+        self.service.semantic_index = BlockingSemanticIndex()
+
+    async def asyncTearDown(self):
+        self.service.semantic_index.release.set()
+        if self.service._semantic_update_task:
+            await self.service._semantic_update_task
+        self.service.close()
+        self.vault.cleanup()
+        self.index_dir.cleanup()
+
+    async def test_changes_are_published_while_embedding_runs(self):
+        seq = self.service.change_log.latest_seq
+        await asyncio.wait_for(
+            self.service._apply_vault_changes([VaultChange('created', 'a.md')]), 1
+        )
+        await asyncio.wait_for(
+            self.service._apply_vault_changes([VaultChange('modified', 'b.md')]), 1
+        )
+        self.assertEqual(self.service.change_log.latest_seq, seq + 2)
+
+    async def test_queued_changes_are_coalesced(self):
+        index = self.service.semantic_index
+        await self.service._apply_vault_changes([VaultChange('created', 'a.md')])
+        await asyncio.sleep(0.01)
+
+        # The first batch is embedding; these wait and merge per path
+        for change in (VaultChange('modified', 'b.md'), VaultChange('modified', 'a.md'),
+                       VaultChange('deleted', 'b.md')):
+            await self.service._apply_vault_changes([change])
+
+        index.release.set()
+        await asyncio.wait_for(self.service._semantic_update_task, 5)
+        self.assertEqual(index.batches, [
+            [('created', 'a.md')],
+            [('modified', 'a.md'), ('deleted', 'b.md')]
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import tempfile
+import unittest
+
+from services.obsidian.changes import ChangeLog
+from services.obsidian.watcher import VaultWatcher
+
+
+class WatcherOrderingTest(unittest.IsolatedAsyncioTestCase):
+    """Batches reach listeners, and the change log, in the order they happened."""
+
+    async def asyncSetUp(self):
+        self.vault = tempfile.TemporaryDirectory()
+        self.watcher = VaultWatcher(self.vault.name)
+        self.watcher.DEBOUNCE_SECONDS = 0.01
+        self.change_log = ChangeLog()
+        self.delivered = []
+
+        async def slow_listener(changes):
+            # The first batch takes far longer than the debounce, like a rescan
+            await asyncio.sleep(0.2 if not self.delivered else 0)
+            self.delivered.append([(c.kind, c.path) for c in changes])
+            self.change_log.record(changes)
+
+        self.watcher.add_listener(slow_listener)
+
+    async def asyncTearDown(self):
+        await self.watcher.stop()
+        self.vault.cleanup()
+
+    async def _settle(self):
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if not self.watcher._pending and not self.watcher._dispatch_lock.locked():
+                return
+
+    async def test_quick_batches_are_delivered_in_order(self):
+        self.watcher.notify('note.md', 'created')
+        await asyncio.sleep(0.05)  # First batch flushed and still in its listener
+        self.watcher.notify('note.md', 'deleted')
+        await self._settle()
+
+        self.assertEqual(self.delivered, [[('created', 'note.md')], [('deleted', 'note.md')]])
+
+        events, reset = self.change_log.since(self.change_log.latest_seq - 2)
+        self.assertFalse(reset)
+        self.assertEqual([e.kind for e in events], ['create', 'delete'])
+        self.assertLess(events[0].seq, events[1].seq)
+
+    async def test_batches_are_not_dispatched_concurrently(self):
+        running = 0
+        overlapped = False
+
+        async def listener(changes):
+            nonlocal running, overlapped
+            running += 1
+            overlapped = overlapped or running > 1
+            await asyncio.sleep(0.05)
+            running -= 1
+
+        self.watcher.add_listener(listener)
+        for i in range(3):
+            self.watcher.notify(f'note-{i}.md', 'modified')
+            await asyncio.sleep(0.03)
+        await self._settle()
+
+        self.assertFalse(overlapped)
+        self.assertEqual(len(self.delivered), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,8 @@ interface VaultFile {
 
 export function ChatInterface() {
   const [messages, setMessages] = useState<Message[]>([]);
+  // The server keeps the history; only the new message is sent each turn
+  const [sessionId, setSessionId] = useState<string | null>(null);
   const [input, setInput] = useState('');
   const [loading, setLoading] = useState(false);
   const [sidebarOpen, setSidebarOpen] = useState(false);
@@ -45,15 +47,63 @@ This is your markdown viewer. Content from your Obsidian vault will appear here.
 Try typing a message in the chat to get started!
 `);
 
-  // Fetch file list on mount
+  // Fetch file list on mount, then keep it in sync from the change stream
   useEffect(() => {
-    fetchFiles();
+    let events: EventSource | null = null;
+    let cancelled = false;
+
+    const toVaultFile = (path: string): VaultFile => {
+      const slash = path.lastIndexOf('/');
+      return { path, name: path.slice(slash + 1), folder: slash === -1 ? '' : path.slice(0, slash) };
+    };
+
+    const subscribe = async () => {
+      // Take the sequence before listing so no change falls in between
+      const { data } = await axios.get('http://localhost:8000/vault/changes');
+      await fetchFiles();
+      if (cancelled) return;
+
+      events = new EventSource(`http://localhost:8000/vault/changes/stream?since=${data.latest_seq}`);
+      events.addEventListener('reset', () => fetchFiles());
+      events.addEventListener('change', (message) => {
+        const change = JSON.parse((message as MessageEvent).data);
+        if (change.kind === 'reset') {
+          fetchFiles();
+          return;
+        }
+        setFiles((current) => {
+          const removed = change.kind === 'delete' ? change.path : change.old_path;
+          let next = removed ? current.filter((f) => f.path !== removed) : current;
+          if (change.kind !== 'delete' && !next.some((f) => f.path === change.path)) {
+            next = [...next, toVaultFile(change.path)].sort((a, b) => a.path.localeCompare(b.path));
+          }
+          return next;
+        });
+      });
+    };
+
+    subscribe().catch((error) => console.error('Failed to subscribe to vault changes:', error));
+
+    return () => {
+      cancelled = true;
+      events?.close();
+    };
   }, []);
 
   const fetchFiles = async () => {
     try {
-      const response = await axios.get('http://localhost:8000/vault/files');
-      setFiles(response.data.files);
+      // Page through the listing; unchanged pages revalidate via ETag
+      const allFiles: VaultFile[] = [];
+      let cursor: string | null = null;
+      do {
+        const response: { data: { files: VaultFile[]; next_cursor: string | null } } = await axios.get(
+          'http://localhost:8000/vault/files',
+          { params: { limit: 500, fields: 'path,name,folder', cursor: cursor ?? undefined } }
+        );
+        allFiles.push(...response.data.files);
+        cursor = response.data.next_cursor;
+      } while (cursor);
+      setFiles(allFiles);
     } catch (error) {
       console.error('Failed to fetch files:', error);
     }
@@ -79,24 +129,79 @@ Try typing a message in the chat to get started!
     setInput('');
     setLoading(true);
 
+    // The reply is added on its first token and grows as more arrive
+    let replying = false;
+    const appendToReply = (text: string) => {
+      if (!replying) {
+        replying = true;
+        setMessages(prev => [...prev, { role: 'assistant', content: text }]);
+      } else {
+        setMessages(prev => {
+          const last = prev[prev.length - 1];
+          return [...prev.slice(0, -1), { ...last, content: last.content + text }];
+        });
+      }
+    };
+
     try {
-      const response = await axios.post('http://localhost:8000/chat/message', {
-        messages: [...messages, userMessage],
-        stream: false
+      const response = await fetch('http://localhost:8000/chat/stream', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ session_id: sessionId, message: userMessage.content })
       });
 
-      const assistantMessage: Message = {
-        role: 'assistant',
-        content: response.data.response
-      };
-      setMessages(prev => [...prev, assistantMessage]);
+      if (response.status === 429) {
+        const retryAfter = response.headers.get('Retry-After');
+        appendToReply(`I'm busy right now, please try again${retryAfter ? ` in ${retryAfter}s` : ''}.`);
+        return;
+      }
+      if (response.status === 404 && sessionId) {
+        // Session expired on the server; the next message starts a new one
+        setSessionId(null);
+        appendToReply('This conversation has expired on the server. Please send your message again to start a new one.');
+        return;
+      }
+      if (!response.ok || !response.body) {
+        throw new Error(`Chat request failed: HTTP ${response.status}`);
+      }
+
+      // Server-Sent Events: frames separated by a blank line, ':' lines are heartbeats
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+          const frame = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+
+          let event = 'message';
+          let data = '';
+          for (const line of frame.split('\n')) {
+            if (line.startsWith('event:')) event = line.slice(6).trim();
+            else if (line.startsWith('data:')) data += line.slice(5).trim();
+          }
+          if (!data) continue;
+
+          const payload = JSON.parse(data);
+          if (event === 'start') {
+            setSessionId(payload.session_id);
+          } else if (event === 'token') {
+            appendToReply(payload.content);
+          } else if (event === 'error') {
+            appendToReply(`${replying ? '\n\n' : ''}Sorry, I encountered an error: ${payload.message}`);
+          } else if (event === 'done' && payload.timing) {
+            console.debug(`${payload.model}: first token ${payload.timing.ttft_ms}ms, ${payload.timing.tokens_per_s} tok/s`);
+          }
+        }
+      }
     } catch (error) {
       console.error('Failed to send message:', error);
-      const errorMessage: Message = {
-        role: 'assistant',
-        content: 'Sorry, I encountered an error. Please try again.'
-      };
-      setMessages(prev => [...prev, errorMessage]);
+      appendToReply('Sorry, I encountered an error. Please try again.');
     } finally {
       setLoading(false);
     }
@@ -218,7 +323,7 @@ Try typing a message in the chat to get started!
             </div>
           ))}
 
-          {loading && (
+          {loading && messages[messages.length - 1]?.role !== 'assistant' && (
             <div className="loading-indicator">
               <span>Thinking</span>
               <div className="loading-dots">